@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import BaseInfoView
+from .views import BaseInfoView, AsyncBaseInfoView
 
 urlpatterns = [
-    path('base-info/', BaseInfoView.as_view(), name='base-info')
+    path('base-info/', BaseInfoView.as_view(), name='base-info'),
+    path('async/base-info/', AsyncBaseInfoView.as_view(),
+         name='async-base-info'),
 ]
@@ -1,11 +1,9 @@
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from reviews_app.models import Review
-from offers_app.models import Offer
-from django.db.models import Avg
-from users_auth_app.models import UserProfileModel
 from rest_framework.permissions import AllowAny
+from base_info_app.stats import get_base_info, aget_base_info, BASE_INFO_CACHE_TIMEOUT
+from utils.async_views import AsyncAPIView
 
 
 class BaseInfoView(APIView):
@@ -14,23 +12,36 @@ class BaseInfoView(APIView):
     (total number of reviews, average rating, number of business profiles 
     and total number of offers).
     The view allows public access and is used to display summary info 
-    on the landing page.
+    on the landing page. The statistics are served from the cache and 
+    invalidated by signals whenever reviews, offers or profiles change.
     """
     permission_classes = [AllowAny]
+    cache_max_age = BASE_INFO_CACHE_TIMEOUT
 
     def get(self, request):
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(
-            avg_rating=Avg('rating'))['avg_rating']
-        average_rating = round(
-            average_rating, 1) if average_rating is not None else 0.0
-        business_profile_count = UserProfileModel.objects.filter(
-            user_type='business').count()
-        offer_count = Offer.objects.count()
-
-        return Response({
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        }, status=status.HTTP_200_OK)
+        return self.build_response(request, get_base_info())
+
+    def build_response(self, request, cached):
+        etag = cached["etag"]
+
+        if request.headers.get('If-None-Match') == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(cached["stats"], status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={self.cache_max_age}'
+        return response
+
+
+class AsyncBaseInfoView(AsyncAPIView):
+    """
+    Async variant of BaseInfoView for ASGI deployments. On a cache miss 
+    the four aggregate queries run concurrently.
+    """
+    permission_classes = [AllowAny]
+    cache_max_age = BaseInfoView.cache_max_age
+    build_response = BaseInfoView.build_response
+
+    async def get(self, request):
+        return self.build_response(request, await aget_base_info())
@@ -0,0 +1,61 @@
+import time
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from base_info_app.stats import invalidate_base_info
+from offers_app.models import Offer
+from offers_app.search import get_search_backend
+from utils.seeding import seed_data
+
+
+class Command(BaseCommand):
+    """
+    Fills the database with synthetic users, offers, orders and reviews
+    for load tests and local development, then updates what bulk_create
+    bypasses: offer min values, order and rating counters, the offer
+    search index and the cached base info.
+    """
+    help = 'Generates synthetic users, offers, orders and reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business-users', type=int, default=50)
+        parser.add_argument('--customers', type=int, default=500)
+        parser.add_argument('--offers', type=int, default=500)
+        parser.add_argument('--orders', type=int, default=5000)
+        parser.add_argument('--reviews', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='seed_',
+                            help='Username prefix of the generated users.')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed, the same seed generates the same data.')
+
+    def handle(self, *args, **options):
+        business_users, customers = options['business_users'], options['customers']
+        if options['offers'] and not business_users:
+            raise CommandError('Offers need at least one business user.')
+        if options['orders'] and not (options['offers'] and customers):
+            raise CommandError('Orders need at least one offer and one customer.')
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(
+                f"Users starting with '{prefix}' exist already, choose another --prefix.")
+
+        start = time.perf_counter()
+        seed_data(business_users, customers, options['offers'], options['orders'],
+                  options['reviews'], options['batch_size'], prefix, options['seed'])
+
+        Offer.objects.filter(
+            user__username__startswith=prefix).update_min_values()
+        call_command('reconcile_order_stats', stdout=StringIO())
+        call_command('reconcile_rating_stats', stdout=StringIO())
+        backend = get_search_backend()
+        if backend is not None:
+            backend.rebuild()
+        invalidate_base_info()
+
+        reviews = min(options['reviews'], business_users * customers)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {business_users} business users, {customers} customers, "
+            f"{options['offers']} offers, {options['orders']} orders and "
+            f"{reviews} reviews in {time.perf_counter() - start:.1f}s."))
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from reviews_app.models import Review
+from offers_app.models import Offer
+from offers_app.signals import offers_bulk_created
+from users_auth_app.models import UserProfileModel
+from .stats import invalidate_base_info
+
+
+for model in (Review, Offer, UserProfileModel):
+    post_save.connect(invalidate_base_info, sender=model,
+                      dispatch_uid=f'base_info_save_{model.__name__}')
+    post_delete.connect(invalidate_base_info, sender=model,
+                        dispatch_uid=f'base_info_delete_{model.__name__}')
+
+offers_bulk_created.connect(invalidate_base_info, sender=Offer,
+                            dispatch_uid='base_info_bulk_offers')
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import json
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Sum
+from reviews_app.models import BusinessRatingStats
+from offers_app.models import Offer
+from users_auth_app.models import UserProfileModel
+
+BASE_INFO_CACHE_KEY = 'base_info:stats'
+# Upper bound for stale statistics: the signals only clear the cache of
+# the process that wrote, and bulk writes send no signals at all.
+BASE_INFO_CACHE_TIMEOUT = 60
+
+
+def rating_totals():
+    """
+    Returns (review_count, average_rating) from the per-business rating 
+    aggregates instead of scanning all reviews.
+    """
+    totals = BusinessRatingStats.objects.aggregate(
+        count=Sum('review_count'), rating_sum=Sum('rating_sum'))
+    count = totals['count'] or 0
+    if not count:
+        return 0, 0.0
+    return count, round(totals['rating_sum'] / count, 1)
+
+
+def compute_base_info():
+    """ Runs the aggregate queries behind the dashboard statistics. """
+    review_count, average_rating = rating_totals()
+    return {
+        "review_count": review_count,
+        "average_rating": average_rating,
+        "business_profile_count": UserProfileModel.objects.filter(
+            user_type='business').count(),
+        "offer_count": Offer.objects.count(),
+    }
+
+
+def _in_own_thread(query):
+    """
+    Runs a query in a worker thread with its own database connection so 
+    several queries can run at the same time. The connection is released 
+    according to CONN_MAX_AGE afterwards.
+    """
+    def run():
+        try:
+            return query()
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)()
+
+
+async def acompute_base_info():
+    """ Async variant of compute_base_info running the three queries concurrently. """
+    (review_count, average_rating), business_profile_count, offer_count = await asyncio.gather(
+        _in_own_thread(rating_totals),
+        _in_own_thread(UserProfileModel.objects.filter(
+            user_type='business').count),
+        _in_own_thread(Offer.objects.count),
+    )
+    return {
+        "review_count": review_count,
+        "average_rating": average_rating,
+        "business_profile_count": business_profile_count,
+        "offer_count": offer_count,
+    }
+
+
+def _cache_entry(stats):
+    etag = hashlib.md5(
+        json.dumps(stats, sort_keys=True).encode()).hexdigest()
+    return {"stats": stats, "etag": f'"{etag}"'}
+
+
+def get_base_info():
+    """
+    Returns the dashboard statistics and their ETag from the cache, 
+    computing and storing them for BASE_INFO_CACHE_TIMEOUT seconds on a 
+    cache miss.
+    """
+    cached = cache.get(BASE_INFO_CACHE_KEY)
+    if cached is None:
+        cached = _cache_entry(compute_base_info())
+        cache.set(BASE_INFO_CACHE_KEY, cached, timeout=BASE_INFO_CACHE_TIMEOUT)
+    return cached
+
+
+async def aget_base_info():
+    """ Async variant of get_base_info. """
+    cached = await cache.aget(BASE_INFO_CACHE_KEY)
+    if cached is None:
+        cached = _cache_entry(await acompute_base_info())
+        await cache.aset(BASE_INFO_CACHE_KEY, cached, timeout=BASE_INFO_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_base_info(**kwargs):
+    """
+    Signal receiver dropping the cached statistics after a write. Drops 
+    them again on commit, as aggregates written later in the same 
+    transaction (e.g. the rating stats) are only visible then.
+    """
+    cache.delete(BASE_INFO_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(BASE_INFO_CACHE_KEY))
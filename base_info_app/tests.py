@@ -0,0 +1,114 @@
+import time
+from io import StringIO
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase
+from offers_app.models import Offer
+from base_info_app.stats import BASE_INFO_CACHE_TIMEOUT
+from orders_app.models import BusinessOrderStats, Order
+from reviews_app.models import Review
+from users_auth_app.models import UserProfileModel
+
+
+class BaseInfoCacheTests(APITestCase):
+    """
+    Ensures the dashboard statistics are served from the cache and 
+    refreshed after writes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='business')
+
+    def test_steady_state_runs_no_queries(self):
+        self.client.get('/api/base-info/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['offer_count'], 0)
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_offer_write_invalidates_cache(self):
+        first = self.client.get('/api/base-info/')
+        Offer.objects.create(user=self.user, title='Offer', description='Text')
+        second = self.client.get('/api/base-info/')
+        self.assertEqual(second.data['offer_count'], 1)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get('/api/base-info/')['ETag']
+        response = self.client.get('/api/base-info/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_without_signals_show_up_after_timeout(self):
+        self.client.get('/api/base-info/')
+        UserProfileModel.objects.bulk_create([UserProfileModel(
+            user=self.user, user_type='business', email='business@example.com')])
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['business_profile_count'], 0)
+
+        later = time.time() + BASE_INFO_CACHE_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['business_profile_count'], 1)
+
+
+class AsyncBaseInfoTests(TransactionTestCase):
+    """
+    The async variant computes the same statistics with concurrent 
+    queries (committed data is needed since they use own connections).
+    """
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='business')
+        Offer.objects.create(user=user, title='Offer', description='Text')
+
+    async def test_async_matches_sync(self):
+        response = await self.async_client.get('/api/async/base-info/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['offer_count'], 1)
+        await cache.aclear()
+        sync_response = await sync_to_async(self.client.get)('/api/base-info/')
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+
+
+class SeedDataCommandTests(APITestCase):
+    """
+    Ensures seed_data generates consistent data and fills in what 
+    bulk_create bypasses (min values, counters, cached base info).
+    """
+
+    def seed(self, *args):
+        call_command('seed_data', '--business-users', '3', '--customers', '5',
+                     '--offers', '4', '--orders', '30', '--reviews', '6',
+                     *args, stdout=StringIO())
+
+    def test_generates_related_data(self):
+        cache.clear()
+        self.client.get('/api/base-info/')
+        self.seed()
+
+        self.assertEqual(Offer.objects.filter(min_price__isnull=False).count(), 4)
+        self.assertEqual(Order.objects.count(), 30)
+        self.assertEqual(
+            sum(sum(stats) for stats in BusinessOrderStats.objects.values_list(
+                'in_progress_count', 'completed_count', 'cancelled_count')), 30)
+        self.assertEqual(Review.objects.count(), 6)
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['offer_count'], 4)
+
+        for order in Order.objects.select_related('offer_detail__offer'):
+            self.assertEqual(order.business_user_id, order.offer_detail.offer.user_id)
+            self.assertEqual(order.price, order.offer_detail.price)
+
+    def test_refuses_existing_prefix(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+        self.seed('--prefix', 'more_')
+        self.assertEqual(User.objects.filter(username__startswith='more_').count(), 8)
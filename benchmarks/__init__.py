@@ -0,0 +1,6 @@
+"""
+Standalone benchmark scripts. Each script runs against its own scratch 
+SQLite database and is started from the project root, e.g.
+
+    python -m benchmarks.indexes --orders 300000
+"""
@@ -0,0 +1,198 @@
+"""
+Load test comparing the synchronous DRF read endpoints served through
+the WSGI application (--wsgi-threads threads, like a gunicorn worker) with
+their async variants served through the ASGI application (one event
+loop with --concurrency in-flight requests, like uvicorn).
+
+Requests are sent in-process straight to the WSGI/ASGI callables, so no
+server is needed. --db-latency-ms adds a sleep to every SQL statement
+to emulate a database reached over the network, which is where the
+async path pays off.
+
+    python -m benchmarks.asgi_load --concurrency 50 --requests 500 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.common import seed, setup_django
+
+
+def install_db_latency(latency_ms):
+    from django.db.backends.signals import connection_created
+
+    def sleep_before(execute, sql, params, many, context):
+        time.sleep(latency_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        if sleep_before not in connection.execute_wrappers:
+            connection.execute_wrappers.append(sleep_before)
+
+    connection_created.connect(add_wrapper, weak=False)
+
+
+def wsgi_request(application, url, headers, method='GET', body=b''):
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': parts.path,
+        'QUERY_STRING': parts.query,
+        'HTTP_HOST': 'localhost',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    }
+    for name, value in headers.items():
+        environ[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    setup_testing_defaults(environ)
+
+    status = []
+    result = application(environ, lambda code, _headers, *args: status.append(code))
+    try:
+        b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(application, url, headers):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'localhost')] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()],
+        'client': ('127.0.0.1', 50000),
+        'server': ('localhost', 80),
+    }
+    body_sent = asyncio.Event()
+    status = []
+
+    async def receive():
+        if not body_sent.is_set():
+            body_sent.set()
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def summarize(timings, elapsed):
+    timings.sort()
+    count = len(timings)
+    return {
+        'rps': count / elapsed,
+        'p50': timings[count // 2] * 1000,
+        'p99': timings[min(count - 1, int(count * 0.99))] * 1000,
+    }
+
+
+def run_wsgi(application, url, headers, total, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        status = wsgi_request(application, url, headers)
+        assert status < 400, (url, status)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(one, range(total)))
+    return summarize(timings, time.perf_counter() - start)
+
+
+def run_asgi(application, url, headers, total, concurrency):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        timings = []
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                status = await asgi_request(application, url, headers)
+                assert status < 400, (url, status)
+                timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return summarize(timings, time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--wsgi-threads', type=int, default=4,
+                        help='Threads of the WSGI worker (gunicorn --threads).')
+    parser.add_argument('--db-latency-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    setup_django('bench_asgi.sqlite3')
+    users = seed(business_users=50, customer_users=500, offers=500,
+                 orders=5000, reviews=2000)
+
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.core.signals import request_started
+    from rest_framework.authtoken.models import Token
+    from offers_app.models import Offer
+    from coderr_freelancer.asgi import application as asgi_application
+    from coderr_freelancer.wsgi import application as wsgi_application
+
+    call_command('reconcile_order_stats', stdout=io.StringIO())
+    if args.db_latency_ms:
+        install_db_latency(args.db_latency_ms)
+
+    business = users['business'][0]
+    token = Token.objects.create(user=business)
+    headers = {'Authorization': f'Token {token.key}'}
+    offer_id = Offer.objects.filter(user=business).values_list('pk', flat=True).first()
+
+    # Without this, base-info would be served from the cache after the
+    # first request in both modes and only measure the cache lookup.
+    request_started.connect(lambda **kwargs: cache.clear(), weak=False)
+
+    routes = [
+        ('base-info', 'base-info/'),
+        ('offers-list', 'offers/'),
+        ('offer-detail', f'offers/{offer_id}/'),
+        ('order-count', f'order-count/{business.pk}/'),
+        ('completed-order-count', f'completed-order-count/{business.pk}/'),
+        ('reviews-list', f'reviews/?business_user_id={business.pk}'),
+    ]
+
+    print(f'concurrency {args.concurrency}, {args.wsgi_threads} WSGI threads, '
+          f'{args.requests} requests per route, db latency {args.db_latency_ms} ms')
+    print(f'{"route":<24}{"mode":<6}{"req/s":>9}{"p50 ms":>9}{"p99 ms":>9}')
+    for name, path in routes:
+        for mode, url, runner, application, concurrency in (
+            ('wsgi', f'/api/{path}', run_wsgi, wsgi_application, args.wsgi_threads),
+            ('asgi', f'/api/async/{path}', run_asgi, asgi_application, args.concurrency),
+        ):
+            result = runner(application, url, headers,
+                            args.requests, concurrency)
+            print(f'{name:<24}{mode:<6}{result["rps"]:>9.1f}'
+                  f'{result["p50"]:>9.2f}{result["p99"]:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
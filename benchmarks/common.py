@@ -0,0 +1,56 @@
+import os
+import statistics
+import time
+from pathlib import Path
+
+import django
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+
+def setup_django(database_name, fresh=True, options=None):
+    """
+    Configures Django against a scratch SQLite file inside benchmarks/ 
+    and migrates it. `options` replaces the database OPTIONS. Must be 
+    called before any model import.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_freelancer.settings')
+    database_path = BENCHMARK_DIR / database_name
+    if fresh and database_path.exists():
+        database_path.unlink()
+
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database_path
+    if options is not None:
+        settings.DATABASES['default']['OPTIONS'] = options
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return database_path
+
+
+def seed(business_users=500, customer_users=5000, offers=5000,
+         orders=100000, reviews=20000, batch_size=5000):
+    """
+    Inserts synthetic users, profiles, offers with three details, orders 
+    and reviews with bulk_create (see utils.seeding.seed_data).
+    """
+    from offers_app.models import Offer
+    from utils.seeding import seed_data
+
+    users = seed_data(business_users, customer_users, offers, orders,
+                      reviews, batch_size)
+    Offer.objects.update_min_values()
+    return users
+
+
+def measure(function, repeat=50):
+    """ Runs function repeat times and returns (median, p95) in ms. """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
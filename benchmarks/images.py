@@ -0,0 +1,86 @@
+"""
+Measures the image variant pipeline (utils/images.py) on synthetic
+camera-sized photos: bytes of the original upload against the bytes of
+each variant, and the variant generation throughput of the worker pool.
+
+    python -m benchmarks.images --images 20 --workers 2
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+from benchmarks.common import setup_django
+
+
+def synthetic_photo(seed, size=(4000, 3000)):
+    """ A noisy gradient JPEG, compressing roughly like a photo. """
+    from PIL import Image, ImageFilter
+
+    gradient = Image.linear_gradient('L').resize(size).rotate(seed * 17 % 360)
+    noise = Image.effect_noise(size, 40 + seed % 20).filter(ImageFilter.GaussianBlur(1))
+    image = Image.merge('RGB', (gradient, noise, Image.blend(gradient, noise, 0.5)))
+    output = BytesIO()
+    image.save(output, 'JPEG', quality=92)
+    return output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--images', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    setup_django('bench_images.sqlite3')
+    from django.conf import settings
+    media_root = tempfile.mkdtemp()
+    settings.MEDIA_ROOT = media_root
+    settings.IMAGE_VARIANTS = {**settings.IMAGE_VARIANTS,
+                               'ASYNC': False, 'WORKERS': args.workers}
+
+    from concurrent.futures import ThreadPoolExecutor
+    from django.contrib.auth.models import User
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.db.models.signals import post_save
+    from offers_app.models import Offer
+    from utils.images import process_variants
+
+    try:
+        post_save.disconnect(sender=Offer, dispatch_uid='offer_image_variants')
+        user = User.objects.create_user(username='business')
+        offers = [Offer.objects.create(
+            user=user, title=f'Offer {index}', description='Text',
+            image=SimpleUploadedFile(f'photo{index}.jpg', synthetic_photo(index)))
+            for index in range(args.images)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(lambda offer: process_variants(
+                Offer, offer.pk, 'image', 'image_variants'), offers))
+        elapsed = time.perf_counter() - start
+
+        totals = {}
+        original = 0
+        for offer in Offer.objects.all():
+            storage = offer.image.storage
+            original += storage.size(offer.image.name)
+            for variant, names in offer.image_variants.items():
+                if variant == 'source':
+                    continue
+                for fmt, name in names.items():
+                    totals[(variant, fmt)] = totals.get((variant, fmt), 0) + storage.size(name)
+
+        print(f'{args.images} images of 4000x3000, {args.workers} workers: '
+              f'{args.images / elapsed:.2f} images/s')
+        print(f'{"file":<16}{"avg KiB":>10}{"vs original":>13}')
+        print(f'{"original":<16}{original / args.images / 1024:>10.1f}{"1.0x":>13}')
+        for (variant, fmt), size in totals.items():
+            print(f'{variant + " " + fmt:<16}{size / args.images / 1024:>10.1f}'
+                  f'{original / size:>12.1f}x')
+    finally:
+        shutil.rmtree(media_root)
+
+
+if __name__ == '__main__':
+    main()
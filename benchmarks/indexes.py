@@ -0,0 +1,105 @@
+"""
+Seeds a scratch database and compares the EXPLAIN plan and latency of 
+the hot query shapes with and without the Meta.indexes and unique 
+constraints declared on Order, Review, UserProfileModel and Offer.
+
+    python -m benchmarks.indexes --orders 300000 --reviews 100000
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, seed, setup_django
+
+
+def hot_queries(users):
+    from django.db.models import Q
+    from offers_app.models import Offer
+    from orders_app.models import Order
+    from reviews_app.models import Review
+    from users_auth_app.models import UserProfileModel
+
+    rng = random.Random(7)
+    business = users['business']
+    customers = users['customers']
+
+    return {
+        'order-count (business_user, status)': lambda: Order.objects.filter(
+            business_user=rng.choice(business), status='in_progress'),
+        'orders-list (customer OR business)': lambda: Order.objects.filter(
+            Q(customer_user=rng.choice(customers)) |
+            Q(business_user=rng.choice(business))),
+        'review-create duplicate check (unique reviewer, business_user)': lambda: Review.objects.filter(
+            reviewer=rng.choice(customers), business_user=rng.choice(business)),
+        'business-profile-list (user_type)': lambda: UserProfileModel.objects.filter(
+            user_type='business'),
+        'offers-list (-created_at)': lambda: Offer.objects.order_by(
+            '-created_at')[:6],
+    }
+
+
+def set_indexes(enabled):
+    from django.db import connection
+    from offers_app.models import Offer
+    from orders_app.models import Order
+    from reviews_app.models import Review
+    from users_auth_app.models import UserProfileModel
+
+    # On SQLite, changing a constraint rebuilds the table from the model's
+    # current Meta (indexes and constraints), so constraints go first with
+    # Meta.constraints emptied while removing, and only missing or
+    # leftover indexes are touched afterwards.
+    with connection.schema_editor() as editor:
+        for model in (Order, Review, UserProfileModel, Offer):
+            constraints = model._meta.constraints
+            for constraint in constraints:
+                if enabled:
+                    editor.add_constraint(model, constraint)
+                else:
+                    model._meta.constraints = []
+                    try:
+                        editor.remove_constraint(model, constraint)
+                    finally:
+                        model._meta.constraints = constraints
+
+            with connection.cursor() as cursor:
+                existing = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table)
+            for index in model._meta.indexes:
+                if enabled and index.name not in existing:
+                    editor.add_index(model, index)
+                elif not enabled and index.name in existing:
+                    editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def report(label, queries, repeat):
+    print(f'\n=== {label} ===')
+    for name, build in queries.items():
+        plan = build().explain()
+        median, p95 = measure(lambda: list(build()), repeat)
+        print(f'\n{name}: median {median:.2f} ms, p95 {p95:.2f} ms')
+        print('    ' + plan.replace('\n', '\n    '))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orders', type=int, default=300000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--offers', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django('bench_indexes.sqlite3')
+    users = seed(business_users=1000, customer_users=20000, offers=args.offers,
+                 orders=args.orders, reviews=args.reviews)
+    queries = hot_queries(users)
+
+    set_indexes(False)
+    report('without indexes', queries, args.repeat)
+    set_indexes(True)
+    report('with indexes', queries, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,431 @@
+"""
+End-to-end load test of every route in coderr_freelancer/urls.py. Seeds
+a scratch database with the seed_data command (--scale multiplies its
+default sizes), then sends each scenario below --requests requests from
+--concurrency threads, each with its own DRF APIClient and token, and
+reports throughput, p50/p95/p99 latency and SQL queries per request.
+Write scenarios create whatever they delete before the timed request.
+Routes without a scenario are listed at the end.
+
+--save stores the results as a JSON baseline, --baseline compares a run
+with one: scenarios whose p95 grew by more than --threshold percent
+(and --min-delta-ms), that run more queries or fail more often are
+marked, and the exit status is 1.
+
+    python -m benchmarks.load --concurrency 8 --requests 200 --save load_baseline.json
+    python -m benchmarks.load --concurrency 8 --requests 200 --baseline load_baseline.json
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from io import StringIO
+
+from benchmarks.common import BENCHMARK_DIR, setup_django
+
+SEED_SIZES = {
+    'business_users': 50,
+    'customers': 500,
+    'offers': 500,
+    'orders': 5000,
+    'reviews': 2000,
+}
+PASSWORD = 'secret123'
+
+Scenario = namedtuple('Scenario', 'route method label build')
+
+
+def offer_data(number):
+    return {
+        'title': f'Load offer {number}',
+        'description': 'Created by the load test',
+        'details': [
+            {'title': offer_type, 'revisions': 1, 'delivery_time_in_days': days,
+             'price': price, 'features': ['A'], 'offer_type': offer_type}
+            for offer_type, price, days in (
+                ('basic', 100, 7), ('standard', 200, 5), ('premium', 300, 3))
+        ],
+    }
+
+
+class LoadContext:
+    """
+    Seeded users, tokens and object ids the scenarios build their
+    requests from. Shared by all worker threads.
+    """
+
+    def __init__(self):
+        from django.contrib.auth.models import User
+        from rest_framework.authtoken.models import Token
+        from offers_app.models import Offer, OfferDetail
+        from orders_app.models import BusinessOrderStats, Order
+        from reviews_app.models import Review
+        from users_auth_app.models import UserProfileModel
+
+        self.business_id = BusinessOrderStats.objects.order_by(
+            '-in_progress_count').values_list('business_user_id', flat=True).first()
+        self.customer_id = Order.objects.filter(business_user_id=self.business_id).values_list(
+            'customer_user_id', flat=True).first()
+        self.offer_ids = list(Offer.objects.filter(
+            user_id=self.business_id).values_list('pk', flat=True))
+        self.detail_ids = list(OfferDetail.objects.filter(
+            offer_id__in=self.offer_ids).values_list('pk', flat=True))
+        self.order_ids = list(Order.objects.filter(
+            business_user_id=self.business_id).values_list('pk', flat=True)[:100])
+        self.reviews = list(Review.objects.values_list('pk', 'reviewer_id')[:100])
+
+        admin = User.objects.create_user('load_admin', password=PASSWORD, is_staff=True)
+        UserProfileModel.objects.create(
+            user=admin, user_type='customer', email='load_admin@example.com')
+        login = User.objects.create_user('load_login', password=PASSWORD)
+        UserProfileModel.objects.create(
+            user=login, user_type='customer', email='load_login@example.com')
+        self.admin_id = admin.pk
+
+        Token.objects.bulk_create([
+            Token(user_id=user_id, key=Token.generate_key())
+            for user_id in User.objects.values_list('pk', flat=True)
+        ])
+        self.tokens = dict(Token.objects.values_list('user_id', 'key'))
+
+        profiles = UserProfileModel.objects.values_list('user_id', 'user_type')
+        business = [user_id for user_id, user_type in profiles if user_type == 'business']
+        customers = [user_id for user_id, user_type in profiles if user_type == 'customer']
+        reviewed = set(Review.objects.values_list('reviewer_id', 'business_user_id'))
+        self._open_pairs = ((customer, business_user) for customer in customers
+                            for business_user in business
+                            if (customer, business_user) not in reviewed)
+        self._lock = threading.Lock()
+        self._numbers = itertools.count()
+
+    def auth(self, user_id):
+        return {'HTTP_AUTHORIZATION': f'Token {self.tokens[user_id]}'}
+
+    def unique(self):
+        with self._lock:
+            return next(self._numbers)
+
+    def open_pair(self):
+        """ A (customer, business user) pair without a review yet. """
+        with self._lock:
+            return next(self._open_pairs)
+
+    def pick(self, items, number):
+        return items[number % len(items)]
+
+
+def create_offer(context, number):
+    """ Creates an offer the way the API does, with its min values. """
+    from offers_app.api.serializers import create_offers_with_details
+    from offers_app.models import Offer
+
+    offer = Offer(
+        user_id=context.business_id, title=f'Doomed offer {number}', description='Text')
+    create_offers_with_details([offer], [[
+        {'offer_type': 'basic', 'price': 50, 'delivery_time_in_days': 5}]])
+    return offer.pk
+
+
+def create_order(context, number):
+    """
+    Places an order the way CreateOrderSerializer does: with an id from
+    the order id sequence and on its shard if orders are sharded. The
+    Order signal handlers count it.
+    """
+    from orders_app import sharding
+    from orders_app.models import Order
+
+    order = Order(
+        customer_user_id=context.customer_id, business_user_id=context.business_id,
+        offer_detail_id=context.pick(context.detail_ids, number), title='Doomed order',
+        revisions=1, delivery_time_in_days=5, price=50, offer_type='basic')
+    if sharding.is_enabled():
+        order.pk = sharding.next_order_id()
+    with sharding.atomic(sharding.shard_for(order.business_user_id)):
+        order.save(force_insert=True)
+    return order.pk
+
+
+def register(context, number):
+    username = f'load_user_{context.unique()}'
+    return '/api/registration/', {}, {
+        'username': username, 'email': f'{username}@example.com',
+        'password': PASSWORD, 'repeated_password': PASSWORD, 'type': 'customer'}
+
+
+def post_review(context, number):
+    reviewer, business_user = context.open_pair()
+    return '/api/reviews/', context.auth(reviewer), {
+        'business_user': business_user, 'rating': number % 5 + 1,
+        'description': 'Load test review'}
+
+
+def delete_review(context, number):
+    from reviews_app.models import Review
+
+    reviewer, business_user = context.open_pair()
+    review = Review.objects.create(
+        reviewer_id=reviewer, business_user_id=business_user, rating=4,
+        description='Doomed review')
+    return f'/api/reviews/{review.pk}/', context.auth(reviewer), None
+
+
+SCENARIOS = [
+    Scenario('userprofile-detail', 'GET', '', lambda c, n: (
+        f'/api/profile/{c.business_id}/', c.auth(c.customer_id), None)),
+    Scenario('userprofile-detail', 'PATCH', '', lambda c, n: (
+        f'/api/profile/{c.business_id}/', c.auth(c.business_id),
+        {'location': f'City {n}'})),
+    Scenario('business-user-list', 'GET', '', lambda c, n: (
+        '/api/profiles/business/', c.auth(c.customer_id), None)),
+    Scenario('customer-user-list', 'GET', '', lambda c, n: (
+        '/api/profiles/customer/', c.auth(c.customer_id), None)),
+    Scenario('registration', 'POST', '', register),
+    Scenario('login', 'POST', '', lambda c, n: (
+        '/api/login/', {}, {'username': 'load_login', 'password': PASSWORD})),
+    Scenario('base-info', 'GET', '', lambda c, n: ('/api/base-info/', {}, None)),
+    Scenario('async-base-info', 'GET', '', lambda c, n: ('/api/async/base-info/', {}, None)),
+    Scenario('offer-list', 'GET', '', lambda c, n: ('/api/offers/', {}, None)),
+    Scenario('offer-list', 'GET', 'search', lambda c, n: (
+        '/api/offers/?search=Design&ordering=min_price&page_size=20', {}, None)),
+    Scenario('offer-list', 'POST', '', lambda c, n: (
+        '/api/offers/', c.auth(c.business_id), offer_data(n))),
+    Scenario('offer-batch', 'POST', '', lambda c, n: (
+        '/api/offers/batch/', c.auth(c.business_id),
+        [offer_data(n * 10 + index) for index in range(10)])),
+    Scenario('offer-detail', 'GET', '', lambda c, n: (
+        f'/api/offers/{c.pick(c.offer_ids, n)}/', c.auth(c.customer_id), None)),
+    Scenario('offer-detail', 'PATCH', '', lambda c, n: (
+        f'/api/offers/{c.pick(c.offer_ids, n)}/', c.auth(c.business_id),
+        {'title': f'Renamed {n}'})),
+    Scenario('offer-detail', 'DELETE', '', lambda c, n: (
+        f'/api/offers/{create_offer(c, n)}/', c.auth(c.business_id), None)),
+    Scenario('offerdetails-list', 'GET', '', lambda c, n: (
+        '/api/offerdetails/', c.auth(c.customer_id), None)),
+    Scenario('offerdetails-detail', 'GET', '', lambda c, n: (
+        f'/api/offerdetails/{c.pick(c.detail_ids, n)}/', c.auth(c.customer_id), None)),
+    Scenario('offerdetails-detail', 'PATCH', '', lambda c, n: (
+        f'/api/offerdetails/{c.pick(c.detail_ids, n)}/', c.auth(c.business_id),
+        {'price': 100 + n % 50})),
+    Scenario('async-offer-list', 'GET', '', lambda c, n: ('/api/async/offers/', {}, None)),
+    Scenario('async-offer-detail', 'GET', '', lambda c, n: (
+        f'/api/async/offers/{c.pick(c.offer_ids, n)}/', c.auth(c.customer_id), None)),
+    Scenario('orders-list', 'GET', '', lambda c, n: (
+        '/api/orders/', c.auth(c.customer_id), None)),
+    Scenario('orders-list', 'GET', 'cursor', lambda c, n: (
+        '/api/orders/?pagination=cursor&page_size=20', c.auth(c.business_id), None)),
+    Scenario('orders-list', 'GET', 'stream', lambda c, n: (
+        '/api/orders/?stream=json', c.auth(c.business_id), None)),
+    Scenario('orders-list', 'POST', '', lambda c, n: (
+        '/api/orders/', c.auth(c.customer_id),
+        {'offer_detail_id': c.pick(c.detail_ids, n)})),
+    Scenario('orders-detail', 'GET', '', lambda c, n: (
+        f'/api/orders/{c.pick(c.order_ids, n)}/', c.auth(c.business_id), None)),
+    Scenario('orders-detail', 'PATCH', '', lambda c, n: (
+        f'/api/orders/{c.pick(c.order_ids, n)}/', c.auth(c.business_id),
+        {'status': ('in_progress', 'completed')[n % 2]})),
+    Scenario('orders-detail', 'DELETE', '', lambda c, n: (
+        f'/api/orders/{create_order(c, n)}/', c.auth(c.admin_id), None)),
+    Scenario('api-root', 'GET', '', lambda c, n: ('/api/', c.auth(c.customer_id), None)),
+    Scenario('order-count', 'GET', '', lambda c, n: (
+        f'/api/order-count/{c.business_id}/', c.auth(c.customer_id), None)),
+    Scenario('completed-order-count', 'GET', '', lambda c, n: (
+        f'/api/completed-order-count/{c.business_id}/', c.auth(c.business_id), None)),
+    Scenario('async-order-count', 'GET', '', lambda c, n: (
+        f'/api/async/order-count/{c.business_id}/', c.auth(c.customer_id), None)),
+    Scenario('async-completed-order-count', 'GET', '', lambda c, n: (
+        f'/api/async/completed-order-count/{c.business_id}/', c.auth(c.business_id), None)),
+    Scenario('reviews-list', 'GET', '', lambda c, n: (
+        f'/api/reviews/?business_user_id={c.business_id}', c.auth(c.customer_id), None)),
+    Scenario('reviews-list', 'POST', '', post_review),
+    Scenario('reviews-detail', 'GET', '', lambda c, n: (
+        f'/api/reviews/{c.pick(c.reviews, n)[0]}/', c.auth(c.customer_id), None)),
+    Scenario('reviews-detail', 'PATCH', '', lambda c, n: (
+        f'/api/reviews/{c.pick(c.reviews, n)[0]}/', c.auth(c.pick(c.reviews, n)[1]),
+        {'rating': n % 5 + 1, 'description': 'Updated by the load test'})),
+    Scenario('reviews-detail', 'DELETE', '', delete_review),
+    Scenario('async-review-list', 'GET', '', lambda c, n: (
+        f'/api/async/reviews/?business_user_id={c.business_id}', c.auth(c.customer_id), None)),
+    Scenario('query-metrics', 'GET', '', lambda c, n: (
+        '/api/metrics/', c.auth(c.admin_id), None)),
+    Scenario('utils.media.serve_media', 'GET', '', lambda c, n: (
+        '/media/load/sample.bin', {}, None)),
+]
+
+
+def scenario_name(scenario):
+    return ' '.join(filter(None, [scenario.route, scenario.method, scenario.label]))
+
+
+def url_routes():
+    """ Names (or view paths) of all routes in the URLconf, except the admin. """
+    from django.urls import URLResolver, get_resolver
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace != 'admin':
+                    yield from walk(pattern.url_patterns)
+            else:
+                yield pattern.name or pattern.lookup_str
+
+    return list(dict.fromkeys(walk(get_resolver().url_patterns)))
+
+
+def send(client, scenario, context, number):
+    """ Builds one request, then times it. Returns (seconds, queries, status). """
+    from django.db import connections
+    from utils.instrumentation import RequestMetrics
+
+    url, headers, data = scenario.build(context, number)
+    metrics = RequestMetrics()
+    method = getattr(client, scenario.method.lower())
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        if data is None:
+            response = method(url, **headers)
+        else:
+            response = method(url, data, format='json', **headers)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        response.close()
+    return time.perf_counter() - start, metrics.query_count, response.status_code
+
+
+def run_scenario(scenario, context, total, concurrency):
+    from rest_framework.test import APIClient
+
+    local = threading.local()
+
+    def one(number):
+        if not hasattr(local, 'client'):
+            local.client = APIClient(raise_request_exception=False)
+        return send(local.client, scenario, context, number)
+
+    for number in range(min(concurrency, total)):
+        one(number)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+
+    timings = sorted(seconds for seconds, _, _ in results)
+
+    def percentile(fraction):
+        return timings[min(len(timings) - 1, int(len(timings) * fraction))] * 1000
+
+    return {
+        'rps': total / elapsed,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'queries': sum(queries for _, queries, _ in results) / total,
+        'errors': sum(1 for _, _, status in results if status >= 400),
+    }
+
+
+def compare(result, baseline, threshold, min_delta_ms):
+    """ Returns the regression markers of one scenario against its baseline. """
+    markers = []
+    if (result['p95'] > baseline['p95'] * (1 + threshold / 100) and
+            result['p95'] - baseline['p95'] > min_delta_ms):
+        markers.append(f'p95 +{(result["p95"] / baseline["p95"] - 1) * 100:.0f}%')
+    if result['queries'] > baseline['queries'] + 0.01:
+        markers.append(f'queries {baseline["queries"]:.1f} -> {result["queries"]:.1f}')
+    if result['errors'] > baseline['errors']:
+        markers.append(f'errors {baseline["errors"]} -> {result["errors"]}')
+    return markers
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='Requests per scenario.')
+    parser.add_argument('--scale', type=float, default=1,
+                        help='Multiplies the seeded users, offers, orders and reviews.')
+    parser.add_argument('--only', nargs='*', default=[], metavar='TEXT',
+                        help='Only run scenarios whose name contains one of these.')
+    parser.add_argument('--regular-serializers', action='store_true',
+                        help='Measure the lists without FAST_READ_SERIALIZERS.')
+    parser.add_argument('--save', metavar='PATH', help='Write the results as a baseline.')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare with a saved baseline.')
+    parser.add_argument('--threshold', type=float, default=20,
+                        help='Allowed p95 growth against the baseline in percent.')
+    parser.add_argument('--min-delta-ms', type=float, default=5,
+                        help='p95 growth below this is never a regression '
+                             '(thread scheduling noise).')
+    args = parser.parse_args()
+
+    setup_django('bench_load.sqlite3')
+
+    from django.conf import settings
+    from django.core.management import call_command
+
+    sizes = {name: max(1, int(size * args.scale)) for name, size in SEED_SIZES.items()}
+    call_command('seed_data', *itertools.chain.from_iterable(
+        (f'--{name.replace("_", "-")}', str(size)) for name, size in sizes.items()),
+        stdout=StringIO())
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    settings.FAST_READ_SERIALIZERS = not args.regular_serializers
+    settings.MEDIA_ROOT = BENCHMARK_DIR / 'load_media'
+    (settings.MEDIA_ROOT / 'load').mkdir(parents=True, exist_ok=True)
+    (settings.MEDIA_ROOT / 'load' / 'sample.bin').write_bytes(bytes(64 * 1024))
+    context = LoadContext()
+
+    run = {'concurrency': args.concurrency, 'requests': args.requests, 'scale': args.scale,
+           'fast_serializers': settings.FAST_READ_SERIALIZERS}
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            saved = json.load(file)
+        if saved['run'] != run:
+            print(f'Note: the baseline was recorded with {saved["run"]}.')
+        baseline = saved['results']
+
+    print(f'{args.concurrency} threads, {args.requests} requests per scenario, seeded '
+          + ', '.join(f'{size} {name}' for name, size in sizes.items()))
+    print(f'{"scenario":<38}{"req/s":>8}{"p50 ms":>8}{"p95 ms":>8}{"p99 ms":>8}'
+          f'{"queries":>9}{"errors":>8}  vs. baseline')
+    results, regressions = {}, 0
+    for scenario in SCENARIOS:
+        name = scenario_name(scenario)
+        if args.only and not any(text in name for text in args.only):
+            continue
+        result = run_scenario(scenario, context, args.requests, args.concurrency)
+        results[name] = result
+        markers = []
+        if name in baseline:
+            markers = compare(result, baseline[name], args.threshold, args.min_delta_ms)
+            regressions += bool(markers)
+            markers = markers or [
+                f'p95 {(result["p95"] / baseline[name]["p95"] - 1) * 100:+.0f}%']
+        print(f'{name:<38}{result["rps"]:>8.1f}{result["p50"]:>8.1f}{result["p95"]:>8.1f}'
+              f'{result["p99"]:>8.1f}{result["queries"]:>9.1f}{result["errors"]:>8}'
+              f'  {", ".join(markers)}')
+
+    covered = {scenario.route for scenario in SCENARIOS}
+    missing = [route for route in url_routes() if route not in covered]
+    if missing:
+        print(f'Routes without a scenario: {", ".join(missing)}')
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'run': run, 'results': results}, file, indent=2)
+        print(f'Saved the results to {args.save}.')
+    if baseline:
+        print(f'{regressions} scenario(s) regressed beyond {args.threshold:.0f}% p95 '
+              f'or in queries per request.')
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
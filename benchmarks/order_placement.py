@@ -0,0 +1,76 @@
+"""
+High-concurrency order placement: --concurrency threads POST orders
+through the WSGI application, each as its own customer with a token,
+against random offer details. Reports throughput, p50/p99 latency,
+failed requests and the statements run per order.
+
+    python -m benchmarks.order_placement --concurrency 16 --requests 2000
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.asgi_load import summarize, wsgi_request
+from benchmarks.common import seed, setup_django
+
+
+def count_statements(application, headers, detail_id):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        wsgi_request(application, '/api/orders/', headers, 'POST',
+                     json.dumps({'offer_detail_id': detail_id}).encode())
+    return len(context.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django('bench_orders.sqlite3')
+    users = seed(business_users=200, customer_users=args.concurrency * 4,
+                 offers=1000, orders=0, reviews=0)
+
+    from django.core.management import call_command
+    from rest_framework.authtoken.models import Token
+    from offers_app.models import OfferDetail
+    from coderr_freelancer.wsgi import application
+
+    call_command('reconcile_order_stats', verbosity=0, stdout=open('/dev/null', 'w'))
+    tokens = [Token.objects.create(user=user).key for user in users['customers']]
+    detail_ids = list(OfferDetail.objects.values_list('id', flat=True))
+    rng = random.Random(3)
+    jobs = [(rng.choice(tokens), rng.choice(detail_ids)) for _ in range(args.requests)]
+
+    def place(job):
+        token, detail_id = job
+        body = json.dumps({'offer_detail_id': detail_id}).encode()
+        start = time.perf_counter()
+        status = wsgi_request(application, '/api/orders/',
+                              {'Authorization': f'Token {token}'}, 'POST', body)
+        return status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(place, jobs))
+    elapsed = time.perf_counter() - start
+
+    timings = [duration for status, duration in results if status == 201]
+    failures = len(results) - len(timings)
+    result = summarize(timings, elapsed) if timings else {'rps': 0, 'p50': 0, 'p99': 0}
+    statements = count_statements(
+        application, {'Authorization': f'Token {tokens[0]}'}, detail_ids[0])
+
+    print(f'{args.requests} orders, concurrency {args.concurrency}')
+    print(f'orders/s {result["rps"]:.1f}  p50 {result["p50"]:.2f} ms  '
+          f'p99 {result["p99"]:.2f} ms  failed {failures}  '
+          f'statements/order {statements}')
+
+
+if __name__ == '__main__':
+    main()
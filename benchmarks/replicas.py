@@ -0,0 +1,149 @@
+"""
+Read throughput with 0, 1, 2 and 4 read replicas. The replicas are
+SQLite copies of the seeded primary, attached as replica1..replica4 and
+routed by utils.db_routing; --threads WSGI threads send authenticated
+GET requests to the offer, review and profile read endpoints.
+
+SQLite files on one machine never make the database the bottleneck, so
+--db-service-ms turns every alias into an emulated database server that
+runs one statement at a time and needs that long per statement. The
+requests/sec then show how reads spread over the servers; with
+--db-service-ms 0 they show the routing overhead alone.
+
+    python -m benchmarks.replicas --threads 16 --requests 1000 --db-service-ms 10
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.asgi_load import summarize, wsgi_request
+from benchmarks.common import BENCHMARK_DIR, seed, setup_django
+
+REPLICA_COUNTS = (0, 1, 2, 4)
+
+
+def configure_replicas(count):
+    from django.conf import settings
+
+    settings.REPLICA_ROUTING = dict(settings.REPLICA_ROUTING, REPLICAS=[])
+    for index in range(1, count + 1):
+        settings.DATABASES[f'replica{index}'] = dict(
+            settings.DATABASES['default'],
+            NAME=BENCHMARK_DIR / f'bench_replica{index}.sqlite3')
+    settings.DATABASE_ROUTERS = ['utils.db_routing.ReplicaRouter']
+    settings.MIDDLEWARE = settings.MIDDLEWARE + ['utils.db_routing.ReplicaRoutingMiddleware']
+
+
+def copy_primary(count):
+    from django.conf import settings
+    from django.db import connections
+
+    connections.close_all()
+    source = sqlite3.connect(settings.DATABASES['default']['NAME'])
+    for index in range(1, count + 1):
+        target = sqlite3.connect(settings.DATABASES[f'replica{index}']['NAME'])
+        source.backup(target)
+        target.close()
+    source.close()
+
+
+def install_service_time(service_ms, statements):
+    """ One statement at a time per alias, service_ms each. """
+    from django.db.backends.signals import connection_created
+
+    locks = {}
+
+    def wrapper_for(alias):
+        lock = locks.setdefault(alias, threading.Lock())
+
+        def serve(execute, sql, params, many, context):
+            statements[alias] += 1
+            with lock:
+                if service_ms:
+                    time.sleep(service_ms / 1000)
+                return execute(sql, params, many, context)
+        return serve
+
+    def add_wrapper(sender, connection, **kwargs):
+        if not any(getattr(wrapper, 'alias', None) == connection.alias
+                   for wrapper in connection.execute_wrappers):
+            wrapper = wrapper_for(connection.alias)
+            wrapper.alias = connection.alias
+            connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(add_wrapper, weak=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--db-service-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_freelancer.settings')
+    configure_replicas(max(REPLICA_COUNTS))
+    setup_django('bench_replicas.sqlite3')
+    users = seed(business_users=50, customer_users=500, offers=500,
+                 orders=5000, reviews=2000)
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from rest_framework.authtoken.models import Token
+    from offers_app.models import Offer
+    from coderr_freelancer.wsgi import application
+
+    call_command('reconcile_rating_stats', verbosity=0, stdout=open(os.devnull, 'w'))
+    business = users['business'][0]
+    headers = {'Authorization': f'Token {Token.objects.create(user=business).key}'}
+    offer_ids = list(Offer.objects.values_list('pk', flat=True)[:50])
+    business_ids = [user.pk for user in users['business']]
+    copy_primary(max(REPLICA_COUNTS))
+
+    urls = []
+    for index in range(50):
+        urls += [
+            f'/api/offers/{offer_ids[index]}/',
+            f'/api/reviews/?business_user_id={business_ids[index]}',
+            f'/api/offers/?creator_id={business_ids[index]}',
+            f'/api/profile/{business_ids[index]}/',
+        ]
+
+    statements = Counter()
+    install_service_time(args.db_service_ms, statements)
+
+    def one(number):
+        start = time.perf_counter()
+        status = wsgi_request(application, urls[number % len(urls)], headers)
+        assert status < 400, (urls[number % len(urls)], status)
+        return time.perf_counter() - start
+
+    print(f'{args.threads} threads, {args.requests} GET requests per run, '
+          f'{args.db_service_ms} ms per statement and database')
+    print(f'{"replicas":<10}{"req/s":>9}{"p50 ms":>9}{"p99 ms":>9}{"speedup":>9}'
+          f'  statements per database')
+    baseline = None
+    for count in REPLICA_COUNTS:
+        settings.REPLICA_ROUTING['REPLICAS'] = [
+            f'replica{index}' for index in range(1, count + 1)]
+        for number in range(len(urls)):
+            one(number)
+        statements.clear()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            timings = list(pool.map(one, range(args.requests)))
+        result = summarize(timings, time.perf_counter() - start)
+        baseline = baseline or result['rps']
+        spread = ', '.join(f'{alias}: {number}'
+                           for alias, number in sorted(statements.items()))
+        print(f'{count:<10}{result["rps"]:>9.1f}{result["p50"]:>9.2f}'
+              f'{result["p99"]:>9.2f}{result["rps"] / baseline:>8.2f}x  {spread}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares the offer full-text search backend with DRF's icontains 
+SearchFilter on a synthetic corpus of offers.
+
+    python -m benchmarks.search --offers 100000
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, setup_django
+
+COMMON_WORDS = (
+    'logo design website landing page shop wordpress django react angular '
+    'translation german english copywriting seo marketing video editing '
+    'animation illustration icon branding flyer poster podcast mixing '
+    'mastering voiceover data analysis excel python scraping automation '
+    'bot mobile app ios android backend api database migration testing '
+    'security audit consulting coaching photography retouching'
+).split()
+SYLLABLES = 'ka lo mi ne ru ta vi so de pa an el or un is'.split()
+
+
+def build_vocabulary(rng, size=20000):
+    """ Common service words first, followed by rarer pseudo-words. """
+    words = list(COMMON_WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = ''.join(rng.choices(SYLLABLES, k=rng.randint(3, 5)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def seed_offers(count, batch_size=5000):
+    """ Inserts offers whose words follow a Zipf-like distribution. """
+    from django.contrib.auth.models import User
+    from offers_app.models import Offer
+
+    rng = random.Random(42)
+    vocabulary = build_vocabulary(rng)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    user = User.objects.create(username='benchmark', password='!')
+    offers = []
+    for index in range(count):
+        offers.append(Offer(
+            user=user,
+            title=' '.join(rng.choices(vocabulary, weights, k=3)).capitalize(),
+            description=' '.join(rng.choices(vocabulary, weights, k=40))))
+        if len(offers) >= batch_size:
+            Offer.objects.bulk_create(offers)
+            offers = []
+    Offer.objects.bulk_create(offers)
+    return vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--offers', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=6)
+    args = parser.parse_args()
+
+    setup_django('bench_search.sqlite3')
+    from django.db.models import Q
+    from offers_app.models import Offer
+    from offers_app.search import get_search_backend
+
+    vocabulary = seed_offers(args.offers)
+    backend = get_search_backend()
+    backend.rebuild()
+
+    terms = [vocabulary[0], vocabulary[10], f'{vocabulary[3]} {vocabulary[7]}',
+             vocabulary[500], vocabulary[5000], vocabulary[15000]]
+
+    # Like the offers endpoint: COUNT(*) for the paginator plus one page.
+    print(f'{args.offers} offers, backend {type(backend).__name__}')
+    print(f'{"term":<20}{"matches":>9}{"icontains ms":>14}{"fulltext ms":>13}{"speedup":>9}')
+    for term in terms:
+        def icontains():
+            queryset = Offer.objects.all()
+            for word in term.split():
+                queryset = queryset.filter(
+                    Q(title__icontains=word) | Q(description__icontains=word))
+            queryset.count()
+            list(queryset.order_by('-created_at')[:args.page_size])
+
+        def fulltext():
+            queryset = backend.filter_queryset(Offer.objects.all(), term)
+            queryset.count()
+            list(queryset[:args.page_size])
+
+        matches = backend.filter_queryset(Offer.objects.all(), term).count()
+        scan, _ = measure(icontains, args.repeat)
+        indexed, _ = measure(fulltext, args.repeat)
+        print(f'{term:<20}{matches:>9}{scan:>14.2f}{indexed:>13.2f}'
+              f'{scan / indexed:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
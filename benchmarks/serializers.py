@@ -0,0 +1,66 @@
+"""
+Microbenchmark of the list serializers: DRF model serializers on model
+instances against the values()-based fast serializers
+(utils/fast_serializers.py). Both include the query; the outputs are
+checked to be identical before timing.
+
+    python -m benchmarks.serializers --orders 50000 --repeat 5
+"""
+import argparse
+
+from benchmarks.common import measure, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orders', type=int, default=50000)
+    parser.add_argument('--reviews', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django('bench_serializers.sqlite3')
+    seed(business_users=500, customer_users=5000, offers=2000,
+         orders=args.orders, reviews=args.reviews)
+
+    from rest_framework.renderers import JSONRenderer
+    from orders_app.api.serializers import OrderSerializer, OrderValuesSerializer
+    from orders_app.models import Order
+    from reviews_app.api.serializers import ReviewSerializer, ReviewValuesSerializer
+    from reviews_app.models import Review
+    from users_auth_app.api.serializers import (
+        BusinessUserListSerializer, BusinessUserValuesSerializer,
+        CustomerUserListSerializer, CustomerUserValuesSerializer)
+    from users_auth_app.api.views import BusinessUserListView
+    from users_auth_app.models import UserProfileModel
+
+    profiles = UserProfileModel.objects.select_related('user')
+    cases = [
+        ('orders', Order.objects.all(), OrderSerializer, OrderValuesSerializer),
+        ('reviews', Review.objects.all(), ReviewSerializer, ReviewValuesSerializer),
+        ('business profiles', BusinessUserListView().get_queryset(),
+         BusinessUserListSerializer, BusinessUserValuesSerializer),
+        ('customer profiles', profiles.filter(user_type='customer'),
+         CustomerUserListSerializer, CustomerUserValuesSerializer),
+    ]
+
+    render = JSONRenderer().render
+    print(f'{"serializer":<20}{"rows":>8}{"model rows/s":>15}'
+          f'{"values rows/s":>15}{"speedup":>9}')
+    for name, queryset, serializer_class, values_class in cases:
+        rows = queryset.count()
+
+        def model_path():
+            return serializer_class(queryset.all(), many=True).data
+
+        def values_path():
+            return values_class().serialize(queryset.all())
+
+        assert render(model_path()) == render(values_path()), name
+        model_ms, _ = measure(model_path, args.repeat)
+        values_ms, _ = measure(values_path, args.repeat)
+        print(f'{name:<20}{rows:>8}{rows / model_ms * 1000:>15.0f}'
+              f'{rows / values_ms * 1000:>15.0f}{model_ms / values_ms:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
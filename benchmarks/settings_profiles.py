@@ -0,0 +1,134 @@
+"""
+Compares the development settings with the production profile
+(DJANGO_ENV=production) by sending --requests authenticated API requests
+through the WSGI application in one long-lived process per profile,
+reporting requests/sec and the resident set size along the way.
+
+Each profile runs in its own interpreter because the settings module is
+evaluated once per process.
+
+    python -m benchmarks.settings_profiles --requests 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+PROFILES = {
+    'development': {},
+    'production': {
+        'DJANGO_ENV': 'production',
+        'DJANGO_SECRET_KEY': 'benchmark-only-secret-key-' + 'x' * 40,
+        'DJANGO_ALLOWED_HOSTS': 'localhost',
+    },
+}
+
+
+def rss_mb():
+    """ Current resident set size, or the peak where /proc is missing. """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def run_profile(profile, total, samples):
+    from benchmarks.asgi_load import wsgi_request
+    from benchmarks.common import seed, setup_django
+
+    setup_django(f'bench_settings_{profile}.sqlite3')
+    users = seed(business_users=50, customer_users=500, offers=500,
+                 orders=5000, reviews=2000)
+
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.authtoken.models import Token
+    from offers_app.models import Offer
+    from coderr_freelancer.wsgi import application
+
+    business = users['business'][0]
+    token = Token.objects.create(user=business)
+    headers = {'Authorization': f'Token {token.key}', 'Accept': 'application/json'}
+    offer_id = Offer.objects.filter(user=business).values_list('pk', flat=True).first()
+    urls = [
+        '/api/base-info/',
+        f'/api/offers/{offer_id}/',
+        f'/api/order-count/{business.pk}/',
+        f'/api/reviews/?business_user_id={business.pk}',
+        f'/api/profile/{business.pk}/',
+    ]
+    connection.close()
+
+    warmup = min(1000, total)
+    for index in range(warmup):
+        wsgi_request(application, urls[index % len(urls)], headers)
+
+    report = {
+        'profile': profile,
+        'debug': settings.DEBUG,
+        'middleware': len(settings.MIDDLEWARE),
+        'rss_start': rss_mb(),
+        'samples': [],
+    }
+    every = max(1, total // samples)
+    start = time.perf_counter()
+    for index in range(total):
+        status = wsgi_request(application, urls[index % len(urls)], headers)
+        assert status < 400, (urls[index % len(urls)], status)
+        if (index + 1) % every == 0:
+            report['samples'].append((index + 1, rss_mb()))
+    elapsed = time.perf_counter() - start
+
+    report['rps'] = total / elapsed
+    report['rss_end'] = rss_mb()
+    report['queries_logged'] = len(connection.queries_log)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--samples', type=int, default=5,
+                        help='RSS measurements taken during the run.')
+    parser.add_argument('--profile', choices=PROFILES,
+                        help='Run a single profile in this process (internal).')
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args.profile, args.requests, args.samples)))
+        return
+
+    reports = []
+    for profile, environment in PROFILES.items():
+        env = {key: value for key, value in os.environ.items()
+               if not key.startswith('DJANGO_')}
+        env.update(environment)
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.settings_profiles',
+             '--profile', profile, '--requests', str(args.requests),
+             '--samples', str(args.samples)],
+            env=env, check=True, capture_output=True, text=True).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f'{args.requests} requests per profile, 5 read endpoints round-robin')
+    print(f'{"profile":<13}{"DEBUG":>6}{"mw":>4}{"req/s":>9}'
+          f'{"RSS start":>11}{"RSS end":>9}{"growth":>8}{"logged SQL":>12}')
+    for report in reports:
+        print(f'{report["profile"]:<13}{str(report["debug"]):>6}'
+              f'{report["middleware"]:>4}{report["rps"]:>9.1f}'
+              f'{report["rss_start"]:>9.1f}MB{report["rss_end"]:>7.1f}MB'
+              f'{report["rss_end"] - report["rss_start"]:>6.1f}MB'
+              f'{report["queries_logged"]:>12}')
+    for report in reports:
+        samples = ', '.join(f'{count}: {rss:.1f}' for count, rss in report['samples'])
+        print(f'{report["profile"]} RSS (MB) by request: {samples}')
+
+
+if __name__ == '__main__':
+    main()
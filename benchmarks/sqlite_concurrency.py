@@ -0,0 +1,240 @@
+"""
+Multi-process write stress test for the SQLite configuration: --workers
+processes (like gunicorn workers, each with its own connection) start
+at the same moment and each send --operations requests through the WSGI
+application, cycling through order creation, review creation, review
+update, offer update and a review list read.
+
+Runs once with Django's SQLite defaults (rollback journal, deferred
+transactions, 5 s busy timeout) and once with the project settings
+(WAL, pragmas, BEGIN IMMEDIATE), and reports write throughput, write
+latency and the requests that failed with "database is locked".
+
+    python -m benchmarks.sqlite_concurrency --workers 8 --operations 500
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from benchmarks.asgi_load import summarize
+
+MODES = {
+    'default': {},
+    'tuned': None,
+}
+WRITES = ('create-order', 'create-review', 'update-review', 'update-offer')
+
+
+def database_name(mode):
+    return f'bench_sqlite_{mode}.sqlite3'
+
+
+def prepare(mode, workers):
+    from benchmarks.common import seed, setup_django
+
+    setup_django(database_name(mode), options=MODES[mode])
+    users = seed(business_users=workers * 10, customer_users=workers * 50,
+                 offers=workers * 50, orders=workers * 500, reviews=workers * 100)
+
+    from django.core.management import call_command
+    from rest_framework.authtoken.models import Token
+
+    Token.objects.bulk_create([
+        Token(user=user, key=Token.generate_key())
+        for user in users['business'] + users['customers']
+    ])
+    call_command('reconcile_order_stats', verbosity=0, stdout=open('/dev/null', 'w'))
+    call_command('reconcile_rating_stats', verbosity=0, stdout=open('/dev/null', 'w'))
+
+
+def load_worker_data(index, workers):
+    """ Disjoint customers, business users and offers per worker. """
+    from rest_framework.authtoken.models import Token
+    from offers_app.models import Offer, OfferDetail
+    from reviews_app.models import Review
+    from users_auth_app.models import UserProfileModel
+
+    tokens = dict(Token.objects.values_list('user_id', 'key'))
+    profiles = UserProfileModel.objects.order_by('user_id')
+    customers = list(profiles.filter(user_type='customer').values_list(
+        'user_id', flat=True))[index::workers]
+    business = list(profiles.filter(user_type='business').values_list(
+        'user_id', flat=True))
+    own_business = business[index::workers]
+    offers = list(Offer.objects.filter(user_id__in=own_business).values_list('id', 'user_id'))
+    reviews = list(Review.objects.filter(reviewer_id__in=customers).values_list(
+        'id', 'reviewer_id', 'business_user_id'))
+    reviewed = {(reviewer, business_user) for _, reviewer, business_user in reviews}
+    return {
+        'tokens': tokens,
+        'customers': customers,
+        'business': business,
+        'offers': offers,
+        'reviews': [(review_id, reviewer) for review_id, reviewer, _ in reviews],
+        'open_pairs': [(customer, business_user) for customer in customers
+                       for business_user in business
+                       if (customer, business_user) not in reviewed],
+        'details': list(OfferDetail.objects.values_list('id', flat=True)),
+    }
+
+
+def run_worker(mode, index, workers, operations, start_at):
+    from benchmarks.asgi_load import wsgi_request
+    from benchmarks.common import setup_django
+
+    setup_django(database_name(mode), fresh=False, options=MODES[mode])
+
+    from django.core.signals import got_request_exception
+    from django.db import connection
+    from coderr_freelancer.wsgi import application
+
+    errors = Counter()
+
+    def record_error(sender, **kwargs):
+        error = sys.exc_info()[1]
+        errors['locked' if 'database is locked' in str(error) else type(error).__name__] += 1
+
+    got_request_exception.connect(record_error, weak=False)
+
+    data = load_worker_data(index, workers)
+    rng = random.Random(index)
+    rng.shuffle(data['open_pairs'])
+    tokens = data['tokens']
+    connection.close()
+
+    def auth(user_id):
+        return {'Authorization': f'Token {tokens[user_id]}'}
+
+    def create_order():
+        customer = rng.choice(data['customers'])
+        body = {'offer_detail_id': rng.choice(data['details'])}
+        return 'POST', '/api/orders/', auth(customer), body
+
+    def create_review():
+        customer, business_user = data['open_pairs'].pop()
+        body = {'business_user': business_user, 'rating': rng.randint(1, 5),
+                'description': 'Stress test review'}
+        return 'POST', '/api/reviews/', auth(customer), body
+
+    def update_review():
+        review_id, reviewer = rng.choice(data['reviews'])
+        body = {'rating': rng.randint(1, 5), 'description': 'Updated'}
+        return 'PATCH', f'/api/reviews/{review_id}/', auth(reviewer), body
+
+    def update_offer():
+        offer_id, owner = rng.choice(data['offers'])
+        body = {'title': f'Offer {offer_id} rev {rng.randint(0, 10 ** 6)}'}
+        return 'PATCH', f'/api/offers/{offer_id}/', auth(owner), body
+
+    def read_reviews():
+        business_user = rng.choice(data['business'])
+        return ('GET', f'/api/reviews/?business_user_id={business_user}',
+                auth(rng.choice(data['customers'])), None)
+
+    kinds = [('create-order', create_order), ('create-review', create_review),
+             ('update-review', update_review), ('update-offer', update_offer),
+             ('read', read_reviews)]
+
+    time.sleep(max(0, start_at - time.time()))
+    timings = {kind: [] for kind, _ in kinds}
+    statuses = Counter()
+    start = time.perf_counter()
+    for number in range(operations):
+        kind, build = kinds[number % len(kinds)]
+        method, url, headers, body = build()
+        body = json.dumps(body).encode() if body is not None else b''
+        request_start = time.perf_counter()
+        status = wsgi_request(application, url, headers, method, body)
+        timings[kind].append(time.perf_counter() - request_start)
+        statuses[f'{kind} {status}'] += 1
+
+    return {
+        'elapsed': time.perf_counter() - start,
+        'timings': timings,
+        'statuses': statuses,
+        'errors': errors,
+    }
+
+
+def run_mode(mode, workers, operations):
+    subprocess.run([sys.executable, '-m', 'benchmarks.sqlite_concurrency',
+                    '--prepare', mode, '--workers', str(workers)], check=True)
+    start_at = time.time() + 3 + workers * 0.5
+    processes = [
+        subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.sqlite_concurrency',
+             '--worker', mode, '--index', str(index), '--workers', str(workers),
+             '--operations', str(operations), '--start-at', str(start_at)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for index in range(workers)
+    ]
+    results = []
+    for process in processes:
+        output, _ = process.communicate()
+        if process.returncode:
+            raise RuntimeError(f'{mode} worker failed with exit code {process.returncode}')
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    elapsed = max(result['elapsed'] for result in results)
+    statuses, errors = Counter(), Counter()
+    write_timings = []
+    for result in results:
+        statuses.update(result['statuses'])
+        errors.update(result['errors'])
+        for kind in WRITES:
+            write_timings.extend(result['timings'][kind])
+
+    succeeded = sum(count for key, count in statuses.items()
+                    if key.split()[0] in WRITES and int(key.split()[1]) < 400)
+    failed = {key: count for key, count in statuses.items() if int(key.split()[1]) >= 400}
+    latency = summarize(write_timings, elapsed)
+    return {
+        'writes_per_second': succeeded / elapsed,
+        'writes': succeeded,
+        'p50': latency['p50'],
+        'p99': latency['p99'],
+        'locked': errors.get('locked', 0),
+        'failed': failed,
+        'errors': dict(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--operations', type=int, default=500,
+                        help='Requests per worker process.')
+    parser.add_argument('--prepare', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--index', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.prepare:
+        prepare(args.prepare, args.workers)
+        return
+    if args.worker:
+        result = run_worker(args.worker, args.index, args.workers,
+                            args.operations, args.start_at)
+        print(json.dumps(result))
+        return
+
+    print(f'{args.workers} worker processes x {args.operations} requests '
+          f'(4 of 5 are writes)')
+    print(f'{"mode":<9}{"writes":>8}{"writes/s":>10}{"p50 ms":>9}{"p99 ms":>10}'
+          f'{"locked":>8}  failed requests')
+    for mode in MODES:
+        result = run_mode(mode, args.workers, args.operations)
+        failed = ', '.join(f'{key}: {count}' for key, count in
+                           sorted(result['failed'].items())) or '-'
+        print(f'{mode:<9}{result["writes"]:>8}{result["writes_per_second"]:>10.1f}'
+              f'{result["p50"]:>9.1f}{result["p99"]:>10.1f}'
+              f'{result["locked"]:>8}  {failed}')
+
+
+if __name__ == '__main__':
+    main()
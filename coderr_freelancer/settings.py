@@ -13,26 +13,52 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# DJANGO_ENV=production selects the production profile: DEBUG off (no
+# SQL log in connection.queries), persistent database connections, the
+# token-only API middleware stack and JSON-only rendering. The admin and
+# the session/CSRF/messages middleware it needs stay available in
+# production with DJANGO_ADMIN=1.
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+PRODUCTION = os.environ.get('DJANGO_ENV') == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-te35boejsgk&%3)l$$h$(bnn*)e=*^-j0@$*8tg0vajf^fgv3#'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured('DJANGO_SECRET_KEY must be set in production.')
+    SECRET_KEY = 'django-insecure-te35boejsgk&%3)l$$h$(bnn*)e=*^-j0@$*8tg0vajf^fgv3#'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', not PRODUCTION)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS')
+
+ADMIN_ENABLED = env_bool('DJANGO_ADMIN', not PRODUCTION)
 
 
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -42,7 +68,6 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'django_filters',
-    'django_extensions',
     'offers_app',
     'orders_app',
     'reviews_app',
@@ -50,21 +75,67 @@ INSTALLED_APPS = [
     'base_info_app',
 ]
 
+if ADMIN_ENABLED:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin')
+
+# Development helpers (shell_plus, runserver_plus, ...) are not installed
+# in production.
+if not PRODUCTION:
+    INSTALLED_APPS.append('django_extensions')
+
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# serve_media (utils/media.py) serves MEDIA_URL with DEBUG on, or when
+# BACKEND 'x-sendfile' or 'x-accel-redirect' hands the transfer to
+# Apache/lighttpd or nginx (internal location at ACCEL_PREFIX aliased to
+# MEDIA_ROOT); with 'django' it streams a FileResponse. With
+# DJANGO_MEDIA_HASHED_NAMES=1 uploads get content-hashed names
+# (photo.3f2a9c1b7d4e.jpg) that are served as immutable; this changes the
+# file names the API returns.
+MEDIA_HASHED_NAMES = env_bool('DJANGO_MEDIA_HASHED_NAMES', False)
+STORAGES = {
+    'default': {'BACKEND': 'utils.media.HashedFileSystemStorage' if MEDIA_HASHED_NAMES
+                else 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_SERVING = {
+    'BACKEND': os.environ.get('DJANGO_MEDIA_BACKEND', 'django'),
+    'ACCEL_PREFIX': '/protected-media/',
+    'MAX_AGE': 3600,
+}
+
+# The API authenticates with tokens inside DRF, so sessions, CSRF,
+# messages and request.user from AuthenticationMiddleware are only
+# needed by the admin.
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if ADMIN_ENABLED:
+    common = MIDDLEWARE.index('django.middleware.common.CommonMiddleware')
+    MIDDLEWARE[common:common + 1] = [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+
+# Opt-in per-endpoint SQL instrumentation (Server-Timing headers and
+# /api/metrics/). QUERY_BUDGETS maps URL names to the maximum number of
+# queries a view may run; with QUERY_BUDGET_STRICT a violation raises.
+QUERY_INSTRUMENTATION = os.environ.get('QUERY_INSTRUMENTATION') == '1'
+QUERY_BUDGETS = {}
+QUERY_BUDGET_STRICT = False
+
+if QUERY_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'utils.instrumentation.QueryInstrumentationMiddleware')
+
 ROOT_URLCONF = 'coderr_freelancer.urls'
 
 TEMPLATES = [
@@ -88,10 +159,102 @@ WSGI_APPLICATION = 'coderr_freelancer.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite set up for several worker processes: in WAL mode readers do not
+# block the writer and vice versa, NORMAL sync is safe with WAL and
+# avoids an fsync per commit, and the page cache plus memory-mapped I/O
+# keep hot pages out of read() calls. Applied on every new connection.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 2 ** 20,
+    'cache_size': -64 * 2 ** 10,  # negative: KiB instead of pages
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a worker reuses its connection; 0 closes it per request.
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600 if PRODUCTION else 0)),
+        'CONN_HEALTH_CHECKS': PRODUCTION,
+        'OPTIONS': {
+            # atomic() blocks (all write paths) take the write lock with
+            # BEGIN IMMEDIATE, so they queue for it up to `timeout`
+            # seconds instead of failing with "database is locked" when
+            # a read inside the transaction has to be upgraded.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': int(os.environ.get('DJANGO_SQLITE_TIMEOUT', 20)),
+            'init_command': ';'.join(
+                f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+        },
+    }
+}
+
+
+# Read replicas (utils/db_routing.py): reads of GET/HEAD/OPTIONS requests
+# go to a random available replica unless the user wrote within
+# STICKY_SECONDS. DJANGO_SQLITE_REPLICAS lists replica database files
+# kept in sync with the primary, or plain copies as local stand-ins.
+# With several workers PIN_CACHE must name a cache shared between them.
+REPLICA_ROUTING = {
+    'REPLICAS': [],
+    'STICKY_SECONDS': 5,
+    'PIN_CACHE': 'default',
+    'RETRY_SECONDS': 30,
+    'PRIMARY_MODELS': ['authtoken.token'],
+}
+
+for index, name in enumerate(env_list('DJANGO_SQLITE_REPLICAS'), 1):
+    DATABASES[f'replica{index}'] = dict(
+        DATABASES['default'], NAME=name, TEST={'MIRROR': 'default'})
+    REPLICA_ROUTING['REPLICAS'].append(f'replica{index}')
+
+# Order shards (orders_app/sharding.py): DJANGO_ORDER_SHARDS lists database
+# files that store the orders, placed by business_user_id modulo the
+# number of shards. After adding or removing shards, move the existing
+# orders with `manage.py reshard_orders --from default`. Shards only hold
+# the orders table; users and offer details stay on the primary, so
+# SQLite cannot check those foreign keys there and Django's delete
+# collector does not cascade to them. pre_delete handlers in
+# orders_app/signals.py delete the orders of a deleted user or offer
+# detail on every shard instead.
+ORDER_SHARDING = {
+    'SHARDS': [],
+    'ID_BLOCK_SIZE': 1000,
+}
+
+for index, name in enumerate(env_list('DJANGO_ORDER_SHARDS'), 1):
+    options = DATABASES['default']['OPTIONS']
+    DATABASES[f'orders{index}'] = dict(
+        DATABASES['default'], NAME=name, OPTIONS=dict(
+            options, init_command=options['init_command'] + ';PRAGMA foreign_keys=OFF'))
+    ORDER_SHARDING['SHARDS'].append(f'orders{index}')
+
+# OrderShardRouter must come first: it answers every order read, so
+# ReplicaRouter never sends orders to a replica of the primary.
+DATABASE_ROUTERS = []
+
+if ORDER_SHARDING['SHARDS']:
+    DATABASE_ROUTERS.append('orders_app.sharding.OrderShardRouter')
+
+if REPLICA_ROUTING['REPLICAS']:
+    DATABASE_ROUTERS.append('utils.db_routing.ReplicaRouter')
+    MIDDLEWARE.append('utils.db_routing.ReplicaRoutingMiddleware')
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# LocMemCache is private to each process. With several workers, writes
+# only invalidate cached entries (base info statistics, authenticated
+# tokens, replica pins) in the worker that handled them; the others see
+# the change when the entry times out. Configure a shared backend such
+# as Redis or Memcached for immediate invalidation across workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr-default',
     }
 }
 
@@ -144,11 +307,49 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:4200",
 ]
 
+# Token -> user/profile cache of CachedTokenAuthentication. Each process
+# keeps entries for LOCAL_TTL seconds, so a deleted token stops working
+# in the other workers after at most that long. SHARED_CACHE names an
+# entry of CACHES shared between the workers (Redis, Memcached) that
+# keeps entries for TTL seconds; a process-local backend such as the
+# default LocMemCache is skipped.
+TOKEN_AUTH_CACHE = {
+    'TTL': 60,
+    'LOCAL_TTL': 5,
+    'MAX_SIZE': 10000,
+    'SHARED_CACHE': 'default',
+}
+
+# Resized, metadata-free WebP/JPEG variants of uploaded offer images and
+# profile pictures (utils/images.py), generated by a worker pool.
+IMAGE_VARIANTS = {
+    'SIZES': {
+        'thumb': (160, 120),
+        'card': (480, 360),
+        'large': (1280, 960),
+    },
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    'WORKERS': 2,
+    'ASYNC': True,
+}
+
+# Serve unpaginated order, review and profile lists from values() rows
+# (utils/fast_serializers.py) instead of model serializers. Off until the
+# output of both paths has been compared on real data
+# (python -m benchmarks.serializers asserts they are identical).
+FAST_READ_SERIALIZERS = False
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'utils.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
 }
+
+if not DEBUG:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'rest_framework.renderers.JSONRenderer',
+    ]
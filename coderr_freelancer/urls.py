@@ -14,20 +14,24 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path, include
+from utils.instrumentation import QueryMetricsView
+from utils.media import media_urlpatterns
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('users_auth_app.api.urls')),
     path('api/', include('base_info_app.api.urls')),
     path('api/', include('offers_app.api.urls')),
     path('api/', include('orders_app.api.urls')),
     path('api/', include('reviews_app.api.urls')),
+    path('api/metrics/', QueryMetricsView.as_view(), name='query-metrics'),
 ]
 
-urlpatterns += static(settings.MEDIA_URL,
-                      document_root=settings.MEDIA_ROOT)
+urlpatterns += media_urlpatterns()
+
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
 
@@ -68,5 +68,5 @@ class OfferDetailInline(admin.StackedInline):
 
 @admin.register(Offer)
 class OfferAdmin(admin.ModelAdmin):
-    list_display = ('title', 'user', 'created_at')
+    list_display = ('title', 'user', 'min_price', 'created_at')
     inlines = [OfferDetailInline]
@@ -0,0 +1,18 @@
+from rest_framework import filters
+from offers_app.search import get_search_backend
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that answers ?search= from the full-text search backend
+    (ranked, best match first) and falls back to DRF's icontains search
+    when no backend supports the current database.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_search_backend()
+        if not terms or backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        return backend.filter_queryset(queryset, ' '.join(terms))
@@ -1,10 +1,47 @@
 from rest_framework import serializers
+from django.db import transaction
 from offers_app.models import Offer, OfferDetail
+from offers_app.signals import offers_bulk_created
 from django.db.models import Min
 from rest_framework.reverse import reverse as drf_reverse
+from utils.images import variant_urls
+from utils.instrumentation import TimedSerializerMixin
 
 
-class OfferDetailsSerializer(serializers.ModelSerializer):
+def create_offers_with_details(offers, details_per_offer):
+    """
+    Inserts the given unsaved offers and their detail data with one 
+    bulk INSERT per table, storing the min values on the offers up 
+    front. The created details are placed in the prefetch cache so the 
+    offers can be rendered without further queries.
+    """
+    details_per_offer = [
+        [OfferDetail(**detail_data) for detail_data in details_data]
+        for details_data in details_per_offer
+    ]
+    for offer, details in zip(offers, details_per_offer):
+        offer.set_min_values(details)
+
+    with transaction.atomic():
+        if len(offers) == 1:
+            offers[0].save()
+        else:
+            Offer.objects.bulk_create(offers)
+            offers_bulk_created.send(sender=Offer, offers=offers)
+
+        all_details = []
+        for offer, details in zip(offers, details_per_offer):
+            for detail in details:
+                detail.offer = offer
+            all_details.extend(details)
+        OfferDetail.objects.bulk_create(all_details)
+
+    for offer, details in zip(offers, details_per_offer):
+        offer._prefetched_objects_cache = {'offer_details': details}
+    return offers
+
+
+class OfferDetailsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for OfferDetail model. Serializes offer detail fields 
     for API responses.
@@ -28,7 +65,7 @@ class OfferDetailsListSerializer(serializers.ModelSerializer):
         return f"/offerdetails/{obj.id}/"
 
 
-class OfferDetailsRetrieveSerializer(serializers.ModelSerializer):
+class OfferDetailsRetrieveSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
 
     class Meta:
@@ -40,7 +77,7 @@ class OfferDetailsRetrieveSerializer(serializers.ModelSerializer):
         return drf_reverse('offerdetails-detail', args=[obj.id], request=request)
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Offer model. Includes related user details, 
     offer details, image handling, and computed fields like minimum 
@@ -53,6 +90,7 @@ class OfferSerializer(serializers.ModelSerializer):
     min_price = serializers.FloatField(read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
     image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -61,6 +99,7 @@ class OfferSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'image_variants',
             'description',
             'created_at',
             'updated_at',
@@ -75,44 +114,77 @@ class OfferSerializer(serializers.ModelSerializer):
         details_data = self.initial_data.get('details', [])
         user = self.context["request"].user
         validated_data["user"] = user
-        offer = Offer.objects.create(**validated_data)
-
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
-
-        return Offer.objects.prefetch_related('offer_details').get(pk=offer.pk)
+        offer = Offer(**validated_data)
+        return create_offers_with_details([offer], [details_data])[0]
 
     def update(self, instance, validated_data):
         details_data = self.initial_data.get('details', None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
-
-        if details_data is not None:
-            existing_details = {
-                detail.offer_type: detail for detail in instance.offer_details.all()
-            }
-
-            for detail_data in details_data:
-                offer_type = detail_data.get("offer_type")
-
-                if not offer_type:
-                    raise serializers.ValidationError(
-                        "Each detail must include an 'offer_type' field to be properly matched."
-                    )
-
-                if offer_type in existing_details:
-                    detail_instance = existing_details[offer_type]
-                    for attr, value in detail_data.items():
-                        if attr != 'offer_type':
-                            setattr(detail_instance, attr, value)
-                    detail_instance.save()
-                else:
-                    OfferDetail.objects.create(offer=instance, **detail_data)
+
+        with transaction.atomic():
+            if details_data is not None:
+                self.update_details(instance, details_data)
+            instance.save()
 
         return instance
 
+    def update_details(self, instance, details_data):
+        """
+        Applies the detail data matched by offer_type with one bulk UPDATE 
+        and one bulk INSERT, and refreshes the offer's min values and 
+        prefetched details in memory.
+        """
+        details = list(instance.offer_details.all())
+        existing_details = {detail.offer_type: detail for detail in details}
+        changed, created, fields = [], [], set()
+
+        for detail_data in details_data:
+            offer_type = detail_data.get("offer_type") if isinstance(detail_data, dict) else None
+
+            if not offer_type:
+                raise serializers.ValidationError(
+                    "Each detail must include an 'offer_type' field to be properly matched."
+                )
+
+            detail_data = self.validate_detail(
+                detail_data, partial=offer_type in existing_details)
+            if offer_type in existing_details:
+                detail_instance = existing_details[offer_type]
+                for attr, value in detail_data.items():
+                    if attr != 'offer_type':
+                        setattr(detail_instance, attr, value)
+                        fields.add(attr)
+                changed.append(detail_instance)
+            else:
+                detail_instance = OfferDetail(offer=instance, **detail_data)
+                created.append(detail_instance)
+                details.append(detail_instance)
+
+        if changed and fields:
+            OfferDetail.objects.bulk_update(changed, sorted(fields))
+        if created:
+            OfferDetail.objects.bulk_create(created)
+
+        instance.set_min_values(details)
+        if not hasattr(instance, '_prefetched_objects_cache'):
+            instance._prefetched_objects_cache = {}
+        instance._prefetched_objects_cache['offer_details'] = details
+
+    def validate_detail(self, detail_data, partial):
+        """
+        Validates one entry of 'details' with OfferDetailInputSerializer 
+        and rejects keys it does not accept, such as 'id'.
+        """
+        serializer = OfferDetailInputSerializer(data=detail_data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        unknown = sorted(set(detail_data) - set(serializer.fields))
+        if unknown:
+            raise serializers.ValidationError(
+                {key: "This field cannot be changed." for key in unknown})
+        return serializer.validated_data
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         request = self.context.get('request')
@@ -158,6 +230,9 @@ class OfferSerializer(serializers.ModelSerializer):
             return obj.image.name.split('/')[-1]
         return None
 
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image, obj.image_variants)
+
 
 class OfferDetailInputSerializer(serializers.ModelSerializer):
     class Meta:
@@ -172,7 +247,7 @@ class OfferDetailInputSerializer(serializers.ModelSerializer):
         return value
 
 
-class OfferCreateSerializer(serializers.ModelSerializer):
+class OfferCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     details = OfferDetailInputSerializer(many=True, write_only=True)
     image = serializers.ImageField(allow_null=True, required=False)
 
@@ -196,10 +271,8 @@ class OfferCreateSerializer(serializers.ModelSerializer):
         details_data = validated_data.pop('details')
         user = self.context["request"].user
         validated_data["user"] = user
-        offer = Offer.objects.create(**validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
-        return offer
+        offer = Offer(**validated_data)
+        return create_offers_with_details([offer], [details_data])[0]
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -207,3 +280,38 @@ class OfferCreateSerializer(serializers.ModelSerializer):
             instance.offer_details.all(), many=True
         ).data
         return representation
+
+
+class OfferBatchListSerializer(serializers.ListSerializer):
+    """
+    List serializer for importing many offers at once. All offers and 
+    their details are written with one bulk INSERT per table.
+    """
+    max_batch_size = 100
+
+    def validate(self, attrs):
+        if len(attrs) > self.max_batch_size:
+            raise serializers.ValidationError(
+                f"At most {self.max_batch_size} offers can be imported at once.")
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context["request"].user
+        offers, details_per_offer = [], []
+        for item in validated_data:
+            details_per_offer.append(item.pop('details'))
+            offers.append(Offer(user=user, **item))
+        return create_offers_with_details(offers, details_per_offer)
+
+
+class OfferBatchCreateSerializer(OfferCreateSerializer):
+    """
+    Serializer for one offer of a batch import. Images are not part of 
+    the JSON import and can be uploaded per offer afterwards.
+    """
+
+    image = None
+
+    class Meta(OfferCreateSerializer.Meta):
+        fields = ['id', 'title', 'description', 'details']
+        list_serializer_class = OfferBatchListSerializer
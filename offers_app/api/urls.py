@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework import routers
-from offers_app.api.views import OfferViewSet, OfferDetailViewSet
+from offers_app.api.views import (OfferViewSet,
+                                  OfferDetailViewSet,
+                                  AsyncOfferListView,
+                                  AsyncOfferDetailView)
 
 
 router = routers.SimpleRouter()
@@ -9,4 +12,8 @@ router.register(r'offerdetails', OfferDetailViewSet, basename='offerdetails')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/offers/', AsyncOfferListView.as_view(),
+         name='async-offer-list'),
+    path('async/offers/<int:pk>/', AsyncOfferDetailView.as_view(),
+         name='async-offer-detail'),
 ]
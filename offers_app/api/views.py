@@ -1,31 +1,39 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min
 from django.db.models.functions import Greatest
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ValidationError, NotFound
+from rest_framework.permissions import AllowAny
 from offers_app.models import Offer, OfferDetail
 from offers_app.api.serializers import (
     OfferSerializer,
     OfferDetailsSerializer,
-    OfferCreateSerializer
+    OfferCreateSerializer,
+    OfferBatchCreateSerializer
 )
+from offers_app.api.filters import OfferSearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from utils.pagination import SixPerPagePagination
+from utils.pagination import PageOrKeysetPagination
 from utils.permissions import IsBusinessOwnerOrAdmin
+from utils.async_views import AsyncAPIView, AsyncPageNumberMixin
+from utils.mixins import ResponseSerializerMixin
 
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(ResponseSerializerMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Offer objects.
     Provides list, create, retrieve, update, and delete operations.
     """
     queryset = Offer.objects.all()
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       OfferSearchFilter, filters.OrderingFilter]
     permission_classes = [IsBusinessOwnerOrAdmin]
-    pagination_class = SixPerPagePagination
+    pagination_class = PageOrKeysetPagination
+    response_serializer_classes = {'partial_update': OfferCreateSerializer}
+    # OfferSerializer.update keeps the prefetched offer_details current.
+    clear_prefetch_after_update = False
 
     filterset_fields = {
         'user': ['exact'],
@@ -36,9 +44,9 @@ class OfferViewSet(viewsets.ModelViewSet):
     ordering_fields = ['min_price', 'created_at', 'updated_at']
 
     def get_queryset(self):
-        queryset = self.queryset.annotate(
-            min_price=Min('offer_details__price'),
-            min_delivery_time=Min('offer_details__delivery_time_in_days'),
+        queryset = self.queryset.select_related('user').prefetch_related(
+            'offer_details'
+        ).annotate(
             latest_date=Greatest('created_at', 'updated_at')
         )
 
@@ -72,20 +80,56 @@ class OfferViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return OfferCreateSerializer
+        if self.action == 'batch':
+            return OfferBatchCreateSerializer
         return OfferSerializer
 
     def perform_create(self, serializer):
-        offer = serializer.save(user=self.request.user)
+        serializer.save(user=self.request.user)
 
-        offer = Offer.objects.prefetch_related(
-            'offer_details').get(pk=offer.pk)
-        self._prefetched_object = offer
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Creates many offers, each with its three details, in one request 
+        and one transaction (catalogue import for business users).
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def partial_update(self, request, *args, **kwargs):
-        super().partial_update(request, *args, **kwargs)
-        serializer = OfferCreateSerializer(
-            self.get_object(), context={'request': request}
-        )
+
+class AsyncOfferListView(AsyncPageNumberMixin, AsyncAPIView):
+    """
+    Async variant of the OfferViewSet list endpoint for ASGI deployments. 
+    Supports the same filters, search, ordering and page-number 
+    pagination and returns the same response shape.
+    """
+    permission_classes = [AllowAny]
+    action = 'list'
+
+    async def get(self, request):
+        queryset = await self.filter_with_viewset(OfferViewSet, self.action)
+        offers, meta = await self.paginate(queryset)
+        serializer = OfferSerializer(
+            offers, many=True, context=self.get_serializer_context())
+        return self.paginated_response(serializer.data, meta)
+
+
+class AsyncOfferDetailView(AsyncAPIView):
+    """
+    Async variant of the OfferViewSet retrieve endpoint for ASGI deployments.
+    """
+    action = 'retrieve'
+
+    async def get(self, request, pk):
+        queryset = await self.filter_with_viewset(OfferViewSet, self.action)
+        try:
+            offer = await queryset.aget(pk=pk)
+        except Offer.DoesNotExist:
+            raise NotFound('No Offer matches the given query.')
+        serializer = OfferSerializer(
+            offer, context=self.get_serializer_context())
         return Response(serializer.data)
 
 
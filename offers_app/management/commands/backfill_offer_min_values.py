@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the denormalized min_price and min_delivery_time columns 
+    of all offers (or only the given offer ids) from their offer details.
+    """
+    help = 'Backfills Offer.min_price and Offer.min_delivery_time from the offer details.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('offer_ids', nargs='*', type=int,
+                            help='Only update these offers.')
+
+    def handle(self, *args, **options):
+        queryset = Offer.objects.all()
+        if options['offer_ids']:
+            queryset = queryset.filter(pk__in=options['offer_ids'])
+
+        updated = queryset.update_min_values()
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated min values of {updated} offer(s).'))
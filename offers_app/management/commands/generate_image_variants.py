@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from offers_app.models import Offer
+from users_auth_app.models import UserProfileModel
+from utils.images import delete_variants, process_variants
+
+
+class Command(BaseCommand):
+    """
+    Generates the resized variants of offer images and profile pictures 
+    uploaded before the variant pipeline existed or whose variants are 
+    outdated. Runs inline, one image after the other.
+    """
+    help = 'Generates missing image variants of offers and profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate variants that already exist.')
+
+    def handle(self, *args, **options):
+        targets = [(Offer, 'image', 'image_variants'),
+                   (UserProfileModel, 'file', 'file_variants')]
+        for model, field_name, variants_field in targets:
+            count = 0
+            rows = model.objects.exclude(**{field_name: ''}).exclude(
+                **{f'{field_name}__isnull': True}).values_list(
+                'pk', field_name, variants_field)
+            storage = model._meta.get_field(field_name).storage
+            for pk, name, variants in rows.iterator():
+                if not options['force'] and (variants or {}).get('source') == name:
+                    continue
+                if options['force'] and variants:
+                    delete_variants(storage, variants)
+                    model.objects.filter(pk=pk).update(**{variants_field: {}})
+                process_variants(model, pk, field_name, variants_field)
+                count += 1
+            self.stdout.write(self.style.SUCCESS(
+                f'Generated variants for {count} {model._meta.verbose_name_plural}.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from offers_app.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text search index of all offers, e.g. after rows 
+    were written without signals (bulk_create, raw SQL).
+    """
+    help = 'Rebuilds the offer full-text search index.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError(
+                'No offer search backend supports the current database.')
+
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt offer search index with {type(backend).__name__}.'))
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+FTS_TABLE = 'offers_app_offer_fts'
+PG_SEARCH_INDEX = 'offer_search_vector_idx'
+PG_SEARCH_VECTOR = "to_tsvector('simple', title || ' ' || description)"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, description, tokenize='unicode61 remove_diacritics 2')")
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            f'SELECT id, title, description FROM offers_app_offer')
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {PG_SEARCH_INDEX} ON offers_app_offer '
+            f'USING GIN ({PG_SEARCH_VECTOR})')
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_SEARCH_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,27 +1,77 @@
 import json
 from django.db import models
+from django.db.models import Min, OuterRef, Subquery
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+class OfferQuerySet(models.QuerySet):
+    def update_min_values(self):
+        """
+        Recomputes the denormalized min_price and min_delivery_time 
+        columns from the offer details in a single UPDATE statement.
+        """
+        details = OfferDetail.objects.filter(
+            offer=OuterRef('pk')).order_by().values('offer')
+        return self.update(
+            min_price=Subquery(
+                details.annotate(value=Min('price')).values('value')),
+            min_delivery_time=Subquery(
+                details.annotate(value=Min('delivery_time_in_days')).values('value')),
+        )
+
+
 class Offer(models.Model):
     """
     Model representing a freelance offer, including title, description, 
     optional image file, creator (user), and timestamps for creation 
-    and last update.
+    and last update. The lowest price and delivery time of its details 
+    are stored on the offer so they can be filtered and ordered by index.
     """
     title = models.CharField(max_length=255)
     description = models.TextField()
     image = models.ImageField(upload_to='offer_pics/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='offers')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True,
+        editable=False, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, db_index=True)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='offer_created_idx'),
+            models.Index(fields=['user', '-created_at'],
+                         name='offer_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def update_min_values(self):
+        Offer.objects.filter(pk=self.pk).update_min_values()
+        self.refresh_from_db(fields=['min_price', 'min_delivery_time'])
+
+    def set_min_values(self, details):
+        """
+        Sets min_price and min_delivery_time from the given (possibly 
+        unsaved) OfferDetail instances without touching the database.
+        """
+        price_field = OfferDetail._meta.get_field('price')
+        prices = [price_field.to_python(detail.price)
+                  for detail in details if detail.price is not None]
+        days = [int(detail.delivery_time_in_days) for detail in details
+                if detail.delivery_time_in_days is not None]
+        self.min_price = min(prices, default=None)
+        self.min_delivery_time = min(days, default=None)
+
 
 class OfferDetail(models.Model):
     """
@@ -48,3 +98,13 @@ class OfferDetail(models.Model):
 
     def __str__(self):
         return f"{self.offer.title} - {self.offer_type.capitalize()}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Offer.objects.filter(pk=self.offer_id).update_min_values()
+
+    def delete(self, *args, **kwargs):
+        offer_id = self.offer_id
+        result = super().delete(*args, **kwargs)
+        Offer.objects.filter(pk=offer_id).update_min_values()
+        return result
@@ -0,0 +1,133 @@
+import re
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'offers_app_offer_fts'
+PG_SEARCH_INDEX = 'offer_search_vector_idx'
+PG_SEARCH_VECTOR = (
+    "to_tsvector('simple', offers_app_offer.title || ' ' || "
+    "offers_app_offer.description)"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    """
+    Interface of the offer full-text search backends. filter_queryset()
+    restricts an Offer queryset to the matches of a query, annotates
+    them with search_rank (higher is better) and orders by it.
+    """
+
+    def is_available(self):
+        return False
+
+    def filter_queryset(self, queryset, query):
+        raise NotImplementedError
+
+    def index_offer(self, offer):
+        pass
+
+    def index_offers(self, offers):
+        for offer in offers:
+            self.index_offer(offer)
+
+    def remove_offer(self, offer_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Inverted index in an FTS5 virtual table keyed by the offer id,
+    maintained by the Offer post_save/post_delete signals. Terms are
+    matched as prefixes and ranked with bm25. The FTS table is joined
+    into the offer query so counting and paging stay a single query.
+    """
+
+    def is_available(self):
+        return connection.vendor == 'sqlite'
+
+    def build_match(self, query):
+        tokens = _TOKEN_RE.findall(query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def filter_queryset(self, queryset, query):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = offers_app_offer.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-{FTS_TABLE}.rank'},
+        ).order_by('-search_rank', '-pk')
+
+    def index_offer(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+                [offer.pk, offer.title, offer.description])
+
+    def index_offers(self, offers):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+                [(offer.pk, offer.title, offer.description) for offer in offers])
+
+    def remove_offer(self, offer_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+                f'SELECT id, title, description FROM offers_app_offer')
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Searches a GIN-indexed tsvector expression over title and description.
+    PostgreSQL keeps the expression index up to date on every write, so
+    no signal handling is needed.
+    """
+
+    def is_available(self):
+        return connection.vendor == 'postgresql'
+
+    def filter_queryset(self, queryset, query):
+        terms = _TOKEN_RE.findall(query)
+        if not terms:
+            return queryset.none()
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.extra(
+            where=[f"{PG_SEARCH_VECTOR} @@ to_tsquery('simple', %s)"],
+            params=[tsquery],
+            select={'search_rank': f"ts_rank({PG_SEARCH_VECTOR}, to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+        ).order_by('-search_rank', '-pk')
+
+
+DEFAULT_BACKENDS = [SQLiteFTSBackend, PostgresSearchBackend]
+
+
+def get_search_backend():
+    """
+    Returns the configured search backend (settings.OFFER_SEARCH_BACKEND
+    as a dotted path) or the first default backend supporting the current
+    database. Returns None if no backend is available.
+    """
+    path = getattr(settings, 'OFFER_SEARCH_BACKEND', None)
+    candidates = [import_string(path)] if path else DEFAULT_BACKENDS
+    for backend_class in candidates:
+        backend = backend_class()
+        if backend.is_available():
+            return backend
+    return None
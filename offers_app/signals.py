@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Offer
+from .search import get_search_backend
+from utils.images import schedule_variants
+
+# Sent after Offer.objects.bulk_create() with the created offers, which
+# bypasses post_save.
+offers_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Offer, dispatch_uid='offer_search_index')
+def index_offer(sender, instance, **kwargs):
+    """ Adds or refreshes the offer in the full-text search index. """
+    backend = get_search_backend()
+    if backend is not None:
+        backend.index_offer(instance)
+
+
+@receiver(post_delete, sender=Offer, dispatch_uid='offer_search_remove')
+def remove_offer(sender, instance, **kwargs):
+    """ Drops the deleted offer from the full-text search index. """
+    backend = get_search_backend()
+    if backend is not None:
+        backend.remove_offer(instance.pk)
+
+
+@receiver(offers_bulk_created, sender=Offer, dispatch_uid='offer_search_bulk_index')
+def index_offers(sender, offers, **kwargs):
+    """ Adds bulk-created offers to the full-text search index. """
+    backend = get_search_backend()
+    if backend is not None:
+        backend.index_offers(offers)
+
+
+@receiver(post_save, sender=Offer, dispatch_uid='offer_image_variants')
+def offer_image_variants(sender, instance, **kwargs):
+    """ Generates the resized variants of a new or replaced offer image. """
+    schedule_variants(instance, 'image', 'image_variants')
@@ -0,0 +1,478 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from offers_app.models import Offer, OfferDetail
+from users_auth_app.models import UserProfileModel
+from utils.authentication import token_cache
+from utils.instrumentation import QueryBudgetExceeded, registry
+from utils.media import media_urlpatterns
+
+# MediaServingTests mount the media route themselves; the project only
+# adds it with DEBUG on or a BACKEND that offloads the transfer.
+urlpatterns = media_urlpatterns(enabled=True)
+PLAIN_STORAGES = settings.STORAGES
+HASHED_STORAGES = {**PLAIN_STORAGES,
+                   'default': {'BACKEND': 'utils.media.HashedFileSystemStorage'}}
+
+
+class OfferFixtureMixin:
+    """ Authenticated business user with helpers to create offers. """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='business', password='secret123')
+        UserProfileModel.objects.create(
+            user=self.user, user_type='business', email='b@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def create_offers(self, count):
+        for index in range(count):
+            offer = Offer.objects.create(
+                user=self.user, title=f'Offer {index}', description='Text')
+            for offer_type, price in (('basic', 50), ('standard', 100), ('premium', 200)):
+                OfferDetail.objects.create(
+                    offer=offer, offer_type=offer_type, price=price,
+                    delivery_time_in_days=5)
+
+
+class OfferQueryCountTests(OfferFixtureMixin, APITestCase):
+    """
+    Ensures the offer list and retrieve endpoints run a fixed number of 
+    queries regardless of how many offers are on the page.
+    """
+
+    def count_queries(self, url):
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_offers(1)
+        single = self.count_queries('/api/offers/')
+        self.create_offers(5)
+        many = self.count_queries('/api/offers/')
+        self.assertEqual(single, many)
+
+    def test_retrieve_query_count_is_constant(self):
+        self.create_offers(1)
+        offer = Offer.objects.first()
+        baseline = self.count_queries(f'/api/offers/{offer.pk}/')
+        OfferDetail.objects.create(
+            offer=offer, offer_type='basic', price=10, delivery_time_in_days=1)
+        self.assertEqual(
+            baseline, self.count_queries(f'/api/offers/{offer.pk}/'))
+
+
+class OfferBulkWriteTests(APITestCase):
+    """
+    Ensures offer creation, detail updates and the batch import run a 
+    constant number of statements and keep the min values consistent.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business')
+        UserProfileModel.objects.create(
+            user=self.user, user_type='business', email='b@example.com')
+        self.client.force_authenticate(self.user)
+
+    def offer_data(self, index=0):
+        return {
+            'title': f'Offer {index}',
+            'description': 'Text',
+            'details': [
+                {'title': offer_type, 'revisions': 1, 'delivery_time_in_days': days,
+                 'price': price, 'features': ['A'], 'offer_type': offer_type}
+                for offer_type, price, days in (
+                    ('basic', 100, 7), ('standard', 200, 5), ('premium', 300, 3))
+            ],
+        }
+
+    def test_create_stores_min_values(self):
+        response = self.client.post(
+            '/api/offers/', self.offer_data(), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['details']), 3)
+        offer = Offer.objects.get(pk=response.data['id'])
+        self.assertEqual(offer.min_price, 100)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+    def test_update_details_refreshes_min_values(self):
+        offer_id = self.client.post(
+            '/api/offers/', self.offer_data(), format='json').data['id']
+        response = self.client.patch(f'/api/offers/{offer_id}/', {
+            'details': [{'offer_type': 'basic', 'price': 500,
+                         'delivery_time_in_days': 1}]
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        offer = Offer.objects.get(pk=offer_id)
+        self.assertEqual(offer.min_price, 200)
+        self.assertEqual(offer.min_delivery_time, 1)
+
+    def test_update_details_rejects_unknown_keys(self):
+        offer_id = self.client.post(
+            '/api/offers/', self.offer_data(), format='json').data['id']
+        for key in ('id', 'foo'):
+            response = self.client.patch(f'/api/offers/{offer_id}/', {
+                'details': [{'offer_type': 'basic', 'price': 500, key: 1}]
+            }, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(key, response.data)
+        self.assertEqual(Offer.objects.get(pk=offer_id).min_price, 100)
+
+    def test_partial_update_serializes_saved_offer_once(self):
+        offer_id = self.client.post(
+            '/api/offers/', self.offer_data(), format='json').data['id']
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(f'/api/offers/{offer_id}/', {
+                'title': 'Renamed',
+                'details': [{'offer_type': 'basic', 'price': 500}]
+            }, format='json')
+        self.assertEqual(response.data['title'], 'Renamed')
+        prices = {detail['offer_type']: detail['price']
+                  for detail in response.data['details']}
+        self.assertEqual(prices['basic'], 500)
+        offer_selects = [query for query in context.captured_queries
+                         if query['sql'].startswith('SELECT') and
+                         'FROM "offers_app_offer"' in query['sql']]
+        self.assertEqual(len(offer_selects), 1)
+
+    def count_batch_queries(self, size):
+        data = [self.offer_data(index) for index in range(size)]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                '/api/offers/batch/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), size)
+        return len(context.captured_queries)
+
+    def test_batch_import_uses_constant_statements(self):
+        self.assertEqual(self.count_batch_queries(2),
+                         self.count_batch_queries(6))
+        self.assertEqual(Offer.objects.count(), 8)
+        self.assertEqual(Offer.objects.filter(min_price=100).count(), 8)
+        self.assertEqual(
+            len(self.client.get('/api/offers/', {'search': 'offer'}).data['results']), 6)
+
+
+class OfferMinValuesTests(APITestCase):
+    """
+    Ensures the denormalized min_price and min_delivery_time columns 
+    follow changes to the offer details.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='business', password='secret123')
+        self.client.force_authenticate(self.user)
+        self.offer = Offer.objects.create(
+            user=self.user, title='Offer', description='Text')
+        self.basic = OfferDetail.objects.create(
+            offer=self.offer, offer_type='basic', price=50,
+            delivery_time_in_days=7)
+        OfferDetail.objects.create(
+            offer=self.offer, offer_type='premium', price=150,
+            delivery_time_in_days=3)
+
+    def test_min_values_follow_detail_changes(self):
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+        response = self.client.patch(
+            f'/api/offerdetails/{self.basic.pk}/',
+            {'price': 200, 'delivery_time_in_days': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 150)
+        self.assertEqual(self.offer.min_delivery_time, 1)
+
+        self.basic.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_backfill_command(self):
+        Offer.objects.update(min_price=None, min_delivery_time=None)
+        call_command('backfill_offer_min_values', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+
+
+class OfferKeysetPaginationTests(APITestCase):
+    """
+    Walks the offer list with keyset pagination and checks every offer 
+    is returned exactly once in order, including ties on min_price.
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(username='business')
+        for index in range(8):
+            offer = Offer.objects.create(
+                user=user, title=f'Offer {index}', description='Text')
+            OfferDetail.objects.create(
+                offer=offer, offer_type='basic', price=10 * (index % 3),
+                delivery_time_in_days=1)
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [offer['id'] for offer in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_walks_all_pages_by_min_price(self):
+        ids = self.collect('/api/offers/?pagination=cursor&ordering=min_price&page_size=3')
+        expected = list(Offer.objects.order_by(
+            'min_price', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get('/api/offers/?pagination=cursor&page_size=3')
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(previous.data['results'], first.data['results'])
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        first = self.client.get('/api/offers/?pagination=cursor&page_size=3')
+        cursor = first.data['next'].split('cursor=')[1].split('&')[0]
+        response = self.client.get(
+            f'/api/offers/?pagination=cursor&ordering=min_price&cursor={cursor}')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['detail'], 'Invalid cursor')
+
+    def test_page_number_pagination_stays_default(self):
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.data['count'], 8)
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Ensures ?search= is answered from the full-text index, which follows 
+    offer writes and deletes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business')
+        self.logo = Offer.objects.create(
+            user=self.user, title='Logo Design', description='Vector logo')
+        Offer.objects.create(
+            user=self.user, title='Website', description='Landing page with logo')
+        Offer.objects.create(
+            user=self.user, title='Translation', description='German to English')
+
+    def search(self, term):
+        response = self.client.get('/api/offers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [offer['id'] for offer in response.data['results']]
+
+    def test_ranked_prefix_search(self):
+        ids = self.search('log')
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[0], self.logo.pk)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.logo.title = 'Illustration'
+        self.logo.description = 'Drawings'
+        self.logo.save()
+        self.assertEqual(len(self.search('logo')), 1)
+        self.assertEqual(self.search('illustration'), [self.logo.pk])
+
+        self.logo.delete()
+        self.assertEqual(self.search('illustration'), [])
+
+
+class AsyncOfferViewTests(OfferFixtureMixin, APITestCase):
+    """
+    The async list and retrieve variants return the same data as the 
+    synchronous OfferViewSet.
+    """
+
+    def test_list_and_retrieve_match_sync_views(self):
+        self.create_offers(8)
+        for sync_url, async_url in (
+            ('/api/offers/?page=2&ordering=min_price', '/api/async/offers/?page=2&ordering=min_price'),
+            (f'/api/offers/{Offer.objects.first().pk}/', f'/api/async/offers/{Offer.objects.first().pk}/'),
+        ):
+            sync_data = self.client.get(sync_url).json()
+            async_data = self.client.get(async_url).json()
+            for link in ('next', 'previous'):
+                if sync_data.get(link):
+                    sync_data[link] = sync_data[link].replace('/api/', '/api/async/')
+            self.assertEqual(sync_data, async_data)
+
+    def test_retrieve_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get('/api/async/offers/1/')
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(
+    MIDDLEWARE=['utils.instrumentation.QueryInstrumentationMiddleware'] +
+    settings.MIDDLEWARE,
+    QUERY_BUDGET_STRICT=True,
+)
+class QueryInstrumentationTests(APITestCase):
+    """
+    Checks the instrumentation middleware reports Server-Timing values and 
+    fails the request when a view exceeds its declared query budget.
+    """
+
+    def setUp(self):
+        registry.reset()
+
+    def test_server_timing_header_and_metrics(self):
+        response = self.client.get('/api/offers/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertEqual(registry.snapshot()['offer-list']['requests'], 1)
+
+    def test_query_budget_exceeded_raises(self):
+        with override_settings(QUERY_BUDGETS={'offer-list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/offers/')
+
+    def test_serializer_time_without_patching_drf(self):
+        user = User.objects.create_user(username='business', password='secret123')
+        offer = Offer.objects.create(user=user, title='Offer', description='Text')
+        self.client.force_authenticate(user)
+        self.client.get(f'/api/offers/{offer.pk}/')
+
+        self.assertGreater(registry._endpoints['offer-detail']['serializer_ms'], 0)
+        data = serializers.BaseSerializer.__dict__['data']
+        self.assertEqual(data.fget.__module__, 'rest_framework.serializers')
+
+
+class OfferImageVariantTests(OfferFixtureMixin, APITestCase):
+    """
+    Ensures uploaded offer images get resized variants without metadata 
+    and the API returns their URLs.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        variants = {**settings.IMAGE_VARIANTS, 'ASYNC': False}
+        overrides = override_settings(
+            MEDIA_ROOT=self.media_root, IMAGE_VARIANTS=variants)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def upload(self, name='photo.jpg', size=(2000, 1500)):
+        image = Image.new('RGB', size, (200, 80, 40))
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        output = BytesIO()
+        image.save(output, 'JPEG', exif=exif)
+        return SimpleUploadedFile(name, output.getvalue(), 'image/jpeg')
+
+    def test_variants_are_resized_and_stripped(self):
+        offer = Offer.objects.create(
+            user=self.user, title='Offer', description='Text', image=self.upload())
+        response = self.client.get(f'/api/offers/{offer.pk}/')
+
+        variants = response.data['image_variants']
+        self.assertEqual(set(variants), {'thumb', 'card', 'large'})
+        self.assertTrue(variants['card']['webp'].startswith('/media/offer_pics/variants/'))
+
+        for name in (offer.image_variants['card']['webp'],
+                     offer.image_variants['card']['jpeg']):
+            with offer.image.storage.open(name) as file:
+                variant = Image.open(file)
+                self.assertLessEqual(variant.width, 480)
+                self.assertLessEqual(variant.height, 360)
+                self.assertEqual(len(variant.getexif()), 0)
+
+    def test_replaced_image_regenerates_variants(self):
+        offer = Offer.objects.create(
+            user=self.user, title='Offer', description='Text', image=self.upload())
+        old_name = offer.image_variants['thumb']['webp']
+        offer.image = self.upload('other.jpg')
+        offer.save()
+
+        self.assertEqual(offer.image_variants['source'], offer.image.name)
+        self.assertFalse(offer.image.storage.exists(old_name))
+
+        offer.image = None
+        offer.save()
+        self.assertEqual(offer.image_variants, {})
+        self.assertIsNone(
+            self.client.get(f'/api/offers/{offer.pk}/').data['image_variants'])
+
+
+class MediaServingTests(OfferFixtureMixin, APITestCase):
+    """
+    Ensures uploads get content-hashed names and are served with 
+    validators, immutable caching and byte ranges.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        overrides = override_settings(
+            MEDIA_ROOT=media_root, STORAGES=HASHED_STORAGES, ROOT_URLCONF=__name__,
+            IMAGE_VARIANTS={**settings.IMAGE_VARIANTS, 'SIZES': {}})
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.content = bytes(range(256)) * 4
+        offer = Offer.objects.create(
+            user=self.user, title='Offer', description='Text',
+            image=SimpleUploadedFile('photo.jpg', self.content))
+        self.url = offer.image.url
+
+    def test_hashed_upload_is_immutable_and_revalidates(self):
+        self.assertRegex(self.url, r'^/media/offer_pics/photo\.[0-9a-f]{12}\.jpg$')
+        response = self.client.get(self.url)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertIn('immutable', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_hashed_names_and_media_route_are_opt_in(self):
+        with override_settings(STORAGES=PLAIN_STORAGES):
+            offer = Offer.objects.create(
+                user=self.user, title='Plain', description='Text',
+                image=SimpleUploadedFile('plain.jpg', self.content))
+        self.assertEqual(offer.image.name, 'offer_pics/plain.jpg')
+
+        self.assertEqual(media_urlpatterns(), [])
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-sendfile'}):
+            self.assertEqual(len(media_urlpatterns()), 1)
+        with override_settings(ROOT_URLCONF='coderr_freelancer.urls'):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-4:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_accel_redirect_and_traversal(self):
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-accel-redirect'}):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected-media/' + self.url[len('/media/'):])
+        self.assertEqual(response.content, b'')
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
@@ -1,4 +1,12 @@
 from django.contrib import admin
-from .models import Order
+from .models import Order, BusinessOrderStats
 
-admin.site.register(Order)
\ No newline at end of file
+admin.site.register(Order)
+
+
+@admin.register(BusinessOrderStats)
+class BusinessOrderStatsAdmin(admin.ModelAdmin):
+    list_display = ('business_user', 'in_progress_count',
+                    'completed_count', 'cancelled_count', 'updated_at')
+    readonly_fields = ('in_progress_count', 'completed_count',
+                       'cancelled_count', 'updated_at')
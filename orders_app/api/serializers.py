@@ -1,10 +1,14 @@
 from rest_framework import serializers
+from utils.fast_serializers import ValuesSerializer, to_datetime, to_number
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.shortcuts import get_object_or_404
 from offers_app.models import OfferDetail
+from .. import sharding
 from ..models import Order
+from utils.instrumentation import TimedSerializerMixin
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Order model, exposing all fields including 
     customer, business, offer details, pricing, and delivery information.
@@ -44,6 +48,25 @@ class OrderSerializer(serializers.ModelSerializer):
         return price_value
 
 
+class OrderValuesSerializer(ValuesSerializer):
+    """ Fast list counterpart of OrderSerializer. """
+
+    fields = {
+        'id': 'id',
+        'customer_user': 'customer_user_id',
+        'business_user': 'business_user_id',
+        'title': 'title',
+        'revisions': 'revisions',
+        'delivery_time_in_days': 'delivery_time_in_days',
+        'price': ('price', to_number),
+        'features': 'features',
+        'offer_type': 'offer_type',
+        'status': 'status',
+        'created_at': ('created_at', to_datetime),
+        'updated_at': ('updated_at', to_datetime),
+    }
+
+
 class CreateOrderSerializer(serializers.Serializer):
     """
     Serializer for creating a new Order instance from an existing 
@@ -55,16 +78,20 @@ class CreateOrderSerializer(serializers.Serializer):
     offer_detail_id = serializers.IntegerField()
 
     def create(self, validated_data):
+        """
+        Loads the offer detail with its offer, business user and profile 
+        in one query, snapshots it into the order and checks the user 
+        types (Order.clean) on the already loaded profiles. The order, on 
+        its business user's shard if orders are sharded, and the counter 
+        update are written together (see orders_app.sharding.atomic).
+        """
         offer_detail = get_object_or_404(
-            OfferDetail, id=validated_data['offer_detail_id'])
-        offer = offer_detail.offer
+            OfferDetail.objects.select_related('offer__user__profile'),
+            id=validated_data['offer_detail_id'])
 
-        customer_user = self.context['request'].user
-        business_user = offer.user
-
-        order = Order.objects.create(
-            customer_user=customer_user,
-            business_user=business_user,
+        order = Order(
+            customer_user=self.context['request'].user,
+            business_user=offer_detail.offer.user,
             offer_detail=offer_detail,
             title=offer_detail.title,
             revisions=offer_detail.revisions,
@@ -74,6 +101,15 @@ class CreateOrderSerializer(serializers.Serializer):
             offer_type=offer_detail.offer_type,
             status='in_progress'
         )
+        try:
+            order.clean()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+        if sharding.is_enabled():
+            order.pk = sharding.next_order_id()
+        with sharding.atomic(sharding.shard_for(order.business_user_id)):
+            order.save(force_insert=True)
         return order
 
     def to_representation(self, instance):
@@ -81,10 +117,17 @@ class CreateOrderSerializer(serializers.Serializer):
         return OrderSerializer(instance).data
 
 
-class UpdateOrderStatusSerializer(serializers.ModelSerializer):
+class UpdateOrderStatusSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer to update only the status field of an Order instance.
+    The Order signal handlers move the order between the counters.
     """
     class Meta:
         model = Order
         fields = ['status']
+
+    def update(self, instance, validated_data):
+        with sharding.atomic(instance._state.db):
+            instance.status = validated_data.get('status', instance.status)
+            instance.save(update_fields=['status', 'updated_at'])
+        return instance
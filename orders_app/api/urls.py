@@ -2,7 +2,9 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (OrderViewSet,
                     OrderCountView,
-                    CompletedOrderCountView)
+                    CompletedOrderCountView,
+                    AsyncOrderCountView,
+                    AsyncCompletedOrderCountView)
 
 
 router = DefaultRouter()
@@ -14,4 +16,8 @@ urlpatterns = [
          OrderCountView.as_view(), name='order-count'),
     path('completed-order-count/<int:business_user_id>/',
          CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('async/order-count/<int:business_user_id>/',
+         AsyncOrderCountView.as_view(), name='async-order-count'),
+    path('async/completed-order-count/<int:business_user_id>/',
+         AsyncCompletedOrderCountView.as_view(), name='async-completed-order-count'),
 ]
@@ -5,17 +5,27 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from django.contrib.auth.models import User
-from orders_app.models import Order
+from orders_app import sharding
+from orders_app.models import Order, BusinessOrderStats
 from orders_app.api.serializers import (
-    OrderSerializer, CreateOrderSerializer, UpdateOrderStatusSerializer
+    OrderSerializer, CreateOrderSerializer, UpdateOrderStatusSerializer,
+    OrderValuesSerializer
 )
 from rest_framework.permissions import IsAuthenticated
 from utils.permissions import IsCustomerOrAdmin, IsAdminOnly
 from rest_framework.exceptions import PermissionDenied, NotAuthenticated
 from utils.permissions import IsBusinessOwnerOrAdmin, IsBusinessOrAdmin
+from utils.pagination import OptionalKeysetPagination, wants_keyset
+from utils.async_views import AsyncAPIView
+from utils.streaming import StreamingListMixin, get_stream_mode
+from utils.fast_serializers import ValuesListMixin
+from utils.mixins import ResponseSerializerMixin
+from utils.authentication import get_principal
+from rest_framework.exceptions import NotFound
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(StreamingListMixin, ValuesListMixin, ResponseSerializerMixin,
+                   viewsets.ModelViewSet):
     """
     ViewSet for managing Order instances.
     Allows customers to create orders and both customers and business 
@@ -25,6 +35,9 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     queryset = Order.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
+    values_serializer_class = OrderValuesSerializer
+    response_serializer_classes = {'partial_update': OrderSerializer}
     filter_backends = [DjangoFilterBackend,
                        filters.SearchFilter, filters.OrderingFilter]
 
@@ -42,6 +55,67 @@ class OrderViewSet(viewsets.ModelViewSet):
             Q(customer_user=user) | Q(business_user=user)
         )
 
+    def list(self, request, *args, **kwargs):
+        """
+        With sharded orders, the filtered queryset runs on every shard and 
+        the results are merged in the requested ordering (by id if none), 
+        for plain, streamed and keyset-paginated lists alike.
+        """
+        if not sharding.is_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        querysets = [queryset.using(alias) for alias in sharding.order_databases()]
+        if wants_keyset(request):
+            page = self.paginator.paginate_querysets(querysets, request, self)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        representations = self.iter_sharded_representations(querysets)
+        mode = get_stream_mode(request)
+        if mode is None:
+            return Response(self.paginator.limit_unpaginated(representations))
+        return self.streaming_response(representations, mode)
+
+    def iter_sharded_representations(self, querysets):
+        columns = sharding.ordering_columns(querysets[0])
+        querysets = [sharding.order_by_columns(queryset, columns) for queryset in querysets]
+        directions = [descending for _, descending in columns]
+        attnames = [attname for attname, _ in columns]
+
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            extra = [attname for attname in attnames if attname not in values_serializer.columns]
+            all_columns = values_serializer.columns + extra
+            positions = [all_columns.index(attname) for attname in attnames]
+            rows = [values_serializer.rows(queryset, self.stream_chunk_size, extra)
+                    for queryset in querysets]
+            for row in sharding.merge(
+                    rows, lambda row: [row[index] for index in positions], directions):
+                yield values_serializer.to_representation(row)
+            return
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        instances = [queryset.iterator(chunk_size=self.stream_chunk_size)
+                     for queryset in querysets]
+        for instance in sharding.merge(
+                instances, lambda instance: [getattr(instance, attname) for attname in attnames],
+                directions):
+            yield serializer_class(instance, context=context).data
+
+    def get_object(self):
+        """ Looks the order up on every shard when orders are sharded. """
+        if not sharding.is_enabled():
+            return super().get_object()
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = sharding.get_from_shards(
+            self.filter_queryset(self.get_queryset()),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, instance)
+        return instance
+
     def get_permissions(self):
         if self.action in ['create']:
             return [IsCustomerOrAdmin()]
@@ -65,12 +139,15 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """ Ensure only customers can create orders and assign the customer user """
-        user_profile = getattr(self.request.user, 'profile', None)
-        if not user_profile or user_profile.user_type != 'customer':
+        if get_principal(self.request).user_type != 'customer':
             raise PermissionDenied("Only customers can create orders.")
 
         serializer.save()
 
+    def perform_destroy(self, instance):
+        with sharding.atomic(instance._state.db):
+            instance.delete()
+
     def partial_update(self, request, *args, **kwargs):
         if 'status' not in request.data:
             return Response(
@@ -78,11 +155,20 @@ class OrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        super().partial_update(request, *args, **kwargs)
-        instance = self.get_object()
-        serializer = OrderSerializer(
-            instance, context=self.get_serializer_context())
-        return Response(serializer.data)
+        return super().partial_update(request, *args, **kwargs)
+
+
+def get_business_order_stats(business_user_id):
+    """
+    Returns the materialized order counters of a business user. Users 
+    without any orders yet get empty counters; unknown users raise 404.
+    """
+    stats = BusinessOrderStats.objects.filter(
+        business_user_id=business_user_id).first()
+    if stats is None:
+        get_object_or_404(User, id=business_user_id)
+        stats = BusinessOrderStats(business_user_id=business_user_id)
+    return stats
 
 
 class OrderCountView(APIView):
@@ -94,9 +180,8 @@ class OrderCountView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(User, id=business_user_id)
-        order_count = Order.objects.filter(
-            business_user=business_user, status='in_progress').count()
+        order_count = get_business_order_stats(
+            business_user_id).in_progress_count
         return Response({"order_count": order_count}, status=status.HTTP_200_OK)
 
 
@@ -109,7 +194,39 @@ class CompletedOrderCountView(APIView):
     permission_classes = [IsBusinessOrAdmin]
 
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(User, id=business_user_id)
-        completed_order_count = Order.objects.filter(
-            business_user=business_user, status='completed').count()
+        completed_order_count = get_business_order_stats(
+            business_user_id).completed_count
         return Response({"completed_order_count": completed_order_count}, status=status.HTTP_200_OK)
+
+
+async def aget_business_order_stats(business_user_id):
+    """ Async variant of get_business_order_stats. """
+    stats = await BusinessOrderStats.objects.filter(
+        business_user_id=business_user_id).afirst()
+    if stats is None:
+        if not await User.objects.filter(id=business_user_id).aexists():
+            raise NotFound('No User matches the given query.')
+        stats = BusinessOrderStats(business_user_id=business_user_id)
+    return stats
+
+
+class AsyncOrderCountView(AsyncAPIView):
+    """
+    Async variant of OrderCountView for ASGI deployments.
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, business_user_id):
+        stats = await aget_business_order_stats(business_user_id)
+        return Response({"order_count": stats.in_progress_count}, status=status.HTTP_200_OK)
+
+
+class AsyncCompletedOrderCountView(AsyncAPIView):
+    """
+    Async variant of CompletedOrderCountView for ASGI deployments.
+    """
+    permission_classes = [IsBusinessOrAdmin]
+
+    async def get(self, request, business_user_id):
+        stats = await aget_business_order_stats(business_user_id)
+        return Response({"completed_order_count": stats.completed_count}, status=status.HTTP_200_OK)
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from orders_app import sharding
+from orders_app.models import Order, BusinessOrderStats
+
+COUNTER_FIELDS = {
+    'in_progress': 'in_progress_count',
+    'completed': 'completed_count',
+    'cancelled': 'cancelled_count',
+}
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-business-user order counters from the orders 
+    table (on every shard if orders are sharded), reports every counter 
+    that drifted and writes the corrected values (unless --dry-run is 
+    given). A repair tool for drift left by bulk writes or raw SQL; the 
+    Order signal handlers keep the counters current otherwise.
+    """
+    help = 'Recomputes BusinessOrderStats from Order and reports any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report drift, do not fix it.')
+
+    def handle(self, *args, **options):
+        expected = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS.values(), 0))
+        for alias in sharding.order_databases():
+            rows = Order.objects.using(alias).order_by().values(
+                'business_user_id', 'status').annotate(total=Count('id'))
+            for row in rows:
+                field = COUNTER_FIELDS.get(row['status'])
+                if field:
+                    expected[row['business_user_id']][field] += row['total']
+
+        with transaction.atomic():
+            existing = {
+                stats.business_user_id: stats
+                for stats in BusinessOrderStats.objects.select_for_update()
+            }
+            drifted = {}
+            for business_user_id in expected.keys() | existing.keys():
+                counts = expected.get(
+                    business_user_id, dict.fromkeys(COUNTER_FIELDS.values(), 0))
+                stats = existing.get(business_user_id)
+                if stats is None:
+                    stats = BusinessOrderStats(business_user_id=business_user_id)
+                for field, value in counts.items():
+                    current = getattr(stats, field)
+                    if current != value:
+                        self.stdout.write(
+                            f'User #{business_user_id} {field}: {current} -> {value}')
+                        setattr(stats, field, value)
+                        drifted[business_user_id] = stats
+
+            if not options['dry_run']:
+                for stats in drifted.values():
+                    stats.save()
+
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} drift for {len(drifted)} business user(s).'))
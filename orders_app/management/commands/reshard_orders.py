@@ -0,0 +1,88 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from orders_app import sharding
+from orders_app.models import Order
+
+
+@contextmanager
+def keep_timestamps():
+    """ Lets bulk_create keep created_at and updated_at of copied orders. """
+    fields = [Order._meta.get_field('created_at'), Order._meta.get_field('updated_at')]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    """
+    Moves every order to the shard its business user maps to under the
+    current settings.ORDER_SHARDING['SHARDS']. Scans the configured
+    shards plus the databases given with --from (the primary when orders
+    become sharded, or a shard that is being retired) in batches, copies
+    misplaced orders with their ids and timestamps and deletes them from
+    their old database. An interrupted run can simply be repeated.
+    """
+    help = 'Moves orders to the shard of their business user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='sources', action='append', default=[],
+                            metavar='ALIAS',
+                            help='Additional database to move orders away from.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report which orders would move.')
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError("settings.ORDER_SHARDING['SHARDS'] is empty.")
+        sources = list(dict.fromkeys(options['sources'] + sharding.order_databases()))
+        for alias in sources:
+            if alias not in connections:
+                raise CommandError(f"Unknown database '{alias}'.")
+
+        moved = Counter()
+        for source in sources:
+            last_pk = 0
+            while True:
+                batch = list(Order.objects.using(source).filter(
+                    pk__gt=last_pk).order_by('pk')[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+
+                misplaced = defaultdict(list)
+                for order in batch:
+                    target = sharding.shard_for(order.business_user_id)
+                    if target != source:
+                        misplaced[target].append(order)
+                for target, orders in misplaced.items():
+                    if not options['dry_run']:
+                        self.move(orders, source, target)
+                    moved[source, target] += len(orders)
+
+        for (source, target), count in sorted(moved.items()):
+            self.stdout.write(f'{source} -> {target}: {count} order(s)')
+        action = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {sum(moved.values())} order(s).'))
+
+    def move(self, orders, source, target):
+        """
+        Inserts the orders on the target before deleting them from the
+        source. The target commits first, so a crash in between leaves
+        copies that the next run skips (ignore_conflicts) and deletes.
+        """
+        with transaction.atomic(using=source), transaction.atomic(using=target):
+            with keep_timestamps():
+                Order.objects.using(target).bulk_create(orders, ignore_conflicts=True)
+            # _raw_delete skips the post_delete signal: the orders still
+            # exist on the target, so their counters must not change.
+            Order.objects.using(source).filter(
+                pk__in=[order.pk for order in orders])._raw_delete(source)
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
@@ -43,11 +45,86 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'],
+                         name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'status'],
+                         name='order_customer_status_idx'),
+        ]
+
     def clean(self):
-        if self.customer_user.profile.user_type != 'customer':
+        """
+        Checks the user types. Load the users with their profiles (e.g. 
+        select_related('business_user__profile')) to avoid extra queries.
+        """
+        customer_profile = getattr(self.customer_user, 'profile', None)
+        if customer_profile is None or customer_profile.user_type != 'customer':
             raise ValidationError("Nur Kunden können Bestellungen aufgeben.")
-        if self.business_user.profile.user_type != 'business':
+        business_profile = getattr(self.business_user, 'profile', None)
+        if business_profile is None or business_profile.user_type != 'business':
             raise ValidationError("Nur Anbieter können Bestellungen erhalten.")
 
     def __str__(self):
         return f"Order #{self.id}: {self.title} by {self.customer_user.username} for {self.business_user.username}"
+
+
+class BusinessOrderStats(models.Model):
+    """
+    Materialized per-business-user order counters, one row per business 
+    user, kept up to date by the Order signal handlers whenever an order 
+    is created, changes its status or is deleted. Bulk writes bypass the 
+    signals; run reconcile_order_stats after them. Serves the order count 
+    endpoints with a single primary key lookup.
+    """
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name='order_stats', on_delete=models.CASCADE
+    )
+    in_progress_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def record_status_change(cls, business_user_id, old_status=None, new_status=None):
+        """
+        Moves one order from old_status to new_status in the counters of 
+        the given business user. Pass old_status=None for a new order and 
+        new_status=None for a deleted one. Called by the Order signal 
+        handlers (see orders_app.signals) inside the transaction that 
+        writes the order.
+        """
+        if old_status == new_status:
+            return
+
+        changes = {}
+        if old_status:
+            field = f'{old_status}_count'
+            changes[field] = Greatest(F(field) - 1, 0)
+        if new_status:
+            field = f'{new_status}_count'
+            changes[field] = F(field) + 1
+
+        stats = cls.objects.filter(business_user_id=business_user_id)
+        # A missing row has nothing to decrement; it may also be cascade
+        # deleted together with its business user right now.
+        if not stats.update(**changes) and new_status:
+            cls.objects.get_or_create(business_user_id=business_user_id)
+            stats.update(**changes)
+
+    def __str__(self):
+        return f"Order stats for user #{self.business_user_id}"
+
+
+class OrderIdSequence(models.Model):
+    """
+    Single-row counter on the primary database that hands out blocks of 
+    order ids when orders are sharded (orders_app.sharding), so ids stay 
+    unique across all shards.
+    """
+
+    next_id = models.BigIntegerField(default=1)
+
+    def __str__(self):
+        return f"Next order id {self.next_id}"
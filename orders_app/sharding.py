@@ -0,0 +1,202 @@
+import heapq
+import logging
+import threading
+from contextlib import contextmanager
+from functools import cmp_to_key
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max
+from django.http import Http404
+
+DEFAULTS = {
+    'SHARDS': [],
+    'ID_BLOCK_SIZE': 1000,
+}
+
+logger = logging.getLogger(__name__)
+
+_id_block = iter(())
+_id_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, 'ORDER_SHARDING', {}).get(name, DEFAULTS[name])
+
+
+def is_enabled():
+    return bool(get_setting('SHARDS'))
+
+
+def order_databases():
+    """ The databases holding orders: all shards, or just the primary. """
+    return list(get_setting('SHARDS')) or [DEFAULT_DB_ALIAS]
+
+
+def shard_for(business_user_id):
+    """ The database alias that stores the orders of a business user. """
+    shards = get_setting('SHARDS')
+    if not shards:
+        return DEFAULT_DB_ALIAS
+    return shards[business_user_id % len(shards)]
+
+
+@contextmanager
+def atomic(alias):
+    """
+    Transaction for writing orders on `alias` together with the order
+    counters on the primary. The order's database commits first; if the
+    primary then fails, reconcile_order_stats repairs the counters. The
+    primary is always locked first, so writers cannot deadlock.
+    """
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        if alias == DEFAULT_DB_ALIAS:
+            yield
+        else:
+            with transaction.atomic(using=alias):
+                yield
+
+
+def reserve_ids(size):
+    """
+    Reserves `size` order ids on the primary. Ids start above every
+    stored order, including orders created before sharding was enabled.
+    """
+    from orders_app.models import Order, OrderIdSequence
+
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        sequence, _ = OrderIdSequence.objects.using(
+            DEFAULT_DB_ALIAS).select_for_update().get_or_create(pk=1)
+        highest = max(
+            Order.objects.using(alias).aggregate(highest=Max('pk'))['highest'] or 0
+            for alias in {DEFAULT_DB_ALIAS, *order_databases()})
+        start = max(sequence.next_id, highest + 1)
+        sequence.next_id = start + size
+        sequence.save(update_fields=['next_id'])
+    return range(start, start + size)
+
+
+def next_order_id():
+    """
+    Returns an id for a new sharded order. Ids are taken from a block
+    reserved per process, so the primary is only written to once every
+    ID_BLOCK_SIZE orders.
+    """
+    global _id_block
+    with _id_lock:
+        order_id = next(_id_block, None)
+        if order_id is None:
+            _id_block = iter(reserve_ids(get_setting('ID_BLOCK_SIZE')))
+            order_id = next(_id_block)
+        return order_id
+
+
+def get_from_shards(queryset, **lookup):
+    """ Looks an order up on every order database, raising Http404. """
+    for alias in order_databases():
+        instance = queryset.using(alias).filter(**lookup).first()
+        if instance is not None:
+            return instance
+    raise Http404('No Order matches the given query.')
+
+
+def ordering_columns(queryset):
+    """
+    Returns the queryset's ordering as [(attname, descending)], ending
+    with the primary key so that the merged order is total.
+    """
+    opts = queryset.model._meta
+    columns = []
+    for term in queryset.query.order_by:
+        if not isinstance(term, str):
+            continue
+        name = term.lstrip('-')
+        try:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        columns.append((field.attname, term.startswith('-')))
+    if opts.pk.attname not in [attname for attname, _ in columns]:
+        columns.append((opts.pk.attname, False))
+    return columns
+
+
+def order_by_columns(queryset, columns):
+    return queryset.order_by(*[
+        f'-{attname}' if descending else attname for attname, descending in columns])
+
+
+def compare(left, right, directions):
+    """ SQL ordering of two key tuples; NULL is the smallest value. """
+    for a, b, descending in zip(left, right, directions):
+        if a == b:
+            continue
+        if a is None:
+            result = -1
+        elif b is None:
+            result = 1
+        else:
+            result = -1 if a < b else 1
+        return -result if descending else result
+    return 0
+
+
+def merge(iterables, key, directions):
+    """
+    Lazily merges iterables that are each sorted by `key` with the given
+    per-column directions into one sorted iterator (scatter-gather).
+    """
+    sort_key = cmp_to_key(lambda left, right: compare(key(left), key(right), directions))
+    return heapq.merge(*iterables, key=sort_key)
+
+
+class OrderShardRouter:
+    """
+    Places orders on the shards in settings.ORDER_SHARDING['SHARDS'] by
+    business_user_id; everything else stays on the primary. Queries
+    without an order instance have to pick their shard with using() (see
+    order_databases and get_from_shards); an order read without one is
+    logged and sent to the primary, never to a replica of it, so this
+    router has to come before ReplicaRouter. Existing orders are written
+    where they are stored until reshard_orders moves them.
+    """
+
+    def is_order(self, model):
+        return model._meta.label_lower == 'orders_app.order'
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if not is_enabled():
+            return None
+        if instance is None or not self.is_order(type(instance)):
+            if not self.is_order(model):
+                return None
+            logger.warning('Order read without using() goes to the primary, '
+                           'not to the shards.')
+            return DEFAULT_DB_ALIAS
+        if self.is_order(model):
+            return instance._state.db
+        # Users and offer details of a sharded order live on the primary.
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        if not is_enabled() or instance is None or not self.is_order(type(instance)):
+            return None
+        if not self.is_order(model):
+            return DEFAULT_DB_ALIAS
+        if instance._state.db and not instance._state.adding:
+            return instance._state.db
+        return shard_for(instance.business_user_id)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if is_enabled() and (self.is_order(type(obj1)) or self.is_order(type(obj2))):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db not in get_setting('SHARDS'):
+            return None
+        return app_label == 'migrations' or (
+            app_label == 'orders_app' and model_name == 'order')
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from offers_app.models import OfferDetail
+from . import sharding
+from .models import Order, BusinessOrderStats
+
+STATS_FIELDS = {'status', 'business_user', 'business_user_id'}
+
+
+@receiver(pre_save, sender=Order, dispatch_uid='order_stats_stored_status')
+def remember_stored_status(sender, instance, raw, using, update_fields=None, **kwargs):
+    """
+    Reads the business user and status an existing order has in the 
+    database (locked until the save commits inside a transaction), so 
+    the counters move away from what was stored rather than from what 
+    the instance was loaded with.
+    """
+    instance._stored_stats = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not STATS_FIELDS & set(update_fields):
+        return
+    orders = sender.objects.using(using).filter(pk=instance.pk)
+    if connections[using].in_atomic_block:
+        orders = orders.select_for_update()
+    instance._stored_stats = orders.values_list('business_user_id', 'status').first()
+
+
+@receiver(post_save, sender=Order, dispatch_uid='order_stats_save')
+def update_order_stats(sender, instance, created, raw, **kwargs):
+    """ Counts a new order and moves a changed one between the counters. """
+    if raw:
+        return
+    stored = None if created else getattr(instance, '_stored_stats', None)
+    if stored is None and not created:
+        return
+    old_business_user_id, old_status = stored or (instance.business_user_id, None)
+    if old_business_user_id != instance.business_user_id:
+        BusinessOrderStats.record_status_change(old_business_user_id, old_status=old_status)
+        old_status = None
+    BusinessOrderStats.record_status_change(
+        instance.business_user_id, old_status, instance.status)
+
+
+@receiver(post_delete, sender=Order, dispatch_uid='order_stats_delete')
+def remove_order_stats(sender, instance, **kwargs):
+    """ Uncounts a deleted order, including orders deleted by a cascade. """
+    BusinessOrderStats.record_status_change(
+        instance.business_user_id, old_status=instance.status)
+
+
+def delete_sharded_orders(orders):
+    """
+    Deletes the matching orders on every shard. The delete collector
+    only cascades on the database of the deleted object, which holds no
+    orders once they are sharded. Uses the regular delete so the stats
+    handlers above run.
+    """
+    if not sharding.is_enabled():
+        return
+    for alias in sharding.order_databases():
+        Order.objects.using(alias).filter(orders).delete()
+
+
+@receiver(pre_delete, sender=User, dispatch_uid='order_shard_cascade_user')
+def delete_orders_of_user(sender, instance, **kwargs):
+    """ Cascades a deleted user to their orders on the shards. """
+    delete_sharded_orders(Q(customer_user_id=instance.pk) | Q(business_user_id=instance.pk))
+
+
+@receiver(pre_delete, sender=OfferDetail, dispatch_uid='order_shard_cascade_offer_detail')
+def delete_orders_of_offer_detail(sender, instance, **kwargs):
+    """ Cascades a deleted offer detail (or offer) to its orders on the shards. """
+    delete_sharded_orders(Q(offer_detail_id=instance.pk))
@@ -0,0 +1,409 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+from offers_app.models import Offer, OfferDetail
+from orders_app import sharding
+from orders_app.models import BusinessOrderStats, Order
+from users_auth_app.models import UserProfileModel
+from utils.authentication import token_cache
+from utils.pagination import OptionalKeysetPagination
+
+
+class OrderTestMixin:
+    """ Creates a business user with one offer and a customer. """
+
+    def create_user(self, username, user_type):
+        user = User.objects.create_user(username=username, password='secret123')
+        UserProfileModel.objects.create(
+            user=user, user_type=user_type, email=f'{username}@example.com')
+        return user
+
+    def setUp(self):
+        self.business = self.create_user('business', 'business')
+        self.customer = self.create_user('customer', 'customer')
+        offer = Offer.objects.create(
+            user=self.business, title='Offer', description='Text')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, offer_type='basic', price=50, delivery_time_in_days=5)
+
+    def place_order(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(
+            '/api/orders/', {'offer_detail_id': self.detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+
+class BusinessOrderStatsTests(OrderTestMixin, APITestCase):
+    """
+    Ensures the materialized order counters follow order creation and 
+    status changes and serve the count endpoints.
+    """
+
+    def test_counters_follow_status_changes(self):
+        order_id = self.place_order()
+        self.place_order()
+
+        self.client.force_authenticate(self.business)
+        response = self.client.patch(
+            f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.data['order_count'], 1)
+        response = self.client.get(
+            f'/api/completed-order-count/{self.business.pk}/')
+        self.assertEqual(response.data['completed_order_count'], 1)
+
+    def test_counters_follow_saves_outside_the_api(self):
+        order = Order.objects.get(pk=self.place_order())
+        order.status = 'cancelled'
+        order.save()
+        stats = BusinessOrderStats.objects.get(business_user=self.business)
+        self.assertEqual((stats.in_progress_count, stats.cancelled_count), (0, 1))
+
+        other = self.create_user('other', 'business')
+        order.business_user = other
+        order.save()
+        stats.refresh_from_db()
+        self.assertEqual(stats.cancelled_count, 0)
+        self.assertEqual(BusinessOrderStats.objects.get(
+            business_user=other).cancelled_count, 1)
+
+    def test_cascade_delete_decrements_counters(self):
+        self.place_order()
+        self.place_order()
+        self.detail.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(BusinessOrderStats.objects.get(
+            business_user=self.business).in_progress_count, 0)
+
+    def test_deleting_the_business_user_drops_its_counters(self):
+        self.place_order()
+        self.business.delete()
+        self.assertFalse(BusinessOrderStats.objects.exists())
+
+    def test_unknown_user_returns_404(self):
+        self.client.force_authenticate(self.business)
+        response = self.client.get('/api/order-count/9999/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_reconcile_fixes_drift(self):
+        self.place_order()
+        BusinessOrderStats.objects.update(in_progress_count=7)
+        output = StringIO()
+        call_command('reconcile_order_stats', stdout=output)
+        self.assertIn('in_progress_count: 7 -> 1', output.getvalue())
+        self.assertEqual(
+            BusinessOrderStats.objects.get().in_progress_count, 1)
+
+
+class OrderListPaginationTests(OrderTestMixin, APITestCase):
+    """
+    The order list stays a plain list unless keyset pagination is asked for.
+    """
+
+    def test_list_is_unpaginated_by_default(self):
+        self.place_order()
+        response = self.client.get('/api/orders/')
+        self.assertEqual(len(response.data), 1)
+
+    def test_unpaginated_list_is_capped(self):
+        for _ in range(3):
+            self.place_order()
+        with mock.patch.object(OptionalKeysetPagination, 'max_unpaginated_rows', 2):
+            for fast in (True, False):
+                with override_settings(FAST_READ_SERIALIZERS=fast):
+                    response = self.client.get('/api/orders/')
+                self.assertEqual(len(response.data), 2)
+
+    def test_cursor_pagination_on_request(self):
+        for _ in range(3):
+            self.place_order()
+        response = self.client.get('/api/orders/?pagination=cursor&page_size=2')
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+
+@override_settings(FAST_READ_SERIALIZERS=True)
+class OrderListStreamingTests(OrderTestMixin, APITestCase):
+    """
+    Ensures the streamed list modes return the same orders as the regular 
+    list response.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(3):
+            self.place_order()
+        self.expected = self.client.get('/api/orders/').json()
+
+    def test_stream_json_matches_regular_list(self):
+        response = self.client.get('/api/orders/?stream=json')
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(body), self.expected)
+
+    def test_stream_ndjson_emits_one_order_per_line(self):
+        response = self.client.get(
+            '/api/orders/', HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.expected)
+
+    def test_stream_json_of_empty_list(self):
+        Order.objects.all().delete()
+        response = self.client.get('/api/orders/?stream=json')
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+
+class OrderValuesSerializerTests(OrderTestMixin, APITestCase):
+    """
+    Ensures the values()-based list output equals the OrderSerializer one.
+    """
+
+    def test_fast_list_matches_model_serializer(self):
+        self.place_order()
+        OfferDetail.objects.filter(pk=self.detail.pk).update(price='49.50')
+        self.place_order()
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast = self.client.get('/api/orders/').json()
+        regular = self.client.get('/api/orders/').json()
+        self.assertEqual(fast, regular)
+        self.assertEqual({order['price'] for order in fast}, {50, 49.5})
+
+
+class OrderPlacementQueryTests(OrderTestMixin, APITestCase):
+    """
+    Ensures placing an order loads the offer detail, business user and 
+    profiles in one query and writes order and counters atomically.
+    """
+
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        token = Token.objects.create(user=self.customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.get(f'/api/order-count/{self.business.pk}/')
+
+    def test_order_placement_query_count(self):
+        self.client.post(
+            '/api/orders/', {'offer_detail_id': self.detail.pk}, format='json')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                '/api/orders/', {'offer_detail_id': self.detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        statements = [query['sql'].split()[0] for query in context.captured_queries]
+        self.assertEqual(statements, ['SELECT', 'SAVEPOINT', 'INSERT', 'UPDATE', 'RELEASE'])
+
+    def test_business_user_cannot_order(self):
+        other = self.create_user('other', 'customer')
+        UserProfileModel.objects.filter(user=self.business).update(user_type='customer')
+        self.client.force_authenticate(other)
+        response = self.client.post(
+            '/api/orders/', {'offer_detail_id': self.detail.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, ['Nur Anbieter können Bestellungen erhalten.'])
+
+
+class OrderStatusUpdateTests(OrderTestMixin, APITestCase):
+    """
+    Ensures a status update loads the order once and answers with the 
+    full order representation.
+    """
+
+    def test_status_update_fetches_order_once(self):
+        order_id = self.place_order()
+        self.client.force_authenticate(self.business)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['price'], 50)
+        full_order_selects = [query for query in context.captured_queries
+                              if query['sql'].startswith('SELECT') and
+                              '"orders_app_order"."title"' in query['sql']]
+        self.assertEqual(len(full_order_selects), 1)
+        update = next(query['sql'] for query in context.captured_queries
+                      if query['sql'].startswith('UPDATE "orders_app_order"'))
+        self.assertNotIn('"title"', update)
+
+
+class SQLiteConcurrencyTests(OrderTestMixin, APITransactionTestCase):
+    """
+    Ensures new connections apply the WAL/busy-timeout pragmas and that 
+    write paths take the write lock when their transaction begins.
+    """
+
+    def test_connection_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connection.settings_dict,
+                                 NAME=os.path.join(directory, 'pragmas.sqlite3'))
+            file_connection = type(connections['default'])(settings_dict)
+            try:
+                with file_connection.cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout')
+                    }
+            finally:
+                file_connection.close()
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['synchronous'], 1)
+        self.assertGreaterEqual(pragmas['busy_timeout'], 5000)
+
+    def test_order_placement_begins_immediate(self):
+        with CaptureQueriesContext(connection) as context:
+            self.place_order()
+        self.assertIn('BEGIN IMMEDIATE',
+                      [query['sql'] for query in context.captured_queries])
+
+
+SHARD_ALIASES = ['orders1', 'orders2']
+
+
+@override_settings(ORDER_SHARDING={'SHARDS': SHARD_ALIASES, 'ID_BLOCK_SIZE': 10},
+                   DATABASE_ROUTERS=['orders_app.sharding.OrderShardRouter'])
+class ShardedOrderTests(OrderTestMixin, APITransactionTestCase):
+    """
+    Ensures sharded orders are stored on the shard of their business user 
+    and are listed, paginated, updated and resharded across the shards.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # The shard aliases only exist while this class runs, so they are
+        # added to `databases` here instead of being seen by the runner.
+        cls.databases = {'default', *SHARD_ALIASES}
+        cls.directory = tempfile.TemporaryDirectory()
+        default = connections.settings['default']
+        for alias in SHARD_ALIASES:
+            connections.settings[alias] = dict(
+                default, NAME=os.path.join(cls.directory.name, f'{alias}.sqlite3'),
+                OPTIONS=dict(default['OPTIONS'], init_command=(
+                    default['OPTIONS']['init_command'] + ';PRAGMA foreign_keys=OFF')))
+        super().setUpClass()
+        for alias in SHARD_ALIASES:
+            call_command('migrate', database=alias, verbosity=0)
+            # The schema editor turns foreign key checks back on.
+            connections[alias].close()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in SHARD_ALIASES:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.other_business = self.create_user('other', 'business')
+        super().setUp()
+        offer = Offer.objects.create(
+            user=self.other_business, title='Other offer', description='Text')
+        self.other_detail = OfferDetail.objects.create(
+            offer=offer, offer_type='basic', price=80, delivery_time_in_days=3)
+        self.assertNotEqual(sharding.shard_for(self.business.pk),
+                            sharding.shard_for(self.other_business.pk))
+
+    def place_other_order(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(
+            '/api/orders/', {'offer_detail_id': self.other_detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_orders_are_placed_on_the_shard_of_their_business_user(self):
+        order_id = self.place_order()
+        other_id = self.place_other_order()
+        shard = sharding.shard_for(self.business.pk)
+        other_shard = sharding.shard_for(self.other_business.pk)
+        self.assertTrue(Order.objects.using(shard).filter(pk=order_id).exists())
+        self.assertTrue(Order.objects.using(other_shard).filter(pk=other_id).exists())
+        self.assertFalse(Order.objects.using('default').exists())
+
+        response = self.client.get(f'/api/order-count/{self.other_business.pk}/')
+        self.assertEqual(response.data['order_count'], 1)
+
+    def test_deleting_users_and_offers_cascades_to_the_shards(self):
+        self.place_order()
+        self.place_other_order()
+        self.detail.offer.delete()
+        self.assertEqual(
+            sum(Order.objects.using(alias).count() for alias in SHARD_ALIASES), 1)
+        self.assertEqual(BusinessOrderStats.objects.get(
+            business_user=self.business).in_progress_count, 0)
+
+        other_business_id = self.other_business.pk
+        self.other_business.delete()
+        for alias in SHARD_ALIASES:
+            self.assertFalse(Order.objects.using(alias).exists())
+        self.assertFalse(BusinessOrderStats.objects.filter(
+            business_user_id=other_business_id).exists())
+
+    def test_order_read_without_shard_stays_off_the_replicas(self):
+        router = sharding.OrderShardRouter()
+        with self.assertLogs('orders_app.sharding', 'WARNING'):
+            self.assertEqual(router.db_for_read(Order), 'default')
+        self.assertIsNone(router.db_for_read(OfferDetail))
+
+    def test_list_merges_all_shards(self):
+        order_ids = [self.place_order(), self.place_other_order(), self.place_order()]
+        response = self.client.get('/api/orders/')
+        self.assertEqual([order['id'] for order in response.data], order_ids)
+
+        response = self.client.get('/api/orders/?ordering=delivery_time_in_days')
+        self.assertEqual([order['id'] for order in response.data],
+                         [order_ids[1], order_ids[0], order_ids[2]])
+
+        response = self.client.get('/api/orders/?stream=json')
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([order['id'] for order in body], order_ids)
+
+        response = self.client.get('/api/orders/?pagination=cursor&page_size=2')
+        pages = [order['id'] for order in response.data['results']]
+        response = self.client.get(response.data['next'])
+        pages += [order['id'] for order in response.data['results']]
+        self.assertEqual(sorted(pages), order_ids)
+        self.assertIsNone(response.data['next'])
+
+    def test_status_update_on_shard(self):
+        order_id = self.place_other_order()
+        self.client.force_authenticate(self.other_business)
+        response = self.client.patch(
+            f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.data['status'], 'completed')
+        shard = sharding.shard_for(self.other_business.pk)
+        self.assertEqual(Order.objects.using(shard).get(pk=order_id).status, 'completed')
+        self.assertEqual(BusinessOrderStats.objects.get(
+            business_user=self.other_business).completed_count, 1)
+
+        response = self.client.get(f'/api/orders/{order_id}/')
+        self.assertEqual(response.data['status'], 'completed')
+
+    def test_reshard_moves_orders_from_primary(self):
+        with override_settings(ORDER_SHARDING={'SHARDS': []}):
+            order_id = self.place_order()
+        legacy = Order.objects.using('default').get(pk=order_id)
+
+        output = StringIO()
+        call_command('reshard_orders', '--from', 'default', stdout=output)
+        self.assertIn('Moved 1 order(s).', output.getvalue())
+        self.assertFalse(Order.objects.using('default').exists())
+        moved = Order.objects.using(sharding.shard_for(self.business.pk)).get(pk=order_id)
+        self.assertEqual(moved.created_at, legacy.created_at)
+
+        self.assertGreater(self.place_order(), order_id)
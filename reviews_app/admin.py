@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import Review
+from .models import Review, BusinessRatingStats
 
 
-admin.site.register(Review)
\ No newline at end of file
+admin.site.register(Review)
+
+
+@admin.register(BusinessRatingStats)
+class BusinessRatingStatsAdmin(admin.ModelAdmin):
+    list_display = ('business_user', 'review_count', 'average_rating', 'updated_at')
+    readonly_fields = ('review_count', 'rating_sum', 'average_rating', 'updated_at')
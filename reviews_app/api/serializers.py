@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from utils.fast_serializers import ValuesSerializer, to_datetime, to_number
 from ..models import Review
+from utils.instrumentation import TimedSerializerMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model, handling all fields.
     Ensures that the reviewer field is read-only and set automatically.
@@ -31,3 +33,17 @@ class ReviewSerializer(serializers.ModelSerializer):
         else:
             data['rating'] = rating_value
         return data
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """ Fast list counterpart of ReviewSerializer. """
+
+    fields = {
+        'id': 'id',
+        'business_user': 'business_user_id',
+        'reviewer': 'reviewer_id',
+        'rating': ('rating', to_number),
+        'description': 'description',
+        'created_at': ('created_at', to_datetime),
+        'updated_at': ('updated_at', to_datetime),
+    }
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ReviewViewSet  
+from .views import ReviewViewSet, AsyncReviewListView
 
 router = DefaultRouter()
 router.register(r'reviews', ReviewViewSet, basename='reviews')  
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/reviews/', AsyncReviewListView.as_view(),
+         name='async-review-list'),
 ]
\ No newline at end of file
@@ -1,14 +1,19 @@
 from rest_framework import viewsets, filters, permissions, status
+from django.db import IntegrityError, transaction
 from ..models import Review
-from .serializers import ReviewSerializer
+from .serializers import ReviewSerializer, ReviewValuesSerializer
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from utils.permissions import IsCustomerOrAdmin, IsReviewerOrAdmin
+from utils.pagination import OptionalKeysetPagination
+from utils.async_views import AsyncAPIView
+from utils.streaming import StreamingListMixin
+from utils.fast_serializers import ValuesListMixin
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(StreamingListMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Review objects.
     Handles creation, listing, updating, and deleting of reviews 
@@ -19,6 +24,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalKeysetPagination
+    values_serializer_class = ReviewValuesSerializer
 
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['business_user', 'reviewer']
@@ -48,15 +55,27 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().partial_update(request, *args, **kwargs)
 
     def perform_create(self, serializer):
-        """Automatically assign the logged-in user as the reviewer, but ensure only one review per business user."""
-        reviewer = self.request.user
-        business_user = serializer.validated_data.get('business_user')
-
-        if Review.objects.filter(reviewer=reviewer, business_user=business_user).exists():
+        """
+        Automatically assign the logged-in user as the reviewer. The unique 
+        constraint on (reviewer, business_user) rejects a second review 
+        per business user in the insert itself, also under concurrent requests. 
+        Other integrity errors are not caused by the request and propagate.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(reviewer=self.request.user)
+        except IntegrityError:
+            if not Review.objects.filter(
+                    reviewer=self.request.user,
+                    business_user=serializer.validated_data['business_user']).exists():
+                raise
             raise ValidationError(
                 "Du hast bereits eine Bewertung für diesen Anbieter abgegeben.")
 
-        serializer.save(reviewer=reviewer)
+    def perform_update(self, serializer):
+        """ Saves the review and its rating aggregates in one transaction. """
+        with transaction.atomic():
+            serializer.save()
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -70,3 +89,18 @@ class ReviewViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(reviewer_id=reviewer_id)
 
         return queryset
+
+
+class AsyncReviewListView(AsyncAPIView):
+    """
+    Async variant of the ReviewViewSet list endpoint for ASGI deployments, 
+    with the same filters and ordering.
+    """
+    action = 'list'
+
+    async def get(self, request):
+        queryset = await self.filter_with_viewset(ReviewViewSet, self.action)
+        reviews = [review async for review in queryset]
+        serializer = ReviewSerializer(
+            reviews, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from reviews_app.models import Review, BusinessRatingStats
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-business-user rating aggregates from the reviews 
+    table, reports every aggregate that drifted and writes the corrected 
+    values (unless --dry-run is given). A repair tool for drift left by 
+    bulk writes or raw SQL; the Review signal handlers keep the 
+    aggregates current otherwise.
+    """
+    help = 'Recomputes BusinessRatingStats from Review and reports any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report drift, do not fix it.')
+
+    def handle(self, *args, **options):
+        expected = {
+            row['business_user_id']: (row['review_count'], row['rating_sum'])
+            for row in Review.objects.order_by().values('business_user_id').annotate(
+                review_count=Count('id'), rating_sum=Sum('rating'))
+        }
+
+        with transaction.atomic():
+            existing = {
+                stats.business_user_id: stats
+                for stats in BusinessRatingStats.objects.select_for_update()
+            }
+            drifted = {}
+            for business_user_id in expected.keys() | existing.keys():
+                review_count, rating_sum = expected.get(business_user_id, (0, 0.0))
+                stats = existing.get(business_user_id)
+                if stats is None:
+                    stats = BusinessRatingStats(business_user_id=business_user_id)
+                average_rating = rating_sum / review_count if review_count else None
+
+                if (stats.review_count != review_count or
+                        abs(stats.rating_sum - rating_sum) > 1e-6):
+                    self.stdout.write(
+                        f'User #{business_user_id} review_count: '
+                        f'{stats.review_count} -> {review_count}, rating_sum: '
+                        f'{stats.rating_sum} -> {rating_sum}')
+                    stats.review_count = review_count
+                    stats.rating_sum = rating_sum
+                    stats.average_rating = average_rating
+                    drifted[business_user_id] = stats
+
+            if not options['dry_run']:
+                for stats in drifted.values():
+                    stats.save()
+
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} drift for {len(drifted)} business user(s).'))
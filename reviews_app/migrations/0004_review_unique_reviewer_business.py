@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 02:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    """
+    Keeps the first review per (reviewer, business_user) pair. Duplicates
+    could only be created by concurrent requests racing the old check.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    first_ids = Review.objects.values('reviewer', 'business_user').annotate(
+        first_id=Min('id')).values('first_id')
+    Review.objects.exclude(id__in=first_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0003_business_rating_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_reviewer_business_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='review_unique_reviewer_business'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest, NullIf
 from django.contrib.auth.models import User
 
 
@@ -17,5 +19,70 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['reviewer', 'business_user'],
+                                    name='review_unique_reviewer_business'),
+        ]
+        indexes = [
+            models.Index(fields=['business_user', '-created_at'],
+                         name='review_business_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Review #{self.id}: {self.business_user} by {self.reviewer}"
+
+
+class BusinessRatingStats(models.Model):
+    """
+    Materialized per-business-user rating aggregates, one row per 
+    reviewed business user, kept up to date by the Review signal handlers 
+    whenever a review is created, changes its rating or is deleted. Bulk 
+    writes bypass the signals; run reconcile_rating_stats after them. 
+    Lets business profiles be filtered and ordered by rating without 
+    averaging the reviews.
+    """
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name='rating_stats', on_delete=models.CASCADE
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-average_rating', '-review_count'],
+                         name='rating_stats_top_idx'),
+        ]
+
+    @classmethod
+    def record_rating_change(cls, business_user_id, old_rating=None, new_rating=None):
+        """
+        Replaces old_rating by new_rating in the aggregates of the given 
+        business user. Pass old_rating=None for a new review and 
+        new_rating=None for a deleted one. Called by the Review signal 
+        handlers (see reviews_app.signals) inside the transaction that 
+        writes the review.
+        """
+        count_delta = (new_rating is not None) - (old_rating is not None)
+        sum_delta = float(new_rating or 0) - float(old_rating or 0)
+        if not count_delta and not sum_delta:
+            return
+
+        review_count = Greatest(F('review_count') + count_delta, 0)
+        changes = {
+            'review_count': review_count,
+            'rating_sum': F('rating_sum') + sum_delta,
+            'average_rating': (F('rating_sum') + sum_delta) / NullIf(review_count, 0),
+        }
+        stats = cls.objects.filter(business_user_id=business_user_id)
+        # A missing row has nothing to remove; it may also be cascade
+        # deleted together with its business user right now.
+        if not stats.update(**changes) and new_rating is not None:
+            cls.objects.get_or_create(business_user_id=business_user_id)
+            stats.update(**changes)
+
     def __str__(self):
-        return f"Review #{self.id}: {self.business_user} by {self.reviewer}"
\ No newline at end of file
+        return f"Rating stats for user #{self.business_user_id}"
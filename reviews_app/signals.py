@@ -0,0 +1,47 @@
+from django.db import connections
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Review, BusinessRatingStats
+
+STATS_FIELDS = {'rating', 'business_user', 'business_user_id'}
+
+
+@receiver(pre_save, sender=Review, dispatch_uid='rating_stats_stored_rating')
+def remember_stored_rating(sender, instance, raw, using, update_fields=None, **kwargs):
+    """
+    Reads the business user and rating an existing review has in the 
+    database (locked until the save commits inside a transaction), so 
+    the aggregates replace what was stored.
+    """
+    instance._stored_stats = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not STATS_FIELDS & set(update_fields):
+        return
+    reviews = sender.objects.using(using).filter(pk=instance.pk)
+    if connections[using].in_atomic_block:
+        reviews = reviews.select_for_update()
+    instance._stored_stats = reviews.values_list('business_user_id', 'rating').first()
+
+
+@receiver(post_save, sender=Review, dispatch_uid='rating_stats_save')
+def update_rating_stats(sender, instance, created, raw, **kwargs):
+    """ Adds a new review and moves a changed one in the aggregates. """
+    if raw:
+        return
+    stored = None if created else getattr(instance, '_stored_stats', None)
+    if stored is None and not created:
+        return
+    old_business_user_id, old_rating = stored or (instance.business_user_id, None)
+    if old_business_user_id != instance.business_user_id:
+        BusinessRatingStats.record_rating_change(old_business_user_id, old_rating=old_rating)
+        old_rating = None
+    BusinessRatingStats.record_rating_change(
+        instance.business_user_id, old_rating, instance.rating)
+
+
+@receiver(post_delete, sender=Review, dispatch_uid='rating_stats_delete')
+def remove_rating_stats(sender, instance, **kwargs):
+    """ Removes a deleted review, including reviews deleted by a cascade. """
+    BusinessRatingStats.record_rating_change(
+        instance.business_user_id, old_rating=instance.rating)
@@ -0,0 +1,124 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from reviews_app.models import BusinessRatingStats, Review
+from users_auth_app.models import UserProfileModel
+
+
+class ReviewTestMixin:
+    """ Two business users and an authenticated customer. """
+
+    def create_user(self, username, user_type):
+        user = User.objects.create_user(username=username)
+        UserProfileModel.objects.create(
+            user=user, user_type=user_type, email=f'{username}@example.com')
+        return user
+
+    def setUp(self):
+        self.business = self.create_user('business', 'business')
+        self.other_business = self.create_user('other', 'business')
+        self.customer = self.create_user('customer', 'customer')
+        self.client.force_authenticate(self.customer)
+
+    def review(self, business_user, rating):
+        response = self.client.post('/api/reviews/', {
+            'business_user': business_user.pk, 'rating': rating,
+            'description': 'Text'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def stats(self, user):
+        return BusinessRatingStats.objects.get(business_user=user)
+
+
+class BusinessRatingStatsTests(ReviewTestMixin, APITestCase):
+    """
+    Ensures the per-business rating aggregates follow review writes and 
+    drive filtering and ordering of the business profile list.
+    """
+
+    def test_aggregates_follow_create_update_delete(self):
+        review_id = self.review(self.business, 4)
+        self.client.force_authenticate(self.create_user('second', 'customer'))
+        self.review(self.business, 5)
+        self.assertEqual(self.stats(self.business).review_count, 2)
+        self.assertEqual(self.stats(self.business).average_rating, 4.5)
+
+        self.client.force_authenticate(self.customer)
+        self.client.patch(f'/api/reviews/{review_id}/',
+                          {'rating': 2, 'description': 'Worse'}, format='json')
+        self.assertEqual(self.stats(self.business).average_rating, 3.5)
+
+        self.client.delete(f'/api/reviews/{review_id}/')
+        stats = self.stats(self.business)
+        self.assertEqual((stats.review_count, stats.average_rating), (1, 5.0))
+
+    def test_aggregates_follow_saves_and_cascade_deletes(self):
+        review = Review.objects.get(pk=self.review(self.business, 4))
+        review.rating = 2
+        review.save()
+        self.assertEqual(self.stats(self.business).average_rating, 2.0)
+
+        review.business_user = self.other_business
+        review.save()
+        self.assertEqual(self.stats(self.business).review_count, 0)
+        self.assertEqual(self.stats(self.other_business).average_rating, 2.0)
+
+        self.customer.delete()
+        stats = self.stats(self.other_business)
+        self.assertEqual((stats.review_count, stats.average_rating), (0, None))
+
+    def test_profile_detail_shows_aggregates(self):
+        self.review(self.business, 4)
+        response = self.client.get(f'/api/profile/{self.business.pk}/')
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['average_rating'], 4.0)
+
+    def test_business_list_filters_and_orders_by_rating(self):
+        self.review(self.business, 3)
+        self.review(self.other_business, 5)
+        response = self.client.get(
+            '/api/profiles/business/?ordering=-average_rating&min_reviews=1')
+        self.assertEqual([row['user'] for row in response.data],
+                         [self.other_business.pk, self.business.pk])
+        self.assertEqual(response.data[0]['review_count'], 1)
+
+        response = self.client.get('/api/profiles/business/?min_rating=4')
+        self.assertEqual([row['user'] for row in response.data],
+                         [self.other_business.pk])
+
+    def test_reconcile_fixes_drift(self):
+        self.review(self.business, 4)
+        BusinessRatingStats.objects.update(review_count=9, rating_sum=1)
+        output = StringIO()
+        call_command('reconcile_rating_stats', stdout=output)
+        self.assertIn('review_count: 9 -> 1', output.getvalue())
+        stats = self.stats(self.business)
+        self.assertEqual((stats.review_count, stats.average_rating), (1, 4.0))
+
+
+class ReviewUniquenessTests(ReviewTestMixin, APITestCase):
+    """
+    Ensures the unique constraint rejects a second review per business 
+    user with the German validation message and leaves the stats intact.
+    """
+
+    def test_duplicate_review_is_rejected(self):
+        self.review(self.business, 4)
+        response = self.client.post('/api/reviews/', {
+            'business_user': self.business.pk, 'rating': 1,
+            'description': 'Again'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data, ['Du hast bereits eine Bewertung für diesen Anbieter abgegeben.'])
+        self.assertEqual(self.stats(self.business).review_count, 1)
+
+    def test_other_integrity_errors_propagate(self):
+        with mock.patch.object(Review, 'save', side_effect=IntegrityError('NOT NULL')):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/reviews/', {
+                    'business_user': self.business.pk, 'rating': 1,
+                    'description': 'Text'}, format='json')
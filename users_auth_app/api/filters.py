@@ -0,0 +1,17 @@
+import django_filters
+from users_auth_app.models import UserProfileModel
+
+
+class BusinessUserFilter(django_filters.FilterSet):
+    """
+    Filters business profiles by their rating aggregates, e.g. 
+    ?min_rating=4.5&min_reviews=10.
+    """
+    min_rating = django_filters.NumberFilter(
+        field_name='average_rating', lookup_expr='gte')
+    min_reviews = django_filters.NumberFilter(
+        field_name='review_count', lookup_expr='gte')
+
+    class Meta:
+        model = UserProfileModel
+        fields = ['min_rating', 'min_reviews']
@@ -4,12 +4,16 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
 from django.conf import settings
+from utils.fast_serializers import ValuesSerializer, to_basename
+from utils.images import variant_urls
+from utils.instrumentation import TimedSerializerMixin
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for user profiles, combining user and profile fields.
-    Includes file upload handling and provides the full file URL.
+    Includes file upload handling and provides the full file URL. 
+    review_count and average_rating are annotated by the view.
     """
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     username = serializers.CharField(source="user.username", read_only=True)
@@ -22,6 +26,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
         source='availability', required=False, default="")
 
     file = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = UserProfileModel
@@ -31,6 +38,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
             'location',
             'tel',
             'description',
@@ -38,6 +46,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'type',
             'email',
             'created_at',
+            'review_count',
+            'average_rating',
         ]
 
     def update(self, instance, validated_data):
@@ -63,6 +73,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
             return obj.file.name.split('/')[-1]
         return None
 
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file, obj.file_variants)
+
 
 class RegistrationSerializer(serializers.Serializer):
     """
@@ -132,7 +145,7 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
-class BusinessUserListSerializer(serializers.ModelSerializer):
+class BusinessUserListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing business users.
     Includes selected profile and user details, along with profile image and availability.
@@ -146,11 +159,14 @@ class BusinessUserListSerializer(serializers.ModelSerializer):
     working_hours = serializers.CharField(
         source='availability', required=False)
     type = serializers.CharField(source='user_type')
+    review_count = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = UserProfileModel
         fields = ['user', 'username', 'first_name', 'last_name', 'file',
-                  'location', 'tel', 'description', 'working_hours', 'type']
+                  'location', 'tel', 'description', 'working_hours', 'type',
+                  'review_count', 'average_rating']
 
     def get_file(self, obj):
         if obj.file:
@@ -158,7 +174,7 @@ class BusinessUserListSerializer(serializers.ModelSerializer):
         return None
 
 
-class CustomerUserListSerializer(serializers.ModelSerializer):
+class CustomerUserListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing customer users.
     Includes selected profile and user details, profile image, registration date, and user type.
@@ -192,3 +208,36 @@ class CustomerUserListSerializer(serializers.ModelSerializer):
 
     def get_uploaded_at(self, obj):
         return obj.created_at
+
+
+class BusinessUserValuesSerializer(ValuesSerializer):
+    """ Fast list counterpart of BusinessUserListSerializer. """
+
+    fields = {
+        'user': 'user_id',
+        'username': 'user__username',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'file': ('file', to_basename),
+        'location': 'location',
+        'tel': 'tel',
+        'description': 'description',
+        'working_hours': 'availability',
+        'type': 'user_type',
+        'review_count': 'review_count',
+        'average_rating': 'average_rating',
+    }
+
+
+class CustomerUserValuesSerializer(ValuesSerializer):
+    """ Fast list counterpart of CustomerUserListSerializer. """
+
+    fields = {
+        'user': 'user_id',
+        'username': 'user__username',
+        'first_name': 'user__first_name',
+        'last_name': 'user__last_name',
+        'file': ('file', to_basename),
+        'uploaded_at': 'created_at',
+        'type': 'user_type',
+    }
@@ -1,4 +1,7 @@
-from rest_framework import generics
+from rest_framework import generics, filters
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django_filters.rest_framework import DjangoFilterBackend
 from users_auth_app.models import UserProfileModel
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -7,14 +10,28 @@ from rest_framework.response import Response
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied, NotFound
+from utils.streaming import StreamingListMixin
+from utils.db_routing import pin_user
+from .filters import BusinessUserFilter
+from utils.fast_serializers import ValuesListMixin
 
 from .serializers import (UserProfileSerializer,
                           BusinessUserListSerializer,
                           CustomerUserListSerializer,
+                          BusinessUserValuesSerializer,
+                          CustomerUserValuesSerializer,
                           RegistrationSerializer,
                           LoginSerializer)
 
 
+def with_rating_stats(profiles):
+    """ Annotates profiles with the rating aggregates of their user. """
+    return profiles.select_related('user').annotate(
+        average_rating=F('user__rating_stats__average_rating'),
+        review_count=Coalesce('user__rating_stats__review_count', 0),
+    )
+
+
 class UserProfileDetailView(generics.RetrieveUpdateAPIView):
     """
     API view to retrieve or update a user profile.
@@ -28,42 +45,52 @@ class UserProfileDetailView(generics.RetrieveUpdateAPIView):
 
         user_id = self.kwargs["pk"]
         try:
-            obj = UserProfileModel.objects.get(user__id=user_id)
+            obj = with_rating_stats(UserProfileModel.objects).get(user__id=user_id)
             return obj
         except UserProfileModel.DoesNotExist:
             raise NotFound(f"UserProfile with user_id={user_id} not found.")
 
     def update(self, request, *args, **kwargs):
         obj = self.get_object()
-        if not request.user.is_staff and obj.user != request.user:
+        if not request.user.is_staff and obj.user_id != request.user.pk:
             raise PermissionDenied("You can only edit your own profile.")
         return super().update(request, *args, **kwargs)
 
 
-class BusinessUserListView(generics.ListAPIView):
+class BusinessUserListView(StreamingListMixin, ValuesListMixin,
+                           generics.ListAPIView):
     """
     API view to list all business user profiles.
     Accessible only to authenticated users.
     """
 
     serializer_class = BusinessUserListSerializer
+    values_serializer_class = BusinessUserValuesSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = BusinessUserFilter
+    ordering_fields = ['average_rating', 'review_count']
 
     def get_queryset(self):
-        return UserProfileModel.objects.filter(user_type='business')
+        """ Business profiles with the rating aggregates of their user. """
+        return with_rating_stats(
+            UserProfileModel.objects.filter(user_type='business'))
 
 
-class CustomerUserListView(generics.ListAPIView):
+class CustomerUserListView(StreamingListMixin, ValuesListMixin,
+                           generics.ListAPIView):
     """
     API view to list all customer user profiles.
     Accessible only to authenticated users.
     """
 
     serializer_class = CustomerUserListSerializer
+    values_serializer_class = CustomerUserValuesSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return UserProfileModel.objects.filter(user_type='customer')
+        return UserProfileModel.objects.filter(
+            user_type='customer').select_related('user')
 
 
 class RegistrationView(APIView):
@@ -96,6 +123,7 @@ class RegistrationView(APIView):
                 name=username,
             )
             token, created = Token.objects.get_or_create(user=user)
+            pin_user(user.pk)
 
             return Response({
                 "token": token.key,
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-18 02:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_auth_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofilemodel',
+            index=models.Index(fields=['user_type'], name='profile_user_type_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_auth_app', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofilemodel',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -19,6 +19,7 @@ class UserProfileModel(models.Model):
     name = models.CharField(max_length=255, default="default")
     file = models.FileField(
         upload_to='profile_pics/', null=True, blank=True)
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(max_length=255, blank=True, default="")
     tel = models.CharField(max_length=20, blank=True, default="")
     description = models.TextField(blank=True, default="")
@@ -29,5 +30,10 @@ class UserProfileModel(models.Model):
     email = models.EmailField(unique=True, blank=True, default="")
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_type'], name='profile_user_type_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from utils.authentication import invalidate_token, invalidate_user
+from utils.images import schedule_variants
+from .models import UserProfileModel
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='auth_cache_token_delete')
+def token_deleted(sender, instance, **kwargs):
+    """ Logged-out or revoked tokens must stop authenticating at once. """
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User, dispatch_uid='auth_cache_user_save')
+@receiver(post_save, sender=UserProfileModel, dispatch_uid='auth_cache_profile_save')
+@receiver(post_delete, sender=UserProfileModel, dispatch_uid='auth_cache_profile_delete')
+def user_changed(sender, instance, **kwargs):
+    """ Drops cached tokens when is_staff, is_active or user_type may have changed. """
+    user_id = instance.pk if sender is User else instance.user_id
+    invalidate_user(user_id)
+
+
+@receiver(post_save, sender=UserProfileModel, dispatch_uid='profile_file_variants')
+def profile_file_variants(sender, instance, **kwargs):
+    """ Generates the resized variants of a new or replaced profile picture. """
+    schedule_variants(instance, 'file', 'file_variants')
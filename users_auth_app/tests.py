@@ -0,0 +1,237 @@
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from users_auth_app.models import UserProfileModel
+from utils import db_routing
+from utils.authentication import (USER_FIELDS, CachedTokenAuthentication, Principal,
+                                  shared_cache, token_cache)
+from utils.permissions import (IsBusinessOrAdmin, IsBusinessOwnerOrAdmin,
+                               IsCustomerOrAdmin)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Ensures a warm token costs no queries for authentication and profile 
+    based permissions, and that token and profile changes take effect.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='business')
+        self.profile = UserProfileModel.objects.create(
+            user=self.user, user_type='business', email='b@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = f'/api/completed-order-count/{self.user.pk}/'
+
+    def test_warm_path_only_runs_the_view_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_type_change_invalidates(self):
+        self.client.get(self.url)
+        self.profile.user_type = 'customer'
+        self.profile.save()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_cached_user_holds_no_password_hash(self):
+        self.client.get(self.url)
+        self.assertEqual(set(token_cache.get(self.token.key)['user']), set(USER_FIELDS))
+
+    def test_cached_user_cannot_be_saved(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+        user, _ = authentication.authenticate_credentials(self.token.key)
+        with self.assertRaises(RuntimeError):
+            user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).password)
+
+    def test_local_caches_are_not_shared(self):
+        self.assertIsNone(shared_cache())
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class PrincipalPermissionTests(APITestCase):
+    """
+    Ensures the permission classes evaluate on the request principal and 
+    foreign-key ids without running queries.
+    """
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='business')
+        UserProfileModel.objects.create(
+            user=self.business, user_type='business', email='b@example.com')
+        self.customer = User.objects.create_user(username='customer')
+        UserProfileModel.objects.create(
+            user=self.customer, user_type='customer', email='c@example.com')
+
+    def make_request(self, method, user):
+        request = Request(getattr(APIRequestFactory(), method)('/'))
+        request.user = User.objects.select_related('profile').get(pk=user.pk)
+        return request
+
+    def test_permission_checks_run_no_queries(self):
+        offer = Offer.objects.create(user=self.business, title='T', description='D')
+        detail = OfferDetail.objects.create(
+            offer=offer, offer_type='basic', price=10, delivery_time_in_days=1)
+        order = Order.objects.create(
+            customer_user=self.customer, business_user=self.business,
+            offer_detail=detail,
+            title='T', revisions=1, delivery_time_in_days=1, price=10,
+            features=[], offer_type='basic')
+        offer = Offer.objects.get(pk=offer.pk)
+        order = Order.objects.get(pk=order.pk)
+        business_request = self.make_request('patch', self.business)
+        customer_request = self.make_request('post', self.customer)
+        view = SimpleNamespace(action='partial_update')
+
+        with self.assertNumQueries(0):
+            owner = IsBusinessOwnerOrAdmin()
+            self.assertTrue(owner.has_permission(business_request, view))
+            self.assertTrue(owner.has_object_permission(business_request, view, offer))
+            self.assertTrue(owner.has_object_permission(business_request, view, order))
+            self.assertTrue(IsBusinessOrAdmin().has_permission(business_request, view))
+            self.assertTrue(IsCustomerOrAdmin().has_permission(customer_request, view))
+            self.assertFalse(owner.has_permission(customer_request, view))
+            self.assertFalse(
+                IsBusinessOrAdmin().has_permission(customer_request, view))
+
+
+class ProfileValuesSerializerTests(APITestCase):
+    """
+    Ensures the values()-based profile lists equal the serializer output.
+    """
+
+    def test_fast_lists_match_model_serializers(self):
+        for index, user_type in enumerate(['business', 'customer'] * 2):
+            user = User.objects.create_user(username=f'user{index}', first_name='F')
+            UserProfileModel.objects.create(
+                user=user, user_type=user_type, email=f'{index}@example.com',
+                file='profile_pics/avatar.png' if index < 2 else None)
+        self.client.force_authenticate(user)
+
+        for url in ('/api/profiles/business/', '/api/profiles/customer/'):
+            with override_settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(url).json()
+            regular = self.client.get(url).json()
+            self.assertEqual(fast, regular)
+            self.assertEqual(len(fast), 2)
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    """
+    Ensures DJANGO_ENV=production loads the lean production profile.
+    """
+
+    def load_settings(self, **environment):
+        env = {key: value for key, value in os.environ.items()
+               if not key.startswith('DJANGO_')}
+        env.update(environment, DJANGO_SETTINGS_MODULE='coderr_freelancer.settings')
+        script = (
+            'import json, django; from django.conf import settings; django.setup(); '
+            'print(json.dumps({"debug": settings.DEBUG, '
+            '"apps": settings.INSTALLED_APPS, "middleware": settings.MIDDLEWARE, '
+            '"conn_max_age": settings.DATABASES["default"]["CONN_MAX_AGE"], '
+            '"renderers": settings.REST_FRAMEWORK.get("DEFAULT_RENDERER_CLASSES")}))')
+        result = subprocess.run([sys.executable, '-c', script], env=env,
+                                cwd=settings.BASE_DIR, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout)
+
+    def test_production_profile(self):
+        loaded = self.load_settings(DJANGO_ENV='production', DJANGO_SECRET_KEY='secret')
+        self.assertFalse(loaded['debug'])
+        self.assertGreater(loaded['conn_max_age'], 0)
+        self.assertNotIn('django_extensions', loaded['apps'])
+        self.assertNotIn('django.contrib.admin', loaded['apps'])
+        self.assertNotIn('django.contrib.sessions.middleware.SessionMiddleware',
+                         loaded['middleware'])
+        self.assertEqual(loaded['renderers'], ['rest_framework.renderers.JSONRenderer'])
+
+    def test_production_admin_keeps_its_middleware(self):
+        loaded = self.load_settings(
+            DJANGO_ENV='production', DJANGO_SECRET_KEY='secret', DJANGO_ADMIN='1')
+        self.assertIn('django.contrib.admin', loaded['apps'])
+        self.assertIn('django.middleware.csrf.CsrfViewMiddleware', loaded['middleware'])
+
+
+@override_settings(REPLICA_ROUTING={'REPLICAS': ['default'], 'STICKY_SECONDS': 5})
+class ReplicaRoutingTests(APITestCase):
+    """
+    Ensures safe requests read from a replica, tokens and writes use the 
+    primary, and a user who wrote reads from the primary for a while. 
+    The primary's alias stands in for the replica, so routing to the 
+    replica returns 'default' and routing to the primary returns None.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = db_routing.ReplicaRouter()
+
+    def route(self, method, user_id=None):
+        request = RequestFactory().generic(method, '/api/offers/')
+        routes = []
+
+        def view(request):
+            if user_id is not None:
+                request.principal = Principal(user_id, True, False, 'customer')
+            routes.append(self.router.db_for_read(Offer))
+            routes.append(self.router.db_for_read(Token))
+            return HttpResponse()
+
+        db_routing.ReplicaRoutingMiddleware(view)(request)
+        return routes
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertEqual(self.route('GET'), ['default', None])
+        self.assertEqual(self.route('GET', user_id=1), ['default', None])
+        self.assertEqual(self.router.db_for_write(Offer), 'default')
+        self.assertFalse(self.router.allow_migrate('default', 'offers_app'))
+
+    def test_streamed_list_reads_from_replica(self):
+        request = RequestFactory().get('/api/orders/?stream=json')
+
+        def rows():
+            yield self.router.db_for_read(Offer) or 'primary'
+
+        response = db_routing.ReplicaRoutingMiddleware(
+            lambda request: StreamingHttpResponse(rows()))(request)
+        self.assertIsNone(db_routing._current_routing.get())
+        self.assertEqual(b''.join(response.streaming_content), b'default')
+
+    def test_writer_reads_own_writes_from_primary(self):
+        self.assertEqual(self.route('PATCH', user_id=1), [None, None])
+        self.assertEqual(self.route('GET', user_id=1), [None, None])
+        self.assertEqual(self.route('GET', user_id=2), ['default', None])
+
+    def test_registration_pins_new_user(self):
+        response = self.client.post('/api/registration/', {
+            'username': 'new', 'email': 'new@example.com', 'password': 'secret123',
+            'repeated_password': 'secret123', 'type': 'customer'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(db_routing.is_pinned(response.data['user_id']))
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        db_routing._unavailable['default'] = float('inf')
+        try:
+            self.assertEqual(self.route('GET'), [None, None])
+        finally:
+            db_routing._unavailable.clear()
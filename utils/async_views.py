@@ -0,0 +1,171 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import exception_handler
+
+
+async def authenticate_token(request):
+    """
+    Async counterpart of DRF's TokenAuthentication. Loads the token, its
+    user and the user's profile in one query so that permission classes
+    reading request.user.profile do not hit the database again.
+    Returns (user, token), or (AnonymousUser, None) without a token header.
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if not auth or auth[0].lower() != 'token':
+        return AnonymousUser(), None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(
+            'Invalid token header. Token string should not contain spaces.')
+
+    try:
+        token = await Token.objects.select_related(
+            'user', 'user__profile').aget(key=auth[1])
+    except Token.DoesNotExist:
+        raise exceptions.AuthenticationFailed('Invalid token.')
+
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed('User inactive or deleted.')
+    return token.user, token
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async base view for read-only JSON endpoints served under
+    ASGI. It mirrors the parts of DRF's APIView the read endpoints rely
+    on (token authentication, permission classes, exception handling and
+    JSON rendering) while the handlers use Django's async ORM, so a
+    worker is not blocked on database round trips.
+    Handlers are async methods returning a DRF Response.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_class = JSONRenderer
+    http_method_names = ['get', 'head']
+    action = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        drf_request = Request(
+            request, parser_context={'view': self, 'args': args, 'kwargs': kwargs})
+        self.request = drf_request
+
+        try:
+            drf_request.user, drf_request.auth = await authenticate_token(request)
+            self.check_permissions(drf_request)
+
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            response = await handler(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        return self.finalize_response(drf_request, response)
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(
+                    detail=getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated,
+                            exceptions.AuthenticationFailed)):
+            exc.auth_header = 'Token'
+
+        response = exception_handler(exc, {'view': self, 'request': self.request})
+        if response is None:
+            raise exc
+        response.exception = True
+        return response
+
+    def finalize_response(self, request, response):
+        response.accepted_renderer = self.renderer_class()
+        response.accepted_media_type = response.accepted_renderer.media_type
+        response.renderer_context = {
+            'view': self, 'request': request, 'response': response}
+        return response.render()
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self, 'format': None}
+
+    async def filter_with_viewset(self, viewset_class, action):
+        """
+        Builds the filtered queryset of a synchronous DRF viewset for this
+        request. Filter backends may validate parameters against the
+        database, so this runs in a worker thread; the returned queryset
+        is still lazy and can be evaluated with the async ORM.
+        """
+        viewset = viewset_class(
+            request=self.request, args=self.args, kwargs=self.kwargs,
+            action=action, format_kwarg=None)
+
+        def build():
+            return viewset.filter_queryset(viewset.get_queryset())
+
+        return await sync_to_async(build)()
+
+
+class AsyncPageNumberMixin:
+    """
+    Async page-number pagination producing the same response shape as
+    SixPerPagePagination (count, next, previous, results).
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    async def paginate(self, queryset):
+        request = self.request
+        try:
+            page_size = min(
+                int(request.query_params[self.page_size_query_param]),
+                self.max_page_size)
+            if page_size <= 0:
+                raise ValueError
+        except (KeyError, ValueError):
+            page_size = self.page_size
+
+        try:
+            page_number = int(request.query_params.get('page', 1))
+            if page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise exceptions.NotFound('Invalid page.')
+
+        count = await queryset.acount()
+        offset = (page_number - 1) * page_size
+        if offset and offset >= count:
+            raise exceptions.NotFound('Invalid page.')
+
+        rows = [row async for row in queryset[offset:offset + page_size]]
+        url = request.build_absolute_uri()
+        next_link = None
+        if offset + page_size < count:
+            next_link = replace_query_param(url, 'page', page_number + 1)
+        previous_link = None
+        if page_number == 2:
+            previous_link = remove_query_param(url, 'page')
+        elif page_number > 2:
+            previous_link = replace_query_param(url, 'page', page_number - 1)
+        return rows, {'count': count, 'next': next_link, 'previous': previous_link}
+
+    def paginated_response(self, data, meta):
+        return Response({**meta, 'results': data})
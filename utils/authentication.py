@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from users_auth_app.models import UserProfileModel
+
+DEFAULTS = {
+    'TTL': 60,
+    'LOCAL_TTL': 5,
+    'MAX_SIZE': 10000,
+    'SHARED_CACHE': 'default',
+}
+SHARED_KEY_PREFIX = 'auth-token:'
+# Cached user fields; the password hash and permissions stay in the database.
+USER_FIELDS = ('id', 'username', 'is_active', 'is_staff',
+               'first_name', 'last_name', 'email')
+
+
+def get_setting(name):
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class Principal:
+    """
+    Request-scoped view of the authenticated user holding only what the
+    permission classes need, so they compare ids instead of loading
+    related rows.
+    """
+    __slots__ = ('user_id', 'is_authenticated', 'is_staff', 'user_type')
+
+    def __init__(self, user_id, is_authenticated, is_staff, user_type):
+        self.user_id = user_id
+        self.is_authenticated = is_authenticated
+        self.is_staff = is_staff
+        self.user_type = user_type
+
+    @classmethod
+    def from_user(cls, user):
+        profile = getattr(user, 'profile', None) if user.is_authenticated else None
+        return cls(
+            user_id=user.pk,
+            is_authenticated=user.is_authenticated,
+            is_staff=user.is_staff,
+            user_type=profile.user_type if profile is not None else None,
+        )
+
+
+def set_principal(request, user):
+    """ Stores the principal of user on the underlying Django request. """
+    principal = Principal.from_user(user)
+    getattr(request, '_request', request).principal = principal
+    return principal
+
+
+def get_principal(request):
+    """
+    Returns the principal of request.user, resolving it at most once per
+    request (and user). CachedTokenAuthentication resolves it already
+    while authenticating.
+    """
+    user = request.user
+    principal = getattr(getattr(request, '_request', request), 'principal', None)
+    if principal is None or principal.user_id != user.pk:
+        principal = set_principal(request, user)
+    return principal
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process LRU cache whose entries expire after
+    a fixed number of seconds.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+token_cache = TTLCache(get_setting('MAX_SIZE'), get_setting('LOCAL_TTL'))
+
+
+def shared_cache():
+    """
+    The cache named by SHARED_CACHE, or None if it is not shared between
+    processes: invalidating a process-local cache would not reach the
+    other workers, so they rely on LOCAL_TTL alone.
+    """
+    alias = get_setting('SHARED_CACHE')
+    if not alias:
+        return None
+    cache = caches[alias]
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        return None
+    return cache
+
+
+def snapshot(instance, fields=None):
+    """
+    Returns the values of the given fields (all concrete fields by 
+    default) of a model instance.
+    """
+    if fields is None:
+        fields = [field.attname for field in instance._meta.concrete_fields]
+    return {name: getattr(instance, name) for name in fields}
+
+
+def restore(model, values):
+    """ Rebuilds a model instance from a snapshot without a query. """
+    instance = model(**values)
+    instance._state.adding = False
+    instance._state.db = 'default'
+    return instance
+
+
+def read_only(instance):
+    """ Makes save() of a partially restored instance raise. """
+    def save(*args, **kwargs):
+        raise RuntimeError(
+            f'{type(instance).__name__} #{instance.pk} was restored from the token '
+            'cache with only some of its fields; load it from the database to save it.')
+    instance.save = save
+    return instance
+
+
+def invalidate_token(key):
+    """ Drops a token from the local and the shared cache. """
+    token_cache.delete(key)
+    cache = shared_cache()
+    if cache is not None:
+        cache.delete(SHARED_KEY_PREFIX + key)
+
+
+def invalidate_user(user_id):
+    """ Drops the cached tokens of a user, e.g. after a profile change. """
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that resolves a token to its user (USER_FIELDS
+    only) and profile from a short-lived in-process LRU cache
+    (LOCAL_TTL), backed by the Django cache named in
+    settings.TOKEN_AUTH_CACHE['SHARED_CACHE'] (TTL) if that is shared
+    between processes. A warm request authenticates without a query and
+    request.user.profile is already attached for the permission classes;
+    request.user cannot be saved, as it lacks the password and the other
+    uncached fields. Entries are invalidated by signals when a token is
+    deleted or a user or profile changes; other processes see that after
+    at most LOCAL_TTL seconds.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            set_principal(request, result[0])
+        return result
+
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        if entry is None:
+            entry = self.load_shared(key) or self.load_entry(key)
+            token_cache.set(key, entry)
+
+        user = read_only(restore(User, entry['user']))
+        if entry['profile'] is not None:
+            user.profile = restore(UserProfileModel, entry['profile'])
+        token = restore(Token, {'key': key, 'user_id': user.pk,
+                                'created': entry['created']})
+        return (user, token)
+
+    def load_shared(self, key):
+        cache = shared_cache()
+        if cache is None:
+            return None
+        return cache.get(SHARED_KEY_PREFIX + key)
+
+    def load_entry(self, key):
+        try:
+            token = Token.objects.select_related(
+                'user', 'user__profile').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        profile = getattr(token.user, 'profile', None)
+        entry = {
+            'user': snapshot(token.user, USER_FIELDS),
+            'profile': snapshot(profile) if profile is not None else None,
+            'created': token.created,
+        }
+        cache = shared_cache()
+        if cache is not None:
+            cache.set(SHARED_KEY_PREFIX + key, entry, timeout=get_setting('TTL'))
+        return entry
@@ -0,0 +1,188 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'REPLICAS': [],
+    'STICKY_SECONDS': 5,
+    'PIN_CACHE': 'default',
+    'RETRY_SECONDS': 30,
+    'PRIMARY_MODELS': ['authtoken.token'],
+}
+PIN_KEY_PREFIX = 'replica-pin:'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_current_routing = ContextVar('replica_routing', default=None)
+_unavailable = {}
+_unavailable_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, 'REPLICA_ROUTING', {}).get(name, DEFAULTS[name])
+
+
+def pin_user(user_id):
+    """
+    Sends the reads of a user to the primary for STICKY_SECONDS, so they
+    see their own writes while the replicas catch up.
+    """
+    if user_id is not None and get_setting('REPLICAS'):
+        caches[get_setting('PIN_CACHE')].set(
+            f'{PIN_KEY_PREFIX}{user_id}', True, get_setting('STICKY_SECONDS'))
+
+
+def is_pinned(user_id):
+    if user_id is None:
+        return False
+    return caches[get_setting('PIN_CACHE')].get(f'{PIN_KEY_PREFIX}{user_id}', False)
+
+
+def is_available(alias):
+    """
+    Checks that a replica accepts connections. A replica that fails is
+    skipped for RETRY_SECONDS and its reads go to the primary.
+    """
+    retry_at = _unavailable.get(alias)
+    if retry_at is not None and retry_at > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning('Replica %s is unavailable, reading from the primary.', alias)
+        with _unavailable_lock:
+            _unavailable[alias] = time.monotonic() + get_setting('RETRY_SECONDS')
+        return False
+    if retry_at is not None:
+        with _unavailable_lock:
+            _unavailable.pop(alias, None)
+    return True
+
+
+class RoutingState:
+    """
+    Read routing of one request. The replica is chosen once per request
+    and principal, after authentication has identified the user, so all
+    reads of a response come from the same database.
+    """
+    UNRESOLVED = object()
+
+    def __init__(self, request):
+        self.request = request
+        self.user_id = None
+        self.alias = self.UNRESOLVED
+
+    def read_alias(self):
+        principal = getattr(self.request, 'principal', None)
+        user_id = principal.user_id if principal is not None else None
+        if self.alias is self.UNRESOLVED or user_id != self.user_id:
+            self.user_id = user_id
+            self.alias = None if is_pinned(user_id) else self.choose_replica()
+        return self.alias
+
+    def choose_replica(self):
+        replicas = list(get_setting('REPLICAS'))
+        random.shuffle(replicas)
+        for alias in replicas:
+            if is_available(alias):
+                return alias
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets ReplicaRouter send the reads of GET/HEAD/OPTIONS requests to
+    the replicas in settings.REPLICA_ROUTING['REPLICAS']. Other requests
+    read from the primary, and their user is pinned to it afterwards.
+    Streamed responses keep the routing while their content is read.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            principal = getattr(request, 'principal', None)
+            if principal is not None:
+                pin_user(principal.user_id)
+            return response
+
+        state = RoutingState(request)
+        token = _current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_routing.reset(token)
+        if getattr(response, 'streaming', False):
+            if response.is_async:
+                response.streaming_content = self.route_async_stream(
+                    state, response.streaming_content)
+            else:
+                response.streaming_content = self.route_stream(
+                    state, response.streaming_content)
+        return response
+
+    @staticmethod
+    def route_stream(state, content):
+        """
+        Activates the request's routing around every chunk, so the rows a
+        streamed list reads after the view returned use the same database.
+        """
+        iterator = iter(content)
+        while True:
+            token = _current_routing.set(state)
+            try:
+                chunk = next(iterator, None)
+            finally:
+                _current_routing.reset(token)
+            if chunk is None:
+                return
+            yield chunk
+
+    @staticmethod
+    async def route_async_stream(state, content):
+        """ Async counterpart of route_stream. """
+        iterator = aiter(content)
+        while True:
+            token = _current_routing.set(state)
+            try:
+                chunk = await anext(iterator, None)
+            finally:
+                _current_routing.reset(token)
+            if chunk is None:
+                return
+            yield chunk
+
+
+class ReplicaRouter:
+    """
+    Database router for ReplicaRoutingMiddleware. Writes, reads outside
+    safe requests (management commands, workers) and reads of
+    PRIMARY_MODELS such as auth tokens always use the primary; replicas
+    are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _current_routing.get()
+        if state is None or model._meta.label_lower in get_setting('PRIMARY_MODELS'):
+            return None
+        return state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_setting('REPLICAS'):
+            return False
+        return None
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def to_number(value):
+    """ Decimal/float to int if it has no fractional part, else float. """
+    if value is None:
+        return None
+    value = float(value)
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+def to_basename(name):
+    """ Stored file name to its basename, None for an empty file field. """
+    if not name:
+        return None
+    return name.split('/')[-1]
+
+
+class DateTimeConverter:
+    """
+    Produces the output of DRF's DateTimeField. bind() resolves the
+    current timezone once per serializer instead of once per value.
+    """
+
+    def bind(self):
+        if api_settings.DATETIME_FORMAT != ISO_8601:
+            return serializers.DateTimeField().to_representation
+        current = timezone.get_current_timezone() if settings.USE_TZ else None
+
+        def convert(value):
+            if value is None:
+                return None
+            if current is not None and timezone.is_aware(value):
+                value = value.astimezone(current)
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return convert
+
+
+to_datetime = DateTimeConverter()
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer for list endpoints that skips model instances
+    and DRF's per-field machinery. Subclasses declare `fields`, mapping
+    each output key to a column path for values_list() or to a
+    (column, converter) pair. Only the declared columns are selected and
+    every row is mapped through the precomputed converters, so the output
+    matches the regular serializer of the endpoint. Converters with a
+    bind() method are bound once per serializer instance.
+    """
+    fields = {}
+
+    def __init__(self):
+        self.columns = []
+        self.plan = []
+        for name, source in self.fields.items():
+            column, converter = source if isinstance(source, tuple) else (source, None)
+            if hasattr(converter, 'bind'):
+                converter = converter.bind()
+            if column not in self.columns:
+                self.columns.append(column)
+            self.plan.append((name, self.columns.index(column), converter))
+
+    def rows(self, queryset, chunk_size=None, extra_columns=()):
+        """ Rows of the declared columns, followed by extra_columns. """
+        rows = queryset.prefetch_related(None).values_list(*self.columns, *extra_columns)
+        if chunk_size:
+            return rows.iterator(chunk_size=chunk_size)
+        return rows
+
+    def to_representation(self, row):
+        return {
+            name: row[index] if converter is None else converter(row[index])
+            for name, index, converter in self.plan
+        }
+
+    def serialize(self, queryset):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in self.rows(queryset)]
+
+    def iter_serialize(self, queryset, chunk_size):
+        to_representation = self.to_representation
+        for row in self.rows(queryset, chunk_size):
+            yield to_representation(row)
+
+
+class ValuesListMixin:
+    """
+    Serves unpaginated list responses with `values_serializer_class`
+    (a ValuesSerializer) when settings.FAST_READ_SERIALIZERS is on.
+    Paginated pages and all other actions use the regular serializer.
+    A paginator with an `unpaginated` flag (OptionalKeysetPagination)
+    may return the capped queryset as the page of a plain list.
+    """
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        if (self.values_serializer_class is None or
+                not getattr(settings, 'FAST_READ_SERIALIZERS', False)):
+            return None
+        return self.values_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(values_serializer.serialize(queryset))
+        if getattr(self.paginator, 'unpaginated', False):
+            return Response(values_serializer.serialize(page))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
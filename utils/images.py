@@ -0,0 +1,176 @@
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SIZES': {
+        'thumb': (160, 120),
+        'card': (480, 360),
+        'large': (1280, 960),
+    },
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    'WORKERS': 2,
+    'ASYNC': True,
+}
+PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, 'IMAGE_VARIANTS', {}).get(name, DEFAULTS[name])
+
+
+def get_executor():
+    """ Returns the process-wide worker pool, created on first use. """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_setting('WORKERS'),
+                thread_name_prefix='image-variants')
+        return _executor
+
+
+def variant_name(name, variant, fmt):
+    """ offer_pics/a.png -> offer_pics/variants/a-card.webp """
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    extension = 'jpg' if fmt == 'jpeg' else fmt
+    return posixpath.join(directory, 'variants', f'{stem}-{variant}.{extension}')
+
+
+def render_variant(image, size, fmt, quality):
+    """
+    Returns the encoded bytes of image scaled down to fit size. Only the
+    pixel data is written, so EXIF, GPS and other metadata are dropped.
+    """
+    from PIL import Image
+
+    variant = image.copy()
+    variant.thumbnail(size, Image.Resampling.LANCZOS)
+    if fmt == 'jpeg' and variant.mode != 'RGB':
+        background = Image.new('RGB', variant.size, (255, 255, 255))
+        if variant.mode in ('RGBA', 'LA', 'PA'):
+            background.paste(variant, mask=variant.getchannel('A'))
+        else:
+            background.paste(variant.convert('RGB'))
+        variant = background
+    elif variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGBA' if 'A' in variant.getbands() else 'RGB')
+
+    output = BytesIO()
+    variant.save(output, PIL_FORMATS[fmt], quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def generate_variants(field_file):
+    """
+    Writes all configured variants of an image file to its storage and
+    returns {'source': name, variant: {format: name}}.
+    """
+    from PIL import Image, ImageOps
+
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    variants = {'source': field_file.name}
+    quality = get_setting('QUALITY')
+    for variant, size in get_setting('SIZES').items():
+        variants[variant] = {}
+        for fmt in get_setting('FORMATS'):
+            name = variant_name(field_file.name, variant, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[variant][fmt] = storage.save(
+                name, ContentFile(render_variant(image, size, fmt, quality)))
+    return variants
+
+
+def delete_variants(storage, variants):
+    for variant, names in variants.items():
+        if variant == 'source':
+            continue
+        for name in names.values():
+            storage.delete(name)
+
+
+def process_variants(model, pk, field_name, variants_field):
+    """
+    Generates the variants of one instance and stores their names. The
+    row is only updated if it still points to the processed file, so an
+    upload replacing it in the meantime wins.
+    """
+    try:
+        instance = model.objects.only(field_name, variants_field).get(pk=pk)
+        field_file = getattr(instance, field_name)
+        if not field_file:
+            return
+        old_variants = getattr(instance, variants_field) or {}
+        variants = generate_variants(field_file)
+        updated = model.objects.filter(
+            pk=pk, **{field_name: field_file.name}).update(**{variants_field: variants})
+        if updated and old_variants.get('source') != field_file.name:
+            delete_variants(field_file.storage, old_variants)
+    except Exception:
+        logger.exception('Generating image variants failed for %s %s',
+                         model.__name__, pk)
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            close_old_connections()
+
+
+def schedule_variants(instance, field_name, variants_field):
+    """
+    Called after an instance is saved. Queues variant generation if the
+    image changed, or clears the variants if the image was removed.
+    Jobs run in the worker pool after the transaction commits, or inline
+    if settings.IMAGE_VARIANTS['ASYNC'] is off.
+    """
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field) or {}
+    model = type(instance)
+
+    if not field_file:
+        if variants:
+            delete_variants(field_file.storage, variants)
+            model.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+            setattr(instance, variants_field, {})
+        return
+    if variants.get('source') == field_file.name:
+        return
+
+    args = (model, instance.pk, field_name, variants_field)
+    if not get_setting('ASYNC'):
+        process_variants(*args)
+        instance.refresh_from_db(fields=[variants_field])
+        return
+    transaction.on_commit(lambda: get_executor().submit(process_variants, *args))
+
+
+def variant_urls(field_file, variants):
+    """
+    Maps the stored variant names to URLs, e.g.
+    {'card': {'webp': '/media/offer_pics/variants/a-card.webp', ...}}.
+    Returns None until variants for the current file exist.
+    """
+    if not field_file or not variants or variants.get('source') != field_file.name:
+        return None
+    storage = field_file.storage
+    return {
+        variant: {fmt: storage.url(name) for fmt, name in names.items()}
+        for variant, names in variants.items() if variant != 'source'
+    }
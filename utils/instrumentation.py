@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from utils.permissions import IsAdminOnly
+
+logger = logging.getLogger(__name__)
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a view runs more SQL queries than the budget declared
+    for its URL name in settings.QUERY_BUDGETS (strict mode only).
+    """
+
+
+class RequestMetrics:
+    """
+    Collects query count, SQL time and serializer time for a single
+    request while it is being processed.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.query_count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process store of per-endpoint aggregates, keyed by
+    the resolved URL name (e.g. 'offer-list' or 'order-count').
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, url_name, metrics, total_time, response_size):
+        with self._lock:
+            entry = self._endpoints.setdefault(url_name, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'sql_ms': 0.0,
+                'serializer_ms': 0.0,
+                'total_ms': 0.0,
+                'response_bytes': 0,
+            })
+            entry['requests'] += 1
+            entry['queries'] += metrics.query_count
+            entry['max_queries'] = max(
+                entry['max_queries'], metrics.query_count)
+            entry['sql_ms'] += metrics.sql_time * 1000
+            entry['serializer_ms'] += metrics.serializer_time * 1000
+            entry['total_ms'] += total_time * 1000
+            entry['response_bytes'] += response_size
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for url_name, entry in self._endpoints.items():
+                requests = entry['requests']
+                result[url_name] = {
+                    **entry,
+                    'avg_queries': round(entry['queries'] / requests, 2),
+                    'avg_sql_ms': round(entry['sql_ms'] / requests, 3),
+                    'avg_serializer_ms': round(entry['serializer_ms'] / requests, 3),
+                    'avg_total_ms': round(entry['total_ms'] / requests, 3),
+                    'avg_response_bytes': round(entry['response_bytes'] / requests),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin that attributes the time spent in to_representation
+    to the request measured by QueryInstrumentationMiddleware. Nested
+    serializers with the mixin are only counted at the outermost level;
+    without the middleware it only costs a context variable lookup.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super().to_representation(instance)
+
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics._serializer_depth -= 1
+            if metrics._serializer_depth == 0:
+                metrics.serializer_time += time.perf_counter() - start
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Opt-in middleware that measures SQL queries, SQL time, serializer
+    time (of serializers with TimedSerializerMixin) and response size
+    per resolved URL name. Per-request values are sent as a
+    Server-Timing header, aggregates are kept in the registry and
+    served by QueryMetricsView.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        total_time = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.url_name if match and match.url_name else None
+        if url_name is None:
+            return response
+
+        response_size = 0 if response.streaming else len(response.content)
+        registry.record(url_name, metrics, total_time, response_size)
+        response['Server-Timing'] = self.server_timing(metrics, total_time)
+        self.check_budget(url_name, metrics)
+        return response
+
+    def server_timing(self, metrics, total_time):
+        return ', '.join([
+            f'db;dur={metrics.sql_time * 1000:.2f};desc="{metrics.query_count} queries"',
+            f'ser;dur={metrics.serializer_time * 1000:.2f}',
+            f'total;dur={total_time * 1000:.2f}',
+        ])
+
+    def check_budget(self, url_name, metrics):
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(url_name)
+        if budget is None or metrics.query_count <= budget:
+            return
+
+        message = (
+            f"View '{url_name}' ran {metrics.query_count} queries, "
+            f"budget is {budget}."
+        )
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class QueryMetricsView(APIView):
+    """
+    Admin-only endpoint returning the aggregated per-endpoint SQL and
+    serializer metrics collected by QueryInstrumentationMiddleware.
+    A DELETE request resets the collected data.
+    """
+    permission_classes = [IsAdminOnly]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
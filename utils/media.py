@@ -0,0 +1,213 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+DEFAULTS = {
+    'BACKEND': 'django',
+    'ACCEL_PREFIX': '/protected-media/',
+    'MAX_AGE': 3600,
+}
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}(?:_[A-Za-z0-9]{7})?\.[^./]+$' % HASH_LENGTH)
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_setting(name):
+    return getattr(settings, 'MEDIA_SERVING', {}).get(name, DEFAULTS[name])
+
+
+class HashedFileSystemStorage(FileSystemStorage):
+    """
+    FileSystemStorage that puts a hash of the content into every saved
+    file name (a.png -> a.3f2a9c1b7d4e.png). A stored name therefore never
+    points to different bytes, and serve_media lets clients cache such
+    files forever.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        root, extension = posixpath.splitext(name)
+        suffix = f'.{digest.hexdigest()[:HASH_LENGTH]}{extension}'
+        if max_length is not None:
+            # Keep the hash if get_available_name() has to shorten the name.
+            root = root[:max(1, max_length - len(suffix) - 8)]
+        return super().save(root + suffix, content, max_length)
+
+
+def is_hashed_name(path):
+    return HASHED_NAME_RE.search(path) is not None
+
+
+class RangeFile:
+    """
+    Read-only view of `length` bytes of a file starting at `start`. Keeps
+    fileno() so wsgi.file_wrapper implementations using os.sendfile (e.g.
+    gunicorn, which limits the transfer to Content-Length) stay zero-copy.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) for a single satisfiable byte range, None to
+    serve the whole file (no, multiple or malformed ranges), or raises
+    ValueError for an unsatisfiable range.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if match is None or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def cache_control(path):
+    if is_hashed_name(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={get_setting("MAX_AGE")}'
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves a file below MEDIA_ROOT with ETag/Last-Modified validation
+    (304 responses), long-lived caching for content-hashed names and
+    single byte ranges. The transfer itself is delegated to the front
+    server when settings.MEDIA_SERVING['BACKEND'] is 'x-sendfile' or
+    'x-accel-redirect'; otherwise a FileResponse is returned, which WSGI
+    servers with a sendfile-capable file_wrapper send without copying.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, ValueError, OSError):
+        raise Http404('File not found.')
+    if not os.path.isfile(full_path):
+        raise Http404('File not found.')
+
+    etag = quote_etag(f'{stat.st_size:x}-{stat.st_mtime_ns:x}')
+    last_modified = int(stat.st_mtime)
+    content_type, encoding = mimetypes.guess_type(full_path)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': cache_control(path),
+        'Accept-Ranges': 'bytes',
+    }
+
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        for name in ('ETag', 'Last-Modified', 'Cache-Control'):
+            conditional.headers[name] = headers[name]
+        return conditional
+
+    backend = get_setting('BACKEND')
+    if backend in ('x-sendfile', 'x-accel-redirect'):
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        if backend == 'x-sendfile':
+            response.headers['X-Sendfile'] = full_path
+        else:
+            response.headers['X-Accel-Redirect'] = get_setting('ACCEL_PREFIX') + path
+        for name, value in headers.items():
+            response.headers[name] = value
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(file, start, end - start + 1), status=206,
+            content_type=content_type)
+        response.headers['Content-Length'] = end - start + 1
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    for name, value in headers.items():
+        response.headers[name] = value
+    return response
+
+
+def if_range_matches(request, etag, last_modified):
+    """ A Range request with a stale If-Range validator gets the whole file. """
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def media_urlpatterns(enabled=None):
+    """
+    URL patterns serving MEDIA_URL through serve_media. By default they
+    only exist with DEBUG on or with a BACKEND that hands the transfer
+    to the front server, so Python workers never stream media by mistake.
+    """
+    if enabled is None:
+        enabled = settings.DEBUG or get_setting('BACKEND') in ('x-sendfile', 'x-accel-redirect')
+    prefix = settings.MEDIA_URL
+    if not enabled or not prefix or '://' in prefix:
+        return []
+    return [re_path(r'^%s(?P<path>.*)$' % re.escape(prefix.lstrip('/')), serve_media)]
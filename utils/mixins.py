@@ -0,0 +1,33 @@
+from rest_framework.response import Response
+
+
+class ResponseSerializerMixin:
+    """
+    Lets an update action answer with a different serializer than the 
+    one validating the input (`response_serializer_classes`, keyed by 
+    action). The saved instance is serialized once and returned directly, 
+    without the write serializer's representation and without fetching 
+    the object again.
+
+    DRF drops the prefetched relations after an update; views whose 
+    serializers keep them current set `clear_prefetch_after_update = False`.
+    """
+    response_serializer_classes = {}
+    clear_prefetch_after_update = True
+
+    def get_response_serializer(self, instance):
+        serializer_class = self.response_serializer_classes.get(
+            self.action, self.get_serializer_class())
+        return serializer_class(instance, context=self.get_serializer_context())
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        if self.clear_prefetch_after_update and getattr(
+                instance, '_prefetched_objects_cache', None):
+            instance._prefetched_objects_cache = {}
+        return Response(self.get_response_serializer(serializer.instance).data)
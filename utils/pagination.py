@@ -1,4 +1,15 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class SixPerPagePagination(PageNumberPagination):
@@ -9,3 +20,237 @@ class SixPerPagePagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on a (field, id) pair. The sort field is
+    taken from the 'ordering' query parameter if it is one of the view's
+    ordering_fields, otherwise '-created_at' is used. Every page is a
+    single indexed range query without COUNT(*) or OFFSET, so latency
+    does not grow with the depth of the page. NULL values sort as the
+    smallest values.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_ordering = '-created_at'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginates the union of querysets on different databases (e.g.
+        shards): every queryset contributes its own next page and the
+        merged rows are cut to one page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(
+            request, querysets[0], view)
+
+        position, self.reverse = self.decode_cursor(request, querysets[0])
+        scan_descending = self.descending != self.reverse
+
+        if scan_descending:
+            order = [F(self.field).desc(nulls_last=True), F('pk').desc()]
+        else:
+            order = [F(self.field).asc(nulls_first=True), F('pk').asc()]
+
+        rows = []
+        for queryset in querysets:
+            if position is not None:
+                queryset = queryset.filter(
+                    self.after_position(*position, scan_descending))
+            rows.extend(queryset.order_by(*order)[:self.page_size + 1])
+        if len(querysets) > 1:
+            rows.sort(key=self.sort_key, reverse=scan_descending)
+            rows = rows[:self.page_size + 1]
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """ Returns the (field name, descending) pair to paginate on. """
+        allowed = getattr(view, 'ordering_fields', None) or []
+        requested = request.query_params.get(self.ordering_query_param, '')
+        ordering = requested.split(',')[0].strip()
+
+        if ordering.lstrip('-') not in allowed:
+            ordering = self.default_ordering
+        field = ordering.lstrip('-')
+
+        try:
+            queryset.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            ordering = self.default_ordering
+            field = ordering.lstrip('-')
+        return field, ordering.startswith('-')
+
+    def sort_key(self, instance):
+        """ Python counterpart of the SQL order, NULL being smallest. """
+        value = getattr(instance, self.field)
+        return (value is not None, value, instance.pk)
+
+    def after_position(self, value, pk, descending):
+        """ Builds the filter selecting rows after (value, pk). """
+        field = self.field
+        if descending:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, 'pk__lt': pk})
+            return (Q(**{f'{field}__lt': value}) |
+                    Q(**{field: value, 'pk__lt': pk}) |
+                    Q(**{f'{field}__isnull': True}))
+
+        if value is None:
+            return (Q(**{f'{field}__isnull': True, 'pk__gt': pk}) |
+                    Q(**{f'{field}__isnull': False}))
+        return (Q(**{f'{field}__gt': value}) |
+                Q(**{field: value, 'pk__gt': pk}))
+
+    def decode_cursor(self, request, queryset):
+        """
+        Returns the (value, pk) position and direction of the cursor. The
+        value is converted to the sort field's type, so a tampered cursor
+        or one from another ordering is rejected here instead of failing
+        in the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        field = queryset.model._meta.get_field(self.field)
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            value = None if data['v'] is None else field.to_python(data['v'])
+            position = (value, int(data['i']))
+            reverse = bool(data.get('r', False))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        value = getattr(instance, self.field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        data = {'v': value, 'i': instance.pk}
+        if reverse:
+            data['r'] = True
+        encoded = urlsafe_b64encode(json.dumps(data).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+def wants_keyset(request):
+    """
+    A request selects keyset pagination with ?pagination=cursor or by
+    following a cursor link.
+    """
+    return (request.query_params.get('pagination') == 'cursor' or
+            KeysetPagination.cursor_query_param in request.query_params)
+
+
+class PageOrKeysetPagination(SixPerPagePagination):
+    """
+    Page-number pagination (6 per page) by default, keyset pagination
+    when the request asks for it (see wants_keyset).
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if wants_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class OptionalKeysetPagination(KeysetPagination):
+    """
+    Keeps list endpoints a plain list for existing clients and switches
+    to keyset pagination when the request asks for it (see wants_keyset).
+    The plain list is cut to its first max_unpaginated_rows rows; larger
+    result sets need keyset pagination or a streamed list.
+    """
+    max_unpaginated_rows = 1000
+    unpaginated = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.unpaginated = not wants_keyset(request)
+        if self.unpaginated:
+            return self.limit_unpaginated(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def limit_unpaginated(self, rows):
+        """ The first max_unpaginated_rows of a queryset or an iterable. """
+        if isinstance(rows, QuerySet):
+            return rows[:self.max_unpaginated_rows]
+        return list(islice(rows, self.max_unpaginated_rows))
+
+    def get_paginated_response(self, data):
+        if self.unpaginated:
+            return Response(data)
+        return super().get_paginated_response(data)
@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from utils.authentication import get_principal
 
 
 class IsBusinessOwnerOrAdmin(permissions.BasePermission):
@@ -9,16 +10,15 @@ class IsBusinessOwnerOrAdmin(permissions.BasePermission):
 
     def has_permission(self, request, view):
         """ Global permission check (applies to list & create). """
+        principal = get_principal(request)
         if request.method == 'POST':
-            user_profile = getattr(request.user, 'profile', None)
             return (
-                request.user.is_authenticated and
-                user_profile and
-                user_profile.user_type == 'business'
+                principal.is_authenticated and
+                principal.user_type == 'business'
             )
 
         if view.action == 'retrieve':
-            return request.user.is_authenticated
+            return principal.is_authenticated
 
         return True
 
@@ -27,10 +27,11 @@ class IsBusinessOwnerOrAdmin(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        if hasattr(obj, 'business_user'):
-            return obj.business_user == request.user or request.user.is_staff
+        principal = get_principal(request)
+        if hasattr(obj, 'business_user_id'):
+            return obj.business_user_id == principal.user_id or principal.is_staff
 
-        return obj.user == request.user or request.user.is_staff
+        return obj.user_id == principal.user_id or principal.is_staff
 
 
 class IsCustomerOrAdmin(permissions.BasePermission):
@@ -41,18 +42,19 @@ class IsCustomerOrAdmin(permissions.BasePermission):
 
     def has_permission(self, request, view):
         """ Global permission check (applies to list & create). """
-        user_profile = getattr(request.user, 'profile', None)
+        principal = get_principal(request)
         return (
-            request.user.is_authenticated and
-            user_profile and
-            (user_profile.user_type == 'customer' or request.user.is_staff)
+            principal.is_authenticated and
+            principal.user_type is not None and
+            (principal.user_type == 'customer' or principal.is_staff)
         )
 
     def has_object_permission(self, request, view, obj):
         """ Object-level permission check (applies to update/delete). """
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.user == request.user or request.user.is_staff
+        principal = get_principal(request)
+        return obj.user_id == principal.user_id or principal.is_staff
 
 
 class IsReviewerOrAdmin(permissions.BasePermission):
@@ -64,7 +66,8 @@ class IsReviewerOrAdmin(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        return obj.reviewer == request.user or request.user.is_staff
+        principal = get_principal(request)
+        return obj.reviewer_id == principal.user_id or principal.is_staff
 
 
 class IsAdminOnly(permissions.BasePermission):
@@ -73,16 +76,15 @@ class IsAdminOnly(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.is_staff
+        principal = get_principal(request)
+        return principal.is_authenticated and principal.is_staff
 
 
 class IsBusinessOrAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
-        user = request.user
-        user_profile = getattr(user, 'profile', None)
+        principal = get_principal(request)
 
         return (
-            user.is_authenticated and
-            (user.is_staff or user_profile.user_type == 'business'
-             )
+            principal.is_authenticated and
+            (principal.is_staff or principal.user_type == 'business')
         )
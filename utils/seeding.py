@@ -0,0 +1,132 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from offers_app.models import Offer, OfferDetail
+from orders_app import sharding
+from orders_app.models import Order
+from reviews_app.models import Review
+from users_auth_app.models import UserProfileModel
+
+OFFER_TYPES = (
+    # offer_type, price factor, delivery factor, revisions
+    ('basic', 1, 1, 1),
+    ('standard', 2, 2, 3),
+    ('premium', 4, 3, -1),
+)
+ORDER_STATUSES = ['in_progress', 'completed', 'cancelled']
+ORDER_STATUS_WEIGHTS = [3, 6, 1]
+RATINGS = [1, 2, 3, 4, 5]
+RATING_WEIGHTS = [1, 1, 2, 5, 7]
+
+SERVICES = ['Logo Design', 'Website Development', 'SEO Audit', 'Copywriting',
+            'Video Editing', 'Mobile App Prototype', 'Social Media Kit',
+            'Translation', 'Illustration', 'Data Analysis']
+FEATURES = ['Source files', 'Commercial license', 'Express delivery',
+            'Print-ready PDF', 'Two concepts', 'Responsive layout',
+            'Unlimited colors', 'Priority support', 'Consultation call']
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta',
+               'Hannes', 'Ida', 'Jonas', 'Lea', 'Max', 'Nina', 'Paul']
+LAST_NAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer',
+              'Wagner', 'Becker', 'Hoffmann', 'Koch']
+LOCATIONS = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt', 'Wien',
+             'Zürich', 'Leipzig']
+
+
+def seed_data(business_users=500, customer_users=5000, offers=5000,
+              orders=100000, reviews=20000, batch_size=5000, prefix='seed_',
+              random_seed=42):
+    """
+    Inserts synthetic users with profiles, offers with basic, standard
+    and premium details, orders across all statuses and reviews with
+    bulk_create. Usernames start with `prefix`; passwords are unusable to
+    skip hashing. Popular offers get most of the orders. Denormalized
+    data (min values, counters, search index) is not updated, see the
+    seed_data command. Returns the business and customer users.
+    """
+    rng = random.Random(random_seed)
+    now = timezone.now()
+
+    users = [User(username=f'{prefix}business{i}', password='!')
+             for i in range(business_users)]
+    users += [User(username=f'{prefix}customer{i}', password='!')
+              for i in range(customer_users)]
+    User.objects.bulk_create(users, batch_size=batch_size)
+    business = list(User.objects.filter(
+        username__startswith=f'{prefix}business').order_by('id'))
+    customers = list(User.objects.filter(
+        username__startswith=f'{prefix}customer').order_by('id'))
+
+    UserProfileModel.objects.bulk_create([
+        UserProfileModel(
+            user=user, user_type=user_type, email=f'{user.username}@example.com',
+            name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            location=rng.choice(LOCATIONS), tel=f'+49 30 {rng.randint(1000000, 9999999)}',
+            description='Synthetic profile', availability='Mo-Fr 9-17',
+            created_at=now - timedelta(days=rng.randint(0, 730)))
+        for user_type, group in (('business', business), ('customer', customers))
+        for user in group
+    ], batch_size=batch_size)
+
+    Offer.objects.bulk_create([
+        Offer(user=rng.choice(business), title=f'{rng.choice(SERVICES)} #{i}',
+              description=f'Synthetic offer number {i}')
+        for i in range(offers)
+    ], batch_size=batch_size)
+    offer_ids = Offer.objects.filter(
+        user__username__startswith=f'{prefix}business').values_list('id', flat=True)
+
+    details = []
+    for offer_id in offer_ids:
+        base_price = rng.randint(20, 200)
+        base_days = rng.randint(1, 10)
+        for offer_type, price_factor, days_factor, revisions in OFFER_TYPES:
+            details.append(OfferDetail(
+                offer_id=offer_id, title=offer_type.capitalize(),
+                offer_type=offer_type, price=base_price * price_factor,
+                delivery_time_in_days=base_days * days_factor, revisions=revisions,
+                features=rng.sample(FEATURES, rng.randint(1, 3) + price_factor - 1)))
+    OfferDetail.objects.bulk_create(details, batch_size=batch_size)
+    detail_rows = list(OfferDetail.objects.filter(
+        offer__user__username__startswith=f'{prefix}business').values_list(
+        'id', 'offer__user_id', 'title', 'revisions', 'delivery_time_in_days',
+        'price', 'features', 'offer_type'))
+    if not detail_rows or not customers:
+        orders = 0
+
+    order_ids = iter(sharding.reserve_ids(orders)) if sharding.is_enabled() else None
+    statuses = rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS, k=orders)
+    batches = {}
+    for status in statuses:
+        # Squaring the uniform draw skews the orders to the first offers.
+        (detail_id, business_id, title, revisions, days, price, features,
+         offer_type) = detail_rows[int(len(detail_rows) * rng.random() ** 2)]
+        order = Order(
+            customer_user=rng.choice(customers), business_user_id=business_id,
+            offer_detail_id=detail_id, title=title, revisions=revisions,
+            delivery_time_in_days=days, price=price, features=features,
+            offer_type=offer_type, status=status)
+        if order_ids is not None:
+            order.pk = next(order_ids)
+        alias = sharding.shard_for(business_id)
+        batch = batches.setdefault(alias, [])
+        batch.append(order)
+        if len(batch) >= batch_size:
+            Order.objects.using(alias).bulk_create(batch)
+            batch.clear()
+    for alias, batch in batches.items():
+        Order.objects.using(alias).bulk_create(batch)
+
+    pairs = set()
+    while len(pairs) < min(reviews, len(customers) * len(business)):
+        pairs.add((rng.choice(customers).id, rng.choice(business).id))
+    Review.objects.bulk_create([
+        Review(reviewer_id=reviewer_id, business_user_id=business_id,
+               rating=rng.choices(RATINGS, RATING_WEIGHTS)[0],
+               description='Synthetic review')
+        for reviewer_id, business_id in pairs
+    ], batch_size=batch_size)
+
+    return {'business': business, 'customers': customers}
@@ -0,0 +1,108 @@
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from utils.pagination import wants_keyset
+
+STREAM_QUERY_PARAM = 'stream'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Renders a list as newline-delimited JSON, one object per line. Lets
+    content negotiation accept 'Accept: application/x-ndjson'.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, list):
+            data = [data]
+        lines = [super(NDJSONRenderer, self).render(item) for item in data]
+        return b''.join(line + b'\n' for line in lines)
+
+
+def get_stream_mode(request):
+    """
+    Returns 'json' or 'ndjson' if the request asks for a streamed list
+    (?stream=json, ?stream=ndjson or NDJSON negotiated via the Accept
+    header), otherwise None.
+    """
+    mode = request.query_params.get(STREAM_QUERY_PARAM)
+    if mode in ('json', 'ndjson'):
+        return mode
+    if isinstance(getattr(request, 'accepted_renderer', None), NDJSONRenderer):
+        return 'ndjson'
+    return None
+
+
+class StreamingListMixin:
+    """
+    Adds a streaming mode to list endpoints. The queryset is read with
+    iterator(chunk_size=...) and serialized row by row into a
+    StreamingHttpResponse, either as one JSON array (same body as the
+    regular response) or as NDJSON with one object per line. Memory stays
+    bounded by the chunk size and the first bytes are sent as soon as the
+    first chunk is serialized. Keyset-paginated requests are answered as
+    usual.
+    """
+    stream_chunk_size = 500
+
+    def get_renderers(self):
+        return super().get_renderers() + [NDJSONRenderer()]
+
+    def list(self, request, *args, **kwargs):
+        mode = get_stream_mode(request)
+        if mode is None or wants_keyset(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.streaming_response(self.iter_representations(queryset), mode)
+
+    def streaming_response(self, representations, mode):
+        if mode == 'ndjson':
+            content, content_type = self.stream_ndjson(representations), NDJSON_MEDIA_TYPE
+        else:
+            content, content_type = self.stream_json(representations), 'application/json'
+        return StreamingHttpResponse(content, content_type=content_type)
+
+    def iter_representations(self, queryset):
+        """
+        Yields the representation of every row, using the view's
+        ValuesSerializer if it has one (see utils.fast_serializers).
+        """
+        get_values_serializer = getattr(self, 'get_values_serializer', None)
+        values_serializer = get_values_serializer() if get_values_serializer else None
+        if values_serializer is not None:
+            yield from values_serializer.iter_serialize(
+                queryset, self.stream_chunk_size)
+            return
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield serializer_class(instance, context=context).data
+
+    def iter_rendered(self, representations):
+        """ Yields lists of rendered rows, one list per chunk. """
+        renderer = JSONRenderer()
+
+        chunk = []
+        for data in representations:
+            chunk.append(renderer.render(data))
+            if len(chunk) >= self.stream_chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def stream_json(self, representations):
+        yield b'['
+        separator = b''
+        for chunk in self.iter_rendered(representations):
+            yield separator + b','.join(chunk)
+            separator = b','
+        yield b']'
+
+    def stream_ndjson(self, representations):
+        for chunk in self.iter_rendered(representations):
+            yield b'\n'.join(chunk) + b'\n'